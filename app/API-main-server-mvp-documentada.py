@@ -25,35 +25,50 @@ Recursos Principais:
 
 Bibliotecas Utilizadas:
     - FastAPI: Framework web moderno e rápido para construir APIs.
+    - orjson: Serialização JSON em C, usada nas respostas da API e na leitura de credenciais.
     - Pydantic: Validação de dados e settings management utilizando type hints.
     - jose (python-jose): Implementação de JWT em Python.
     - cryptography: Biblioteca para criptografia e geração de certificados.
     - uvicorn: Servidor ASGI para executar a aplicação FastAPI.
     - logging: Biblioteca padrão para logging.
     - python-dotenv (opcional): Para carregar variáveis de ambiente de um arquivo .env.
+    - redis (redis.asyncio): Armazenamento compartilhado do estado de rate limiting entre workers.
     - bibliotecas.calc_numbers.Numbers: Biblioteca local (presumivelmente) para operações matemáticas.
 
 Configuração via Variáveis de Ambiente:
     - API_SECRET_KEY: Chave secreta para a assinatura JWT. Padrão: "Jump@d2025!!(SegredoSuperSeguroParaTesteAPI)".
     - API_JWT_ALGORITHM: Algoritmo JWT. Padrão: "HS256".
     - API_TOKEN_EXPIRY_MINUTES: Tempo de expiração do token JWT em minutos. Padrão: "30".
+    - API_MAX_VECTOR_LENGTH: Quantidade máxima de números aceita por requisição. Padrão: "1000000".
     - API_RATE_LIMIT: Número máximo de requisições por minuto permitidas. Padrão: "200".
+    - API_RATE_LIMIT_CAPACITY: Número máximo de clientes acompanhados pelo token bucket local de cada processo (backend "memoria" ou fallback do Redis). Padrão: "16384".
+    - API_RATE_LIMIT_BACKEND: Armazenamento do rate limiting, "redis" (compartilhado entre workers) ou "memoria" (token bucket local, por processo). Padrão: "memoria". Use "redis" com mais de um worker.
+    - API_REDIS_TIMEOUT: Tempo máximo, em segundos, para conectar ao Redis e para cada comando. Padrão: "0.25".
+    - API_REDIS_URL: URL do Redis usado pelo rate limiting e pelo cache de médias. Padrão: "redis://localhost:6379/0".
+    - API_AVERAGE_CACHE_TTL: Validade, em segundos, das médias memoizadas no Redis (apenas com o backend "redis"; 0 desativa). Padrão: "300".
+    - API_MEAN_BATCH_WINDOW_MS: Janela, em milissegundos, para agrupar cálculos de média concorrentes em um único lote numpy (0 desativa). Padrão: "0".
+    - API_MEAN_BATCH_MAX: Quantidade máxima de vetores por lote de médias. Padrão: "64".
     - API_LOG_DIR: Diretório para salvar os arquivos de log. Padrão: "logs".
+    - API_LOG_LEVEL: Nível de log da aplicação ("DEBUG", "INFO", "WARNING", ...). Padrão: "INFO". Use "DEBUG" apenas em desenvolvimento.
     - API_CORS_ORIGINS: Lista de origens permitidas para CORS, separadas por vírgula. Padrão: "http://localhost".
     - API_CREDENTIALS_DIR: Diretório para salvar arquivos de credenciais e certificados. Padrão: "credentials".
     - API_ENVIRONMENT: Ambiente da API (e.g., "Desenvolvimento", "Produção"). Padrão: "Desenvolvimento".
+    - API_WORKERS: Número de processos (workers) do Uvicorn. Padrão: número de CPUs com o backend "redis"; 1 com o backend "memoria" (cujo limite é por processo).
+    - API_TLS_TERMINATION: "local" (HTTPS no próprio Uvicorn, com certificado autoassinado) ou "proxy" (HTTP em 127.0.0.1, com TLS terminado em um proxy reverso como nginx/Caddy). Padrão: "local".
 
 Endpoints:
     - POST /token_admin: Gera token JWT para usuário administrador.
     - POST /token_tester: Gera token JWT para usuário tester (para testes).
-    - POST /somar: Soma um vetor de números inteiros (requer autenticação JWT de administrador).
-    - POST /calcular_media: Calcula a média de um vetor de números inteiros (requer autenticação JWT de administrador).
+    - POST /somar: Soma um vetor de números inteiros (requer autenticação JWT de administrador). Com `?include=sum,mean` também retorna a média.
+    - POST /somar_fast: Mesma soma de '/somar', lendo o corpo bruto com orjson e validando os tipos dos elementos em C, sem o modelo Pydantic por elemento (requer autenticação JWT de administrador).
+    - POST /calcular_media: Calcula a média de um vetor de números inteiros (requer autenticação JWT de administrador). Com `?include=sum,mean` também retorna a soma.
     - GET /saude: Endpoint público para verificar a saúde da API.
 
 Para executar a API localmente (com HTTPS e geração de certificados autoassinados em desenvolvimento):
     1. Certifique-se de ter Python e pip instalados.
     2. Instale as dependências: `pip install fastapi uvicorn pydantic python-jose cryptography`.
     3. Execute o script: `python seu_script_api.py`.
+       Em produção, prefira `API_TLS_TERMINATION=proxy` com um proxy reverso (nginx/Caddy) terminando o TLS e repassando para http://127.0.0.1:8882 com keep-alive HTTP/1.1.
     4. Acesse a documentação interativa em http://localhost:8882/docs ou http://localhost:8882/redoc.
 
 Criado por: Elias Andrade
@@ -65,19 +80,42 @@ import os
 # Adiciona o diretório pai ao path do sistema para importar módulos de 'bibliotecas'
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import asyncio
+import atexit
+import base64
+import hashlib
+import hmac
+import itertools
 import logging
 import json
+import queue
+import signal
+import time
+import uuid
+import orjson
+import numpy as np
+import xxhash
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import List, Optional, Any
 
 # Importações do FastAPI
 from fastapi import FastAPI, Request, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.exceptions import RequestValidationError
+
+# Importações do redis (cliente assíncrono) para o rate limiting compartilhado
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
 
 # Importações do Pydantic para validação de dados
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ValidationError, conlist
 
 # Importações do python-jose para JWT
 from jose import JWTError, jwt
@@ -86,12 +124,12 @@ from jose import JWTError, jwt
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 
 # Importação da biblioteca local para cálculos numéricos
-from bibliotecas.calc_numbers import Numbers
+from bibliotecas.calc_numbers import Numbers, VECTORIZATION_THRESHOLD
 
 # --- Configurações e Variáveis Globais ---
 
@@ -101,6 +139,17 @@ SECRET_KEY = os.environ.get("API_SECRET_KEY", "Jump@d2025!!")
 ALGORITHM = os.environ.get("API_JWT_ALGORITHM", "HS256")
 # Tempo de expiração do token de acesso em minutos, obtido da variável de ambiente ou padrão
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("API_TOKEN_EXPIRY_MINUTES", "30"))
+# Tempo de expiração do token em segundos, pré-calculado para o campo "exp" (timestamp Unix inteiro)
+ACCESS_TOKEN_EXPIRE_SEGUNDOS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+# Tamanho máximo do vetor aceito em 'numeros' (limita o custo de validação e de memória por requisição)
+TAMANHO_MAXIMO_VETOR = int(os.environ.get("API_MAX_VECTOR_LENGTH", "1000000"))
+
+# Diretório e arquivos de credenciais e certificados, resolvidos uma única vez na inicialização (e não a cada requisição de token)
+CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials")
+CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem") # Certificado HTTPS
+KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem") # Chave privada HTTPS
+ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # Credenciais de admin
+TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # Credenciais de tester
 
 # Esquemas de segurança OAuth2 para diferentes tipos de token (admin e tester)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token_admin")
@@ -108,17 +157,59 @@ oauth2_scheme_tester = OAuth2PasswordBearer(tokenUrl="token_tester")
 
 # Configuração de Rate Limiting (limite de requisições por minuto)
 RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.environ.get("API_RATE_LIMIT", "200"))
-RATE_LIMIT_STORAGE = {} # Dicionário para armazenar o estado do rate limiting (pode ser substituído por Redis, etc. em produção)
+RATE_LIMIT_CAPACIDADE = int(os.environ.get("API_RATE_LIMIT_CAPACITY", "16384")) # Máximo de clientes no token bucket local (por processo)
+RATE_LIMIT_JANELA_MS = 60_000 # Janela deslizante do rate limiting (1 minuto, em milissegundos)
+RATE_LIMIT_BACKEND = os.environ.get("API_RATE_LIMIT_BACKEND", "memoria").lower() # "memoria" (por processo) ou "redis" (compartilhado entre workers)
+REDIS_URL = os.environ.get("API_REDIS_URL", "redis://localhost:6379/0") # Redis compartilhado por todos os workers
+REDIS_TIMEOUT_SEGUNDOS = float(os.environ.get("API_REDIS_TIMEOUT", "0.25")) # Timeout de conexão e de cada comando no Redis
+REDIS_PAUSA_APOS_FALHA_SEGUNDOS = 5.0 # Após uma falha, o Redis não é consultado por este intervalo (fallback local direto)
+REDIS_INTERVALO_AVISO_SEGUNDOS = 60.0 # Intervalo mínimo entre avisos de Redis indisponível no log
+CACHE_MEDIA_TTL_SEGUNDOS = int(os.environ.get("API_AVERAGE_CACHE_TTL", "300")) # Validade das médias memoizadas no Redis (0 desativa)
+LOTE_MEDIAS_JANELA_MS = float(os.environ.get("API_MEAN_BATCH_WINDOW_MS", "0")) # Janela de agrupamento de médias concorrentes (0 desativa)
+LOTE_MEDIAS_TAMANHO_MAX = int(os.environ.get("API_MEAN_BATCH_MAX", "64")) # Máximo de vetores por lote
+
+# Instância única da biblioteca de cálculos, reutilizada por todas as requisições (Numbers não guarda estado)
+INSTANCIA_NUMEROS = Numbers()
 
 # Configuração de diretório para logs
 DIRETORIO_LOGS = os.environ.get("API_LOG_DIR", "logs")
-if not os.path.exists(DIRETORIO_LOGS):
-    os.makedirs(DIRETORIO_LOGS) # Cria o diretório de logs se não existir
+os.makedirs(DIRETORIO_LOGS, exist_ok=True) # Cria o diretório de logs se não existir (uma única chamada, sem verificação prévia)
 ARQUIVO_LOG_API = os.path.join(DIRETORIO_LOGS, "api-logs.json") # Arquivo de log principal em formato JSON
 ARQUIVO_LOG_DETALHADO_API = os.path.join(DIRETORIO_LOGS, "api-detailed-logs.json") # Arquivo de log detalhado em formato JSON
+# Nível de log da aplicação. Padrão INFO; DEBUG é apenas para desenvolvimento (registra o corpo das requisições)
+NIVEL_LOG = os.environ.get("API_LOG_LEVEL", "INFO").upper()
 
 # --- Configuração de Logging ---
 
+_cache_timestamp_log = (0, "") # (segundo epoch, timestamp formatado) do último registro de log
+
+def _timestamp_log(criado: float) -> str:
+    """
+    Retorna o timestamp 'AAAA-MM-DD HH:MM:SS' de um registro de log, chamando strftime no máximo uma vez por segundo.
+
+    Args:
+        criado (float): Instante de criação do registro (LogRecord.created, em segundos epoch).
+
+    Returns:
+        str: Timestamp formatado no horário local.
+    """
+    global _cache_timestamp_log
+    segundo = int(criado)
+    cache = _cache_timestamp_log
+    if cache[0] != segundo: # Novo segundo: formata e substitui a tupla inteira (troca atômica entre threads)
+        cache = (segundo, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segundo)))
+        _cache_timestamp_log = cache
+    return cache[1]
+
+def _mensagem_com_contexto(record: logging.LogRecord) -> str:
+    """
+    Retorna a mensagem do registro seguida do contexto da requisição (extra={'contexto': ...}), se houver.
+    O contexto é montado uma vez por requisição no endpoint e anexado aqui, na thread de escrita dos logs,
+    em vez de ser interpolado em cada chamada de log.
+    """
+    contexto = getattr(record, "contexto", None)
+    return f"{record.getMessage()} - {contexto}" if contexto else record.getMessage()
+
 class FormatterColoridoSeguro(logging.Formatter):
     """
     Formatter de log personalizado que adiciona cores e emojis aos logs no console.
@@ -146,58 +237,139 @@ class FormatterColoridoSeguro(logging.Formatter):
         reset_cor = self.CORES['RESET'] # Código para resetar a cor
         emoji = self.EMOJIS.get(record.levelname, '') # Obtém o emoji baseado no nível de log
         nivel_log = f"{cor_log}{record.levelname}{reset_cor}" # Nível de log com cor
-        mensagem = f"{cor_log}{record.getMessage()}{reset_cor}" # Mensagem de log com cor
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S") # Timestamp formatado
+        mensagem = f"{cor_log}{_mensagem_com_contexto(record)}{reset_cor}" # Mensagem de log com cor
+        timestamp = _timestamp_log(record.created) # Timestamp formatado (cacheado por segundo)
         return f"{timestamp} - {emoji} {nivel_log} - {record.name}:{record.lineno} - {mensagem}" # Formato final do log
 
+class FormatterJSONOrjson(logging.Formatter):
+    """
+    Formatter de log para os arquivos JSON: monta um dicionário completo e serializa com orjson.
+    Garante JSON válido mesmo quando a mensagem contém aspas ou quebras de linha.
+    """
+    OPCOES_ORJSON = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY # Chaves não-string e valores numpy (escalares e vetores) serializados nativamente
+
+    def __init__(self, detalhado: bool = False):
+        """
+        Args:
+            detalhado (bool): Se True, inclui nome do logger e linha, com os dados extras em "record"; caso contrário, em "detalhes".
+        """
+        super().__init__()
+        self.detalhado = detalhado
+
+    def format(self, record):
+        """Serializa o registro de log como uma linha JSON."""
+        dados_extras = getattr(record, "log_record_json", {}) # Dados estruturados passados via extra={'log_record_json': ...}
+        if self.detalhado:
+            payload = {"timestamp": self.formatTime(record), "level": record.levelname, "name": record.name, "line": str(record.lineno), "message": _mensagem_com_contexto(record), "record": dados_extras}
+        else:
+            payload = {"timestamp": self.formatTime(record), "level": record.levelname, "message": _mensagem_com_contexto(record), "detalhes": dados_extras}
+        try:
+            return orjson.dumps(payload, default=str, option=self.OPCOES_ORJSON).decode("utf-8") # default=str: valores não serializáveis viram texto
+        except TypeError: # orjson não serializa inteiros acima de 64 bits: o json padrão os mantém exatos
+            return json.dumps(payload, default=str, ensure_ascii=False)
+
 # Handlers de log: um para console (com cores) e dois para arquivos (JSON)
 console_handler = logging.StreamHandler() # Handler para logs no console
 console_handler.setFormatter(FormatterColoridoSeguro()) # Usa o formatter colorido para o console
 
 api_log_handler = logging.FileHandler(ARQUIVO_LOG_API, encoding='utf-8') # Handler para o arquivo de log principal (JSON)
-api_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "detalhes": %(log_record_json)s}') # Formatter JSON para log principal
+api_log_formatter = FormatterJSONOrjson() # Formatter JSON para log principal
 api_log_handler.setFormatter(api_log_formatter) # Define o formatter para o handler de arquivo de log principal
 
 api_detailed_log_handler = logging.FileHandler(ARQUIVO_LOG_DETALHADO_API, encoding='utf-8') # Handler para o arquivo de log detalhado (JSON)
-api_detailed_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "name": "%(name)s", "line": "%(lineno)d", "message": "%(message)s", "record": %(log_record_json)s}') # Formatter JSON para log detalhado
+api_detailed_log_formatter = FormatterJSONOrjson(detalhado=True) # Formatter JSON para log detalhado
 api_detailed_log_handler.setFormatter(api_detailed_log_formatter) # Define o formatter para o handler de arquivo de log detalhado
 
 # Configuração do logger principal da aplicação
 logger_app = logging.getLogger("api_server") # Obtém o logger com o nome 'api_server'
-logger_app.setLevel(logging.DEBUG) # Define o nível de log para DEBUG (registra tudo)
-logger_app.addHandler(console_handler) # Adiciona o handler de console
-logger_app.addHandler(api_log_handler) # Adiciona o handler de arquivo de log principal
-logger_app.addHandler(api_detailed_log_handler) # Adiciona o handler de arquivo de log detalhado
+logger_app.setLevel(NIVEL_LOG) # Define o nível de log (API_LOG_LEVEL, padrão INFO)
+
+# Os handlers de console e arquivo rodam em uma thread separada (QueueListener): as requisições
+# apenas enfileiram o registro, sem bloquear o event loop com escrita em disco ou no terminal
+fila_logs = queue.SimpleQueue() # Fila sem limite compartilhada entre o logger e a thread de escrita
+listener_logs = QueueListener(fila_logs, console_handler, api_log_handler, api_detailed_log_handler, respect_handler_level=True) # Thread que entrega os registros aos handlers reais
+listener_logs.start() # Inicia a thread de escrita dos logs
+atexit.register(listener_logs.stop) # Esvazia a fila e encerra a thread ao finalizar o processo
+logger_app.addHandler(QueueHandler(fila_logs)) # Único handler do logger: apenas enfileira os registros
 
 # --- Inicialização da Aplicação FastAPI ---
 
+class ORJSONResponse(JSONResponse):
+    """
+    Resposta JSON serializada com orjson (implementação em C) em vez do módulo json padrão.
+    Definida localmente porque a classe equivalente do FastAPI foi descontinuada nas versões recentes.
+    """
+    def render(self, content) -> bytes:
+        """Serializa o conteúdo da resposta diretamente para bytes JSON (json padrão para inteiros acima de 64 bits)."""
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError: # orjson não serializa inteiros acima de 64 bits: o json padrão os mantém exatos
+            return JSONResponse.render(self, content)
+
+def _aquecer_kernels_numericos():
+    """
+    Executa os caminhos vetorizados da biblioteca de cálculos com um vetor do tamanho do limiar de vetorização,
+    para que o kernel Numba (carregado do cache em disco ou compilado) e o numpy já estejam prontos antes da primeira requisição.
+    """
+    vetor_aquecimento = np.arange(VECTORIZATION_THRESHOLD, dtype=np.int64) # Vetor mínimo que aciona o caminho vetorizado
+    lista_aquecimento = vetor_aquecimento.tolist()
+    INSTANCIA_NUMEROS.sum_numbers(lista_aquecimento) # Caminho de '/somar'
+    INSTANCIA_NUMEROS.sum_and_average(lista_aquecimento) # Caminho de '/calcular_media' (calculate_average usa a mesma soma)
+    INSTANCIA_NUMEROS.sum_int64_array(vetor_aquecimento) # Caminho de '/somar_fast'
+
+@asynccontextmanager
+async def ciclo_de_vida_app(app: FastAPI):
+    """Ciclo de vida da aplicação: aquece os kernels numéricos e inicia o agrupador de médias na inicialização, antes de aceitar tráfego."""
+    _aquecer_kernels_numericos()
+    logger_app.info("🔥 Kernels numéricos (Numba/numpy) aquecidos.", extra={'log_record_json': {"vetor_aquecimento": VECTORIZATION_THRESHOLD}}) # Log de info após o aquecimento
+    if LOTE_MEDIAS_JANELA_MS > 0:
+        agrupador_medias.iniciar() # Tarefa de micro-batching das médias (opcional)
+    yield
+    await agrupador_medias.parar()
+
 app = FastAPI(
     title="API Matemática Segura",
     description="API RESTful para operações de soma e média - SEGURA (Nível Máximo)",
     version="0.9.3",
-    default_response_class=JSONResponse # Define a classe de resposta padrão para JSONResponse
+    lifespan=ciclo_de_vida_app, # Aquecimento dos kernels numéricos na inicialização
+    default_response_class=ORJSONResponse # Define a classe de resposta padrão (serialização via orjson)
 )
 
 # Configuração de CORS (Cross-Origin Resource Sharing)
-origins_permitidas = os.environ.get("API_CORS_ORIGINS", "http://localhost").split(",") # Obtém origens permitidas da variável de ambiente ou padrão
+# Origens normalizadas uma única vez (sem espaços e sem entradas vazias) e congeladas em frozenset: o CORSMiddleware faz `origin in allow_origins` a cada requisição
+origins_permitidas = frozenset(origem.strip() for origem in os.environ.get("API_CORS_ORIGINS", "http://localhost").split(",") if origem.strip())
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins_permitidas, # Lista de origens permitidas
+    allow_origins=origins_permitidas, # Conjunto imutável de origens permitidas
     allow_credentials=True,
     allow_methods=["*"], # Permite todos os métodos HTTP
     allow_headers=["*"], # Permite todos os headers
 )
 
+@app.exception_handler(HTTPException)
+async def tratar_http_exception(request: Request, exc: HTTPException):
+    """
+    Serializa uma única vez, com orjson, toda HTTPException levantada pelos endpoints e dependências,
+    no formato de erro da API ({"erro": ...}). Headers da exceção (e.g., WWW-Authenticate) são preservados.
+    """
+    return ORJSONResponse(status_code=exc.status_code, content={"erro": exc.detail}, headers=exc.headers)
+
 # --- Modelos de Dados (Pydantic) ---
 
 class NumerosEntrada(BaseModel):
     """
     Modelo Pydantic para validar a entrada de números para as operações matemáticas.
-    Espera uma lista de inteiros no campo 'numeros'.
+    Espera uma lista de inteiros no campo 'numeros', com no máximo TAMANHO_MAXIMO_VETOR elementos.
+    A lista vazia continua aceita aqui: '/calcular_media' responde com média nula e '/somar' a rejeita via biblioteca.
+    Em modo estrito apenas inteiros JSON são aceitos (sem tentativas de coerção de strings ou floats por elemento).
     """
-    numeros: List[int]
+    numeros: conlist(int, max_length=TAMANHO_MAXIMO_VETOR)
 
     model_config = {
+        "strict": True, # Sem coerção por elemento ("3" ou 3.0 são rejeitados)
+        "extra": "ignore", # Campos desconhecidos no corpo são descartados
+        "frozen": True, # Entrada imutável após a validação
+        "validate_assignment": False,
         "json_schema_extra": {
             "examples": [
                 {"numeros": [1, 2, 3, 4]} # Exemplo para a documentação Swagger/ReDoc
@@ -219,6 +391,7 @@ class SomaResponse(BaseModel):
     Define a estrutura da resposta JSON para a operação de soma.
     """
     resultado: int
+    media: Optional[float] = None # Presente apenas com ?include=sum,mean
     mensagem: str
     numeros_entrada: List[int]
     usuario: Optional[str] = None
@@ -237,6 +410,7 @@ class MediaResponse(BaseModel):
     Define a estrutura da resposta JSON para a operação de média.
     """
     media: Optional[float] = None
+    soma: Optional[int] = None # Presente apenas com ?include=sum,mean
     mensagem: str
     numeros_entrada: List[int]
     usuario: Optional[str] = None
@@ -297,27 +471,88 @@ class ErrorResponse(BaseModel):
 
 # --- Funções Utilitárias para JWT ---
 
-def gerar_token_jwt(data: dict, expires_delta: Optional[timedelta] = None):
+# Estado HMAC pré-inicializado com a chave secreta: cada assinatura apenas copia o template (sem re-derivar a chave)
+_CHAVE_JWT_BYTES = SECRET_KEY.encode("utf-8")
+_HMAC_TEMPLATE_JWT = hmac.new(_CHAVE_JWT_BYTES, digestmod=hashlib.sha256)
+# Cabeçalho JWT fixo para HS256, já serializado e codificado em base64url
+_CABECALHO_JWT_B64 = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+
+def _assinar_hs256(data: dict) -> str:
+    """
+    Monta e assina um JWT HS256 diretamente com hmac/hashlib (sem o overhead por chamada do python-jose).
+
+    Args:
+        data (dict): Payload já pronto para serialização (com "exp" como timestamp inteiro, se houver).
+
+    Returns:
+        str: Token JWT no formato cabeçalho.payload.assinatura.
+    """
+    payload_b64 = base64.urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=") # Serializa e codifica o payload
+    entrada_assinatura = _CABECALHO_JWT_B64 + b"." + payload_b64 # Conteúdo assinado
+    assinador = _HMAC_TEMPLATE_JWT.copy() # Copia o estado HMAC já inicializado com a chave
+    assinador.update(entrada_assinatura)
+    assinatura_b64 = base64.urlsafe_b64encode(assinador.digest()).rstrip(b"=") # Assinatura em base64url
+    return (entrada_assinatura + b"." + assinatura_b64).decode("ascii")
+
+def _decodificar_b64url(segmento: bytes) -> bytes:
+    """Decodifica um segmento base64url sem padding (formato usado no JWT)."""
+    return base64.urlsafe_b64decode(segmento + b"=" * (-len(segmento) % 4))
+
+def _verificar_hs256(token: str) -> Optional[dict]:
+    """
+    Verifica um JWT HS256 com uma única chamada HMAC e comparação em tempo constante.
+
+    Args:
+        token (str): Token JWT recebido.
+
+    Returns:
+        Optional[dict]: Payload se assinatura, cabeçalho e expiração forem válidos, None caso contrário.
+    """
+    try:
+        cabecalho_b64, payload_b64, assinatura_b64 = token.encode("ascii").split(b".") # Separa os três segmentos
+        if orjson.loads(_decodificar_b64url(cabecalho_b64)).get("alg") != "HS256":
+            return None # Rejeita tokens com algoritmo diferente do configurado
+        verificador = _HMAC_TEMPLATE_JWT.copy() # Reaproveita o estado HMAC já inicializado com a chave
+        verificador.update(cabecalho_b64 + b"." + payload_b64)
+        if not hmac.compare_digest(verificador.digest(), _decodificar_b64url(assinatura_b64)):
+            return None # Assinatura inválida
+        payload = orjson.loads(_decodificar_b64url(payload_b64))
+    except (ValueError, TypeError, AttributeError, orjson.JSONDecodeError):
+        return None # Token malformado
+    if not isinstance(payload, dict):
+        return None
+    expiracao = payload.get("exp")
+    if expiracao is not None and (not isinstance(expiracao, (int, float)) or expiracao < time.time()):
+        return None # Token expirado (ou com "exp" inválido)
+    return payload
+
+def gerar_token_jwt(data: dict, ttl_sec: int = ACCESS_TOKEN_EXPIRE_SEGUNDOS):
     """
     Gera um token JWT (JSON Web Token) seguro.
 
     Args:
         data (dict): Dados a serem incluídos no payload do token.
-        expires_delta (Optional[timedelta]): Tempo de expiração do token (opcional).
+        ttl_sec (int): Tempo de expiração do token em segundos. Padrão: ACCESS_TOKEN_EXPIRE_SEGUNDOS.
 
     Returns:
         str: Token JWT codificado.
     """
-    to_encode = data.copy() # Copia os dados para evitar modificação do original
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta # Calcula o tempo de expiração
-        to_encode.update({"exp": expire}) # Adiciona a expiração ao payload
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM) # Codifica o token usando a chave secreta e algoritmo
+    to_encode = {**data, "exp": int(time.time()) + ttl_sec} # Copia os dados e adiciona a expiração (timestamp Unix inteiro, sem objetos datetime)
+    if ALGORITHM == "HS256":
+        return _assinar_hs256(to_encode) # Caminho rápido: HMAC pré-inicializado
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM) # Outros algoritmos continuam via python-jose
     return encoded_jwt
 
+# Cache de tokens já verificados: {token: (payload, validade)}. A chave é o token completo, então um token
+# alterado nunca encontra a entrada de outro; a validade nunca passa do "exp" do próprio token.
+_CACHE_TOKENS_VERIFICADOS: dict[str, tuple[dict, float]] = {}
+_CACHE_TOKENS_MAX = 4096 # Número máximo de tokens no cache
+_CACHE_TOKENS_TTL_SEGUNDOS = 5 # Tempo máximo que um token verificado fica no cache
+
 def verificar_token_jwt(token: str):
     """
     Verifica e decodifica um token JWT.
+    Tokens verificados há menos de _CACHE_TOKENS_TTL_SEGUNDOS são servidos do cache, sem refazer HMAC e base64.
 
     Args:
         token (str): Token JWT a ser verificado.
@@ -325,11 +560,110 @@ def verificar_token_jwt(token: str):
     Returns:
         dict: Payload do token se a verificação for bem-sucedida, None caso contrário.
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]) # Decodifica o token usando a chave secreta e algoritmo
-        return payload # Retorna o payload decodificado
-    except JWTError:
+    agora = time.time()
+    entrada_cache = _CACHE_TOKENS_VERIFICADOS.get(token)
+    if entrada_cache is not None and entrada_cache[1] > agora:
+        return entrada_cache[0] # Token verificado recentemente e ainda válido
+    if ALGORITHM == "HS256":
+        payload = _verificar_hs256(token) # Caminho rápido: HMAC direto + compare_digest
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]) # Decodifica o token usando a chave secreta e algoritmo
+        except JWTError:
+            payload = None # Token inválido ou expirado
+    if payload is None:
+        _CACHE_TOKENS_VERIFICADOS.pop(token, None) # Remove entrada vencida, se houver
         return None # Retorna None em caso de erro na verificação (token inválido ou expirado)
+    if len(_CACHE_TOKENS_VERIFICADOS) >= _CACHE_TOKENS_MAX:
+        del _CACHE_TOKENS_VERIFICADOS[next(iter(_CACHE_TOKENS_VERIFICADOS))] # Descarta a entrada mais antiga
+    validade = agora + _CACHE_TOKENS_TTL_SEGUNDOS
+    expiracao = payload.get("exp")
+    if isinstance(expiracao, (int, float)) and expiracao < validade:
+        validade = expiracao # Nunca serve o token do cache depois da expiração
+    _CACHE_TOKENS_VERIFICADOS[token] = (payload, validade)
+    return payload # Retorna o payload decodificado
+
+def _detalhes_requisicao(request: Request, usuario: Optional[dict]) -> str:
+    """
+    Monta o texto com os detalhes da requisição usado nos logs dos endpoints matemáticos.
+    Chamado apenas quando o registro de log será de fato emitido.
+
+    Args:
+        request (Request): Objeto Request do FastAPI.
+        usuario (Optional[dict]): Payload JWT do usuário autenticado.
+
+    Returns:
+        str: Cliente, URL, usuário, nível de acesso e esquema da requisição.
+    """
+    return f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM"
+
+def _campos_incluidos(include: Optional[str]) -> frozenset:
+    """
+    Interpreta o parâmetro de query `include` (ex.: "sum,mean") dos endpoints matemáticos.
+
+    Args:
+        include (Optional[str]): Lista de campos separados por vírgula.
+
+    Returns:
+        frozenset: Conjunto de campos solicitados (vazio se o parâmetro não foi informado).
+    """
+    if not include:
+        return frozenset()
+    return frozenset(campo.strip() for campo in include.split(","))
+
+# Tabela de despacho de erros dos endpoints matemáticos: tipo da exceção -> (status HTTP, nível de log).
+# Erros de validação do corpo (Pydantic) são tratados pelo FastAPI antes do endpoint e não chegam aqui.
+_MAPA_ERROS_CALCULO = {
+    ValueError: (status.HTTP_422_UNPROCESSABLE_ENTITY, "warning"),
+    TypeError: (status.HTTP_400_BAD_REQUEST, "error"),
+}
+
+def _mapear_erro_calculo(erro: Exception) -> Optional[tuple]:
+    """
+    Procura a exceção (ou a classe base mais próxima) em _MAPA_ERROS_CALCULO.
+
+    Args:
+        erro (Exception): Exceção capturada no endpoint.
+
+    Returns:
+        Optional[tuple]: (status HTTP, nível de log) ou None se o erro não for esperado (erro interno).
+    """
+    for tipo in type(erro).__mro__:
+        mapeamento = _MAPA_ERROS_CALCULO.get(tipo)
+        if mapeamento is not None:
+            return mapeamento
+    return None
+
+# --- Carregamento de Credenciais ---
+
+@lru_cache(maxsize=2)
+def _carregar_credenciais(caminho_arquivo: str) -> dict:
+    """
+    Carrega e decodifica um arquivo JSON de credenciais, mantendo o resultado em cache.
+
+    O arquivo é lido apenas na primeira chamada para cada caminho; as chamadas
+    seguintes retornam o dicionário já carregado, sem acesso a disco. Exceções
+    (arquivo ausente ou JSON inválido) não são armazenadas em cache.
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo JSON de credenciais.
+
+    Returns:
+        dict: Credenciais carregadas do arquivo ('username' e 'password').
+
+    Raises:
+        FileNotFoundError: Se o arquivo de credenciais não existir.
+        json.JSONDecodeError: Se o conteúdo do arquivo não for um JSON válido (orjson.JSONDecodeError é subclasse).
+    """
+    with open(caminho_arquivo, "rb") as f: # Abre o arquivo de credenciais em modo binário (orjson decodifica UTF-8 diretamente)
+        return orjson.loads(f.read()) # Carrega as credenciais JSON
+
+def _recarregar_credenciais(signum, frame):
+    """Handler de sinal (SIGHUP) que limpa o cache de credenciais para forçar nova leitura dos arquivos."""
+    _carregar_credenciais.cache_clear() # Limpa o cache para recarregar as credenciais na próxima requisição
+
+if hasattr(signal, "SIGHUP"): # SIGHUP não existe no Windows
+    signal.signal(signal.SIGHUP, _recarregar_credenciais) # Permite recarregar as credenciais com 'kill -HUP <pid>'
 
 # --- Dependências de Segurança (JWT) ---
 
@@ -347,7 +681,9 @@ async def obter_usuario_atual_jwt(token: str = Depends(oauth2_scheme)):
     Raises:
         HTTPException: 401 UNAUTHORIZED se o token for inválido ou ausente.
     """
-    logger_app.debug(f"🔒 Validando Token JWT (ADMIN): {token[:10]}...", extra={'log_record_json': {"token_prefix": token[:10]}}) # Log de debug ao validar o token
+    if logger_app.isEnabledFor(logging.DEBUG): # Evita formatar a mensagem e montar o 'extra' quando DEBUG está desativado
+        prefixo_token = token[:10] # Fatia o token uma única vez para a mensagem e o 'extra'
+        logger_app.debug("🔒 Validando Token JWT (ADMIN): %s...", prefixo_token, extra={'log_record_json': {"token_prefix": prefixo_token}}) # Log de debug ao validar o token
     payload = verificar_token_jwt(token) # Verifica o token JWT
     if payload is None:
         logger_app.warning("⚠️ Token JWT inválido ou expirado (ADMIN). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_admin"}}) # Log de warning se token inválido
@@ -372,7 +708,9 @@ async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)):
     Raises:
         HTTPException: 401 UNAUTHORIZED se o token de tester for inválido ou ausente.
     """
-    logger_app.debug(f"🔒 Validando Token JWT (TESTER): {token[:10]}...", extra={'log_record_json':  {"token_prefix": token[:10]}}) # Log de debug ao validar o token de tester
+    if logger_app.isEnabledFor(logging.DEBUG): # Evita formatar a mensagem e montar o 'extra' quando DEBUG está desativado
+        prefixo_token = token[:10] # Fatia o token uma única vez para a mensagem e o 'extra'
+        logger_app.debug("🔒 Validando Token JWT (TESTER): %s...", prefixo_token, extra={'log_record_json': {"token_prefix": prefixo_token}}) # Log de debug ao validar o token de tester
     payload = verificar_token_jwt(token) # Verifica o token JWT
     if payload is None:
         logger_app.warning("⚠️ Token JWT inválido ou expirado (TESTER). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_tester"}}) # Log de warning se token de tester inválido
@@ -383,9 +721,311 @@ async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)):
         )
     return payload # Retorna o payload do token de tester se válido
 
+# --- Rate Limiting (Redis Sorted Set com janela deslizante) ---
+
+# Script Lua executado atomicamente no Redis: remove as entradas fora da janela,
+# conta as restantes e registra a requisição atual apenas se o limite não foi atingido.
+# Retorna 0 quando a requisição é permitida e 1 quando deve ser bloqueada.
+SCRIPT_LUA_RATE_LIMIT = """
+local janela_ms = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - janela_ms)
+local total = redis.call('ZCARD', KEYS[1])
+if total < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], janela_ms)
+    return 0
+end
+return 1
+"""
+
+redis_cliente = redis_asyncio.from_url(REDIS_URL, socket_connect_timeout=REDIS_TIMEOUT_SEGUNDOS, socket_timeout=REDIS_TIMEOUT_SEGUNDOS) # Cliente assíncrono (a conexão é aberta apenas no primeiro uso); timeouts curtos evitam travar requisições se o Redis cair
+script_rate_limit = redis_cliente.register_script(SCRIPT_LUA_RATE_LIMIT) # Script pré-registrado (executado via EVALSHA)
+_redis_pausado_ate = 0.0 # Instante (time.monotonic) até o qual o Redis não é consultado após uma falha
+_redis_ultimos_avisos: dict[str, float] = {} # Origem do aviso -> instante (time.monotonic) do último aviso registrado
+
+def _redis_em_pausa() -> bool:
+    """Indica se o Redis falhou recentemente e deve ser ignorado (usando o fallback local) até o fim da pausa."""
+    return time.monotonic() < _redis_pausado_ate
+
+def _registrar_falha_redis(origem: str, mensagem: str, erro: RedisError) -> None:
+    """
+    Pausa o uso do Redis por REDIS_PAUSA_APOS_FALHA_SEGUNDOS e registra o aviso no log no máximo uma vez
+    a cada REDIS_INTERVALO_AVISO_SEGUNDOS por origem, evitando um WARNING por requisição enquanto o Redis estiver fora.
+
+    Args:
+        origem (str): Identificador do uso do Redis que falhou (e.g., "rate_limit").
+        mensagem (str): Mensagem do aviso, com um `%s` para o erro.
+        erro (RedisError): Exceção levantada pelo cliente Redis.
+    """
+    global _redis_pausado_ate
+    agora = time.monotonic()
+    _redis_pausado_ate = agora + REDIS_PAUSA_APOS_FALHA_SEGUNDOS # Próximas requisições usam o fallback local sem esperar o timeout
+    if agora - _redis_ultimos_avisos.get(origem, -REDIS_INTERVALO_AVISO_SEGUNDOS) >= REDIS_INTERVALO_AVISO_SEGUNDOS:
+        _redis_ultimos_avisos[origem] = agora
+        logger_app.warning(mensagem, erro, extra={'log_record_json': {"erro": "RedisError", "detalhe_erro": str(erro), "origem": origem}}) # Aviso limitado por intervalo
+
+# --- Rate Limiting local (token bucket em memória) ---
+
+RATE_LIMIT_UNIDADE_TOKEN = 1_000_000 # Um token em unidades de ponto fixo (micro-tokens), evitando aritmética de ponto flutuante
+_BALDES_RATE_LIMIT: OrderedDict[str, tuple[int, int]] = OrderedDict() # Cliente -> (micro-tokens disponíveis, último reabastecimento em ns), do menos para o mais recente
+
+def _consumir_token_local(cliente: str) -> bool:
+    """
+    Consome um token do balde (token bucket) do cliente, mantido na memória do processo.
+
+    O balde tem capacidade para API_RATE_LIMIT requisições e é reabastecido
+    continuamente à taxa de API_RATE_LIMIT tokens por minuto. Toda a aritmética
+    é inteira (micro-tokens e nanossegundos), com custo O(1) e sem locks, pois
+    o event loop do asyncio é single-thread em cada worker.
+
+    No máximo API_RATE_LIMIT_CAPACITY clientes são mantidos, em ordem de atividade:
+    com a capacidade atingida, um cliente novo descarta em O(1) o balde do cliente
+    sem requisições há mais tempo (que volta com o balde cheio, como após um minuto parado).
+
+    Args:
+        cliente (str): Identificador do cliente (IP).
+
+    Returns:
+        bool: True se a requisição é permitida, False se o limite foi atingido.
+    """
+    agora_ns = time.monotonic_ns() # Relógio monotônico em nanossegundos
+    capacidade = RATE_LIMIT_REQUESTS_PER_MINUTE * RATE_LIMIT_UNIDADE_TOKEN # Capacidade do balde em micro-tokens
+    entrada = _BALDES_RATE_LIMIT.get(cliente)
+    if entrada is None: # Cliente novo começa com o balde cheio
+        if len(_BALDES_RATE_LIMIT) >= RATE_LIMIT_CAPACIDADE: # Capacidade atingida: descarta o cliente inativo há mais tempo
+            _BALDES_RATE_LIMIT.popitem(last=False)
+        tokens, ultimo_ns = capacidade, agora_ns
+    else:
+        _BALDES_RATE_LIMIT.move_to_end(cliente) # Cliente ativo passa para o fim da ordem de descarte
+        tokens, ultimo_ns = entrada
+    tokens = min(capacidade, tokens + (agora_ns - ultimo_ns) * RATE_LIMIT_REQUESTS_PER_MINUTE // 60_000) # Reabastece: (limite * 10^6 micro-tokens) / (60 * 10^9 ns)
+    permitido = tokens >= RATE_LIMIT_UNIDADE_TOKEN # Há pelo menos um token inteiro disponível?
+    _BALDES_RATE_LIMIT[cliente] = (tokens - RATE_LIMIT_UNIDADE_TOKEN * permitido, agora_ns) # Desconta o token apenas se permitido (sem desvio condicional)
+    return permitido
+
+async def verificar_rate_limit(request: Request):
+    """
+    Dependência do FastAPI que aplica o rate limiting por IP do cliente.
+
+    Com API_RATE_LIMIT_BACKEND="redis", o estado fica em um Sorted Set do Redis por
+    cliente, compartilhado por todos os workers, de modo que o limite efetivo é o
+    configurado em API_RATE_LIMIT independentemente do número de processos. Se o
+    Redis estiver indisponível, é usado o token bucket local do processo e um aviso
+    é registrado no log. Com API_RATE_LIMIT_BACKEND="memoria", apenas o token bucket
+    local é usado (adequado para um único processo). Após uma falha, o Redis deixa de ser consultado
+    por REDIS_PAUSA_APOS_FALHA_SEGUNDOS e o aviso é registrado no máximo uma vez por minuto.
+
+    Args:
+        request (Request): Objeto Request do FastAPI, usado para identificar o cliente.
+
+    Raises:
+        HTTPException: 429 TOO_MANY_REQUESTS se o cliente excedeu o limite de requisições por minuto.
+    """
+    cliente = request.client.host if request.client else "desconhecido" # Identifica o cliente pelo IP
+    if RATE_LIMIT_BACKEND == "memoria" or _redis_em_pausa():
+        bloqueado = not _consumir_token_local(cliente) # Token bucket local (processo único ou Redis fora do ar)
+    else:
+        agora_ms = int(time.time() * 1000) # Timestamp atual em milissegundos (score no Sorted Set)
+        try:
+            bloqueado = await script_rate_limit(
+                keys=[f"rate_limit:{cliente}"],
+                args=[agora_ms, RATE_LIMIT_REQUESTS_PER_MINUTE, f"{agora_ms}-{uuid.uuid4().hex}", RATE_LIMIT_JANELA_MS],
+            ) # Executa o script Lua atomicamente no Redis
+        except RedisError as e:
+            _registrar_falha_redis("rate_limit", "⚠️ Rate limiting indisponível (Redis): %s. Usando limite local do processo.", e) # Não derruba a API se o Redis cair
+            bloqueado = not _consumir_token_local(cliente) # Fallback para o token bucket local
+    if bloqueado:
+        logger_app.warning(f"⚠️ Limite de {RATE_LIMIT_REQUESTS_PER_MINUTE} requisições por minuto excedido pelo cliente {cliente}.", extra={'log_record_json': {"cliente": cliente, "limite_por_minuto": RATE_LIMIT_REQUESTS_PER_MINUTE}}) # Log de warning ao bloquear o cliente
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, # Retorna erro 429
+            detail="Limite de requisições excedido. Tente novamente em instantes.",
+            headers={"Retry-After": str(RATE_LIMIT_JANELA_MS // 1000)}, # Indica ao cliente quando tentar novamente
+        )
+
+# --- Cache de Médias (Redis) ---
+
+# O cache usa o mesmo Redis do rate limiting; com o backend "memoria" não há Redis disponível e o cálculo é sempre direto
+CACHE_MEDIA_ATIVO = CACHE_MEDIA_TTL_SEGUNDOS > 0 and RATE_LIMIT_BACKEND == "redis"
+
+def _vetor_int64(lista_numeros: List[int]) -> Optional[np.ndarray]:
+    """
+    Converte a lista em um vetor int64 contíguo (buffer pré-alocado, preenchido em C), ou None se houver inteiros além do int64.
+    O mesmo vetor é reaproveitado pela chave do cache e pelo cálculo, evitando uma nova conversão e alocação por requisição.
+    """
+    try:
+        return np.fromiter(lista_numeros, dtype=np.int64, count=len(lista_numeros))
+    except OverflowError:
+        return None
+
+def _soma_e_media_vetor(lista_numeros: List[int], vetor_numeros: Optional[np.ndarray] = None) -> tuple:
+    """
+    Calcula soma e média de uma lista já validada pelo Pydantic (apenas inteiros) sobre um vetor int64 pré-alocado.
+
+    Como o Pydantic já garantiu os tipos, a validação elemento a elemento da biblioteca é dispensada e a redução
+    roda no kernel vetorizado. A soma é inteira e exata (a média é soma / tamanho), ao contrário de np.mean,
+    que acumula em float64. Inteiros fora do int64 seguem pelo caminho completo da biblioteca.
+
+    Args:
+        lista_numeros (List[int]): Vetor de números validado.
+        vetor_numeros (Optional[np.ndarray]): Vetor int64 já convertido por `_vetor_int64`, se disponível.
+
+    Returns:
+        tuple: (soma, média), com média None para lista vazia.
+    """
+    if not lista_numeros:
+        return 0, None # Lista vazia: média indefinida
+    if vetor_numeros is None:
+        vetor_numeros = _vetor_int64(lista_numeros) # Buffer contíguo pré-alocado
+    if vetor_numeros is None:
+        return INSTANCIA_NUMEROS.sum_and_average(lista_numeros) # Inteiros além do int64: aritmética de precisão arbitrária
+    soma = INSTANCIA_NUMEROS.sum_int64_array(vetor_numeros) # Redução vetorizada (com proteção contra overflow do int64)
+    return soma, soma / vetor_numeros.size
+
+# --- Agrupamento de Médias (micro-batching) ---
+
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+def _somas_e_medias_lote(listas: List[List[int]]) -> list:
+    """
+    Calcula soma e média de vários vetores não vazios com uma única redução numpy (np.add.reduceat) sobre o lote concatenado.
+
+    Args:
+        listas (List[List[int]]): Vetores validados, todos com pelo menos um elemento.
+
+    Returns:
+        list: Uma tupla (soma, média) por vetor, na mesma ordem.
+    """
+    tamanhos = [len(lista) for lista in listas]
+    try:
+        vetor_lote = np.fromiter(itertools.chain.from_iterable(listas), dtype=np.int64, count=sum(tamanhos)) # Lote contíguo pré-alocado
+    except OverflowError:
+        return [_soma_e_media_vetor(lista) for lista in listas] # Inteiros além do int64: vetor a vetor
+    if max(int(vetor_lote.max()), -int(vetor_lote.min())) * max(tamanhos) > _INT64_MAX:
+        return [_soma_e_media_vetor(lista) for lista in listas] # Risco de overflow no acumulador int64: vetor a vetor
+    inicios = np.fromiter(itertools.accumulate(tamanhos[:-1], initial=0), dtype=np.int64, count=len(tamanhos)) # Início de cada vetor no lote
+    somas = np.add.reduceat(vetor_lote, inicios).tolist() # Uma única chamada para todas as somas
+    return [(soma, soma / tamanho) for soma, tamanho in zip(somas, tamanhos)]
+
+class AgrupadorMedias:
+    """
+    Agrupa cálculos de soma/média que chegam dentro de uma janela curta (API_MEAN_BATCH_WINDOW_MS) em um único lote numpy.
+    Cada requisição enfileira (vetor, future) e aguarda o future; uma tarefa em segundo plano drena a fila e resolve os futures.
+    Desativado por padrão: só compensa sob alta concorrência, pois cada requisição espera até o fim da janela.
+    """
+    def __init__(self, janela_ms: float, tamanho_max: int):
+        self.janela_segundos = janela_ms / 1000 # Janela de agrupamento em segundos
+        self.tamanho_max = tamanho_max # Máximo de vetores por lote
+        self.fila: Optional[asyncio.Queue] = None # Criada em iniciar(), dentro do event loop
+        self.tarefa: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        """Indica se a tarefa de agrupamento está em execução."""
+        return self.tarefa is not None
+
+    def iniciar(self):
+        """Cria a fila e a tarefa de processamento no event loop atual."""
+        self.fila = asyncio.Queue()
+        self.tarefa = asyncio.create_task(self._processar())
+
+    async def parar(self):
+        """Cancela a tarefa de processamento (no encerramento da aplicação)."""
+        if self.tarefa is not None:
+            self.tarefa.cancel()
+            try:
+                await self.tarefa
+            except asyncio.CancelledError:
+                pass
+            self.tarefa = None
+
+    async def calcular(self, lista_numeros: List[int]) -> tuple:
+        """Enfileira o vetor no próximo lote e aguarda (soma, média)."""
+        futuro = asyncio.get_running_loop().create_future()
+        self.fila.put_nowait((lista_numeros, futuro))
+        return await futuro
+
+    async def _processar(self):
+        """Laço da tarefa: espera o primeiro vetor, aguarda a janela, drena até tamanho_max itens e resolve os futures."""
+        while True:
+            lote = [await self.fila.get()]
+            await asyncio.sleep(self.janela_segundos) # Janela para outras requisições entrarem no lote
+            while len(lote) < self.tamanho_max and not self.fila.empty():
+                lote.append(self.fila.get_nowait())
+            try:
+                resultados = _somas_e_medias_lote([lista for lista, _ in lote])
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e) # O erro chega à requisição como se o cálculo fosse direto
+                continue
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done(): # A requisição pode ter sido cancelada (cliente desconectou)
+                    futuro.set_result(resultado)
+
+agrupador_medias = AgrupadorMedias(LOTE_MEDIAS_JANELA_MS, LOTE_MEDIAS_TAMANHO_MAX) # Instância única, iniciada no ciclo de vida da aplicação
+
+async def _calcular_soma_e_media(lista_numeros: List[int], vetor_numeros: Optional[np.ndarray] = None) -> tuple:
+    """Calcula (soma, média) pelo agrupador de médias, se ativo, ou diretamente sobre o vetor int64 (reaproveitando `vetor_numeros`, se informado)."""
+    if agrupador_medias.ativo and lista_numeros:
+        return await agrupador_medias.calcular(lista_numeros)
+    return _soma_e_media_vetor(lista_numeros, vetor_numeros)
+
+def _chave_cache_media(lista_numeros: List[int], vetor_numeros: Optional[np.ndarray]) -> str:
+    """
+    Gera a chave do cache de médias com xxh3 (128 bits) direto sobre o buffer int64 do vetor, sem serializar a lista em JSON nem copiar os bytes.
+    Vetores com inteiros além do int64 usam a representação textual da lista; o prefixo diferente evita colisões entre os dois formatos.
+
+    Args:
+        lista_numeros (List[int]): Vetor de números já validado pelo Pydantic.
+        vetor_numeros (Optional[np.ndarray]): Vetor int64 de `_vetor_int64`, ou None se a lista não cabe em int64.
+
+    Returns:
+        str: Chave do Redis para o vetor.
+    """
+    if vetor_numeros is None:
+        return "media:big:" + xxhash.xxh3_128_hexdigest(repr(lista_numeros).encode()) # Inteiros de precisão arbitrária
+    return "media:" + xxhash.xxh3_128_hexdigest(vetor_numeros) # Buffer contíguo lido diretamente (protocolo de buffer)
+
+async def _soma_e_media_memoizadas(lista_numeros: List[int]) -> tuple:
+    """
+    Calcula soma e média do vetor, reaproveitando o resultado memoizado no Redis para vetores idênticos.
+
+    A chave é um hash xxh3 de 128 bits dos bytes do vetor (ver `_chave_cache_media`). Erros de validação da biblioteca
+    não são memoizados e se propagam normalmente; resultados com soma além do int64 (não serializáveis pelo orjson) também
+    não são memoizados. Se o Redis estiver indisponível (ou em pausa após uma falha), o cálculo é feito localmente e o aviso
+    é registrado no máximo uma vez por minuto (ver `_registrar_falha_redis`).
+
+    Args:
+        lista_numeros (List[int]): Vetor de números já validado pelo Pydantic.
+
+    Returns:
+        tuple: (soma, média), com média None para lista vazia.
+    """
+    if not CACHE_MEDIA_ATIVO or _redis_em_pausa():
+        return await _calcular_soma_e_media(lista_numeros) # Cache desativado ou Redis fora do ar: cálculo direto
+    vetor_numeros = _vetor_int64(lista_numeros) # Convertido uma única vez: usado na chave e, no cache miss, no cálculo
+    chave_cache = _chave_cache_media(lista_numeros, vetor_numeros) # Hash canônico do vetor
+    try:
+        valor_cache = await redis_cliente.get(chave_cache)
+        if valor_cache is not None:
+            return tuple(orjson.loads(valor_cache)) # Cache hit: sem chamar a biblioteca
+    except RedisError as e:
+        _registrar_falha_redis("cache_media", "⚠️ Cache de médias indisponível (Redis): %s. Calculando localmente.", e) # Não derruba a API se o Redis cair
+        return await _calcular_soma_e_media(lista_numeros, vetor_numeros)
+    resultado = await _calcular_soma_e_media(lista_numeros, vetor_numeros) # Cache miss: calcula
+    try:
+        valor_cache = orjson.dumps(resultado) # (soma, média) serializados para o Redis
+    except TypeError: # Soma além do int64: orjson não a serializa, então o resultado é devolvido sem memoizar
+        return resultado
+    try:
+        await redis_cliente.setex(chave_cache, CACHE_MEDIA_TTL_SEGUNDOS, valor_cache) # Memoiza (soma, média) com validade
+    except RedisError as e:
+        _registrar_falha_redis("cache_media", "⚠️ Não foi possível gravar a média no cache (Redis): %s.", e)
+    return resultado
+
 # --- Endpoints da API ---
 
-@app.post("/token_admin", tags=["autenticação_segura"], response_model=TokenResponse, summary="Gera token JWT seguro (credenciais 'admin/admin')")
+@app.post("/token_admin", tags=["autenticação_segura"], dependencies=[Depends(verificar_rate_limit)], response_model=TokenResponse, summary="Gera token JWT seguro (credenciais 'admin/admin')")
 async def gerar_token_admin_seguro(token_request: TokenRequest):
     """
     Endpoint para gerar um token JWT de administrador.
@@ -401,14 +1041,10 @@ async def gerar_token_admin_seguro(token_request: TokenRequest):
     Raises:
         HTTPException: 401 UNAUTHORIZED se as credenciais estiverem incorretas, 500 INTERNAL_SERVER_ERROR se houver erro ao ler o arquivo de credenciais.
     """
-    logger_app.info(f"🔑 Requisição para gerar token JWT (ADMIN) recebida para usuário: '{token_request.username}'", extra={'log_record_json': {"username": token_request.username}}) # Log de info ao receber requisição de token
-
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials") # Diretório para arquivos de credenciais
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # Caminho para o arquivo de credenciais de admin
+    logger_app.info("🔑 Requisição para gerar token JWT (ADMIN) recebida para usuário: '%s'", token_request.username, extra={'log_record_json': {"username": token_request.username}}) # Log de info ao receber requisição de token
 
     try:
-        with open(ADMIN_CREDENTIALS_FILE, "r", encoding='utf-8') as f: # Abre o arquivo de credenciais de admin
-            usuario_admin = json.load(f) # Carrega as credenciais JSON
+        usuario_admin = await run_in_threadpool(_carregar_credenciais, ADMIN_CREDENTIALS_FILE) # Carrega as credenciais de admin em uma thread, sem bloquear o event loop (lidas do disco apenas na primeira requisição)
     except FileNotFoundError:
         logger_app.critical(f"💥 Arquivo de credenciais admin não encontrado: '{ADMIN_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": ADMIN_CREDENTIALS_FILE}}) # Log crítico se arquivo não encontrado
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais não encontrado.") # Retorna erro 500
@@ -417,15 +1053,14 @@ async def gerar_token_admin_seguro(token_request: TokenRequest):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais.") # Retorna erro 500
 
     if token_request.username == usuario_admin["username"] and token_request.password == usuario_admin["password"]: # Verifica as credenciais
-        tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES) # Define o tempo de expiração do token
-        token_jwt = gerar_token_jwt(data={"sub": token_request.username, "nivel_acesso": "admin"}, expires_delta=tempo_expiracao_token) # Gera o token JWT
-        logger_app.info(f"🔑 Token JWT (ADMIN) gerado com sucesso para usuário 'admin'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "admin", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # Log de info ao gerar token
+        token_jwt = gerar_token_jwt(data={"sub": token_request.username, "nivel_acesso": "admin"}) # Gera o token JWT
+        logger_app.info("🔑 Token JWT (ADMIN) gerado com sucesso para usuário 'admin'. Expira em %s minutos.", ACCESS_TOKEN_EXPIRE_MINUTES, extra={'log_record_json': {"usuario": "admin", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # Log de info ao gerar token
         return {"access_token": token_jwt, "token_type": "bearer", "nivel_acesso": "admin"} # Retorna a resposta com o token
     else:
         logger_app.warning(f"⚠️ Falha na autenticação (ADMIN) para usuário '{token_request.username}'. Credenciais inválidas.", extra={'log_record_json': {"username": token_request.username}}) # Log de warning se credenciais inválidas
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais de administrador incorretas.") # Retorna erro 401
 
-@app.post("/token_tester", tags=["autenticação_segura_tester"], response_model=TokenResponse, summary="Gera token JWT seguro para TESTER (credenciais 'tester/tester')")
+@app.post("/token_tester", tags=["autenticação_segura_tester"], dependencies=[Depends(verificar_rate_limit)], response_model=TokenResponse, summary="Gera token JWT seguro para TESTER (credenciais 'tester/tester')")
 async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Endpoint para gerar um token JWT de tester.
@@ -442,14 +1077,10 @@ async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depen
     Raises:
         HTTPException: 401 UNAUTHORIZED se as credenciais estiverem incorretas, 500 INTERNAL_SERVER_ERROR se houver erro ao ler o arquivo de credenciais.
     """
-    logger_app.info(f"🔑 Requisição para gerar token JWT (TESTER) recebida para usuário: '{form_data.username}'", extra={'log_record_json': {"username": form_data.username}}) # Log de info ao receber requisição de token de tester
-
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials") # Diretório para arquivos de credenciais
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # Caminho para o arquivo de credenciais de tester
+    logger_app.info("🔑 Requisição para gerar token JWT (TESTER) recebida para usuário: '%s'", form_data.username, extra={'log_record_json': {"username": form_data.username}}) # Log de info ao receber requisição de token de tester
 
     try:
-        with open(TESTER_CREDENTIALS_FILE, "r", encoding='utf-8') as f: # Abre o arquivo de credenciais de tester
-            usuario_tester = json.load(f) # Carrega as credenciais JSON
+        usuario_tester = await run_in_threadpool(_carregar_credenciais, TESTER_CREDENTIALS_FILE) # Carrega as credenciais de tester em uma thread, sem bloquear o event loop (lidas do disco apenas na primeira requisição)
     except FileNotFoundError:
         logger_app.critical(f"💥 Arquivo de credenciais tester não encontrado: '{TESTER_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": TESTER_CREDENTIALS_FILE}}) # Log crítico se arquivo não encontrado
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais de tester não encontrado.") # Retorna erro 500
@@ -458,16 +1089,15 @@ async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depen
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais de tester.") # Retorna erro 500
 
     if form_data.username == usuario_tester["username"] and form_data.password == usuario_tester["password"]: # Verifica as credenciais de tester
-        tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES) # Define o tempo de expiração do token
-        token_jwt = gerar_token_jwt(data={"sub": form_data.username, "nivel_acesso": "tester"}, expires_delta=tempo_expiracao_token) # Gera o token JWT de tester
-        logger_app.info(f"🔑 Token JWT (TESTER) gerado com sucesso para usuário 'tester'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "tester", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # Log de info ao gerar token de tester
+        token_jwt = gerar_token_jwt(data={"sub": form_data.username, "nivel_acesso": "tester"}) # Gera o token JWT de tester
+        logger_app.info("🔑 Token JWT (TESTER) gerado com sucesso para usuário 'tester'. Expira em %s minutos.", ACCESS_TOKEN_EXPIRE_MINUTES, extra={'log_record_json': {"usuario": "tester", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # Log de info ao gerar token de tester
         return {"access_token": token_jwt, "token_type": "bearer", "nivel_acesso": "tester"} # Retorna a resposta com o token de tester
     else:
         logger_app.warning(f"⚠️ Requisição para /token_tester com credenciais de tester inválidas (IGNORADO para testes API).", extra={'log_record_json': {"username": form_data.username}}) # Log de warning se credenciais de tester inválidas (para testes)
         return {"access_token": "TOKEN_INVALIDO_PARA_TESTE", "token_type": "bearer", "nivel_acesso": "tester"} # Retorna um token inválido para testes
 
-@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=SomaResponse, response_class=JSONResponse)
-async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)):
+@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=SomaResponse, response_model_exclude_unset=True)
+async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, include: Optional[str] = None, usuario: dict = Depends(obter_usuario_atual_jwt)):
     """
     Endpoint protegido para somar um vetor de números inteiros.
     Requer autenticação JWT de administrador para ser acessado.
@@ -475,6 +1105,7 @@ async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario
     Args:
         request (Request): Objeto Request do FastAPI para detalhes da requisição.
         numeros_entrada (NumerosEntrada): Dados de entrada contendo a lista de números a serem somados.
+        include (Optional[str]): Campos extras separados por vírgula; "mean" inclui a média, calculada na mesma passada da soma.
         usuario (dict): Usuário autenticado (extraído do token JWT pela dependência `obter_usuario_atual_jwt`).
 
     Returns:
@@ -483,115 +1114,189 @@ async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario
     Raises:
         HTTPException: 422 UNPROCESSABLE_ENTITY se houver erro de validação nos dados de entrada, 400 BAD_REQUEST se houver erro de tipo de dados, 500 INTERNAL_SERVER_ERROR em caso de erro interno.
     """
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM" # Detalhes da requisição para logs
-    logger_app.info(f"➡️  Requisição POST em '/somar' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}}) # Log de info ao receber requisição de soma
+    detalhes_requisicao = _detalhes_requisicao(request, usuario) # Montado uma vez e anexado pelos formatters (extra 'contexto')
+    logger_app.info("➡️  Requisição POST em '/somar' (PROTEGIDO)", extra={'contexto': detalhes_requisicao, 'log_record_json': {}}) # Log de info ao receber requisição de soma
 
     try:
         lista_numeros = numeros_entrada.numeros # Obtém a lista de números do corpo da requisição
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # Log de debug com os números de entrada
+        if logger_app.isEnabledFor(logging.DEBUG): # Evita converter a lista inteira em texto quando DEBUG está desativado
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # Log de debug com os números de entrada
 
-        instancia_numeros = Numbers() # Instancia a classe Numbers da biblioteca calc_numbers
-        resultado_soma = instancia_numeros.sum_numbers(lista_numeros) # Chama a função para somar os números
+        if "mean" in _campos_incluidos(include): # Soma e média em uma única passada sobre o vetor
+            resultado_soma, resultado_media = INSTANCIA_NUMEROS.sum_and_average(lista_numeros, operation_name="soma")
+        else:
+            resultado_soma = INSTANCIA_NUMEROS.sum_numbers(lista_numeros) # Chama a função para somar os números (instância compartilhada)
+            resultado_media = None
 
         conteudo_resposta = {"resultado": resultado_soma, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # Prepara o conteúdo da resposta
-        logger_app.info(f"➕ Operação de soma bem-sucedida. Resultado: {resultado_soma} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # Log de info com o resultado da soma
+        if resultado_media is not None:
+            conteudo_resposta["media"] = resultado_media # Campo extra solicitado via ?include
+        if logger_app.isEnabledFor(logging.INFO): # Monta o 'extra' apenas se o log for emitido
+            logger_app.info("➕ Operação de soma bem-sucedida. Resultado: %s", resultado_soma, extra={'contexto': detalhes_requisicao, 'log_record_json': {"resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # Log de info com o resultado da soma
         return conteudo_resposta # Retorna a resposta
 
+    except Exception as e:
+        mapeamento_erro = _mapear_erro_calculo(e) # Uma única consulta à tabela de despacho
+        if mapeamento_erro is None:
+            msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}" # Mensagem de erro detalhada
+            logger_app.critical("💥 Erro Crítico no Servidor: %s", msg_detalhe_erro, exc_info=True, extra={'contexto': detalhes_requisicao, 'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # Log crítico para erros inesperados
+            return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna erro 500
+        status_code_erro, nivel_log = mapeamento_erro
+        detalhe_erro = str(e) # Mensagem da biblioteca de cálculos
+        getattr(logger_app, nivel_log)("⚠️ Erro %s nos dados de entrada para '/somar': %s", type(e).__name__, detalhe_erro, extra={'contexto': detalhes_requisicao, 'log_record_json': {"erro_biblioteca": detalhe_erro, "status_code": status_code_erro}}) # Log no nível definido pela tabela
+        raise HTTPException(status_code=status_code_erro, detail=detalhe_erro) # Retorna o status definido pela tabela
+
+@app.post("/somar_fast", tags=["matemática_segura"], summary="Soma um vetor de números inteiros lendo o corpo bruto (PROTEGIDO)", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=None)
+async def somar_vetor_rapido(request: Request, usuario: dict = Depends(obter_usuario_atual_jwt)):
+    """
+    Variante de '/somar' para vetores grandes: o corpo é lido como bytes, decodificado com orjson e
+    convertido para um vetor numpy int64 em um único passo em C, sem o modelo Pydantic por elemento.
+    Assim como '/somar', apenas inteiros JSON são aceitos: qualquer outro elemento (float, string, booleano, lista)
+    é rejeitado com o mesmo 422 de NumerosEntrada. Inteiros fora do int64 seguem pela biblioteca.
+
+    Args:
+        request (Request): Objeto Request do FastAPI, de onde o corpo JSON bruto é lido.
+        usuario (dict): Usuário autenticado (extraído do token JWT pela dependência `obter_usuario_atual_jwt`).
+
+    Returns:
+        ORJSONResponse: Mesmo formato de resposta de '/somar' (SomaResponse).
+
+    Raises:
+        RequestValidationError: 422 UNPROCESSABLE_ENTITY (mesmo formato de '/somar') se 'numeros' não for uma lista de inteiros.
+        HTTPException: 422 UNPROCESSABLE_ENTITY se o corpo for inválido ou a lista estiver vazia, 400 BAD_REQUEST se houver erro de tipo de dados.
+    """
+    detalhes_requisicao = _detalhes_requisicao(request, usuario) # Montado uma vez e anexado pelos formatters (extra 'contexto')
+    logger_app.info("➡️  Requisição POST em '/somar_fast' (PROTEGIDO)", extra={'contexto': detalhes_requisicao, 'log_record_json': {}}) # Log de info ao receber requisição de soma
+
+    corpo = await request.body() # Corpo bruto (reaproveitado pela validação completa em caso de erro)
+    try:
+        dados = orjson.loads(corpo) # Decodifica o corpo bruto diretamente com orjson
+    except orjson.JSONDecodeError as e_json:
+        logger_app.warning("⚠️ Corpo JSON inválido para '/somar_fast': %s", e_json, extra={'contexto': detalhes_requisicao, 'log_record_json': {"erro_json": str(e_json)}}) # Log de warning se o JSON for inválido
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Corpo da requisição não é um JSON válido.") # Retorna erro 422
+    lista_numeros = dados.get("numeros") if isinstance(dados, dict) else None # Obtém a lista de números do corpo
+    if not isinstance(lista_numeros, list) or not set(map(type, lista_numeros)) <= {int}: # Tipos exatos verificados em C (bool não é aceito, como no modo estrito)
+        _validar_numeros_entrada(corpo) # Mesmo 422 de '/somar' (NumerosEntrada em modo estrito), com a localização do elemento inválido
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="O campo 'numeros' deve ser uma lista de inteiros.") # Retorna erro 422
+    if len(lista_numeros) > TAMANHO_MAXIMO_VETOR:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"A lista de números deve ter no máximo {TAMANHO_MAXIMO_VETOR} elementos.") # Mesmo limite de NumerosEntrada
+
+    try:
+        vetor_numeros = np.array(lista_numeros) # Conversão em C; dtype int64 se todos os inteiros couberem em 64 bits
+        if vetor_numeros.dtype == np.int64 and vetor_numeros.size:
+            resultado_soma = INSTANCIA_NUMEROS.sum_int64_array(vetor_numeros) # Caminho rápido: vetor contíguo int64
+        else:
+            resultado_soma = INSTANCIA_NUMEROS.sum_numbers(lista_numeros) # Lista vazia ou inteiros além do int64: validação e mensagens de erro da biblioteca
     except ValueError as e_calc_value:
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/somar': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # Log de warning se erro de valor na biblioteca
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/somar_fast': %s", e_calc_value, extra={'contexto': detalhes_requisicao, 'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # Log de warning se erro de valor na biblioteca
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value)) # Retorna erro 422
     except TypeError as e_calc_type:
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # Log de erro se erro de tipo na biblioteca
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar_fast': %s", e_calc_type, extra={'contexto': detalhes_requisicao, 'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # Log de erro se erro de tipo na biblioteca
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type)) # Retorna erro 400
-    except HTTPException as exc_http:
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # Log de erro se exceção HTTP
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
-    except ValidationError as ve:
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}}) # Log de warning se erro de validação Pydantic
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors()) # Retorna erro 422
-    except Exception as e:
-        msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}" # Mensagem de erro detalhada
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # Log crítico para erros inesperados
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna erro 500
 
-@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=MediaResponse, response_class=JSONResponse)
-async def calcular_media_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)):
+    conteudo_resposta = {"resultado": resultado_soma, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # Mesmo formato de SomaResponse
+    if logger_app.isEnabledFor(logging.INFO): # Monta o 'extra' apenas se o log for emitido
+        logger_app.info("➕ Operação de soma (fast) bem-sucedida. Resultado: %s", resultado_soma, extra={'contexto': detalhes_requisicao, 'log_record_json': {"resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # Log de info com o resultado da soma
+    return ORJSONResponse(content=conteudo_resposta) # Serializa direto com orjson, sem passar pelo jsonable_encoder
+
+def _validar_numeros_entrada(corpo: bytes) -> NumerosEntrada:
+    """
+    Valida o corpo JSON bruto diretamente no núcleo do Pydantic (`model_validate_json`), sem o passo
+    intermediário de decodificação para dict feito pelo FastAPI. Erros são convertidos em
+    RequestValidationError, mantendo a mesma resposta 422 da validação automática do corpo.
+
+    Args:
+        corpo (bytes): Corpo bruto da requisição.
+
+    Returns:
+        NumerosEntrada: Entrada validada.
+
+    Raises:
+        RequestValidationError: Se o corpo não for um JSON válido no formato de NumerosEntrada.
+    """
+    try:
+        return NumerosEntrada.model_validate_json(corpo)
+    except ValidationError as e:
+        raise RequestValidationError([{**erro, "loc": ("body", *erro["loc"])} for erro in e.errors(include_url=False)]) # Mesmo formato de 'loc' da validação automática
+
+_SCHEMA_CORPO_NUMEROS = {"requestBody": {"required": True, "content": {"application/json": {"schema": NumerosEntrada.model_json_schema()}}}} # Mantém o corpo documentado no OpenAPI
+
+@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=MediaResponse, openapi_extra=_SCHEMA_CORPO_NUMEROS)
+async def calcular_media_vetor(request: Request, include: Optional[str] = None, usuario: dict = Depends(obter_usuario_atual_jwt)):
     """
     Endpoint protegido para calcular a média de um vetor de números inteiros.
     Requer autenticação JWT de administrador para ser acessado.
+    O corpo (NumerosEntrada) é validado a partir dos bytes brutos por `_validar_numeros_entrada`.
 
     Args:
-        request (Request): Objeto Request do FastAPI para detalhes da requisição.
-        numeros_entrada (NumerosEntrada): Dados de entrada contendo a lista de números para calcular a média.
+        request (Request): Objeto Request do FastAPI para detalhes da requisição e leitura do corpo.
+        include (Optional[str]): Campos extras separados por vírgula; "sum" inclui a soma, calculada na mesma passada da média.
         usuario (dict): Usuário autenticado (extraído do token JWT pela dependência `obter_usuario_atual_jwt`).
 
     Returns:
-        MediaResponse: Resposta contendo a média, mensagem de sucesso e detalhes da requisição.
+        ORJSONResponse: Resposta no formato MediaResponse (média, mensagem de sucesso e detalhes da requisição), serializada com orjson.
 
     Raises:
         HTTPException: 422 UNPROCESSABLE_ENTITY se houver erro de validação nos dados de entrada, 400 BAD_REQUEST se houver erro de tipo de dados, 500 INTERNAL_SERVER_ERROR em caso de erro interno.
     """
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM" # Detalhes da requisição para logs
-    logger_app.info(f"➡️  Requisição POST em '/calcular_media' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}}) # Log de info ao receber requisição de média
-
+    sub_usuario = usuario.get('sub') # Lidos uma única vez do payload JWT e reutilizados na resposta e nos logs
+    nivel_acesso = usuario.get('nivel_acesso')
+    info_ativo = logger_app.isEnabledFor(logging.INFO) # Os detalhes da requisição só são montados se o log INFO for emitido
+    if info_ativo:
+        detalhes_requisicao = _detalhes_requisicao(request, usuario) # Montado uma vez para os dois logs INFO
+        logger_app.info("➡️  Requisição POST em '/calcular_media' (PROTEGIDO)", extra={'contexto': detalhes_requisicao, 'log_record_json': {}}) # Log de info ao receber requisição de média
+
+    numeros_entrada = _validar_numeros_entrada(await request.body()) # Corpo validado direto dos bytes (422 se inválido)
     try:
         lista_numeros = numeros_entrada.numeros # Obtém a lista de números do corpo da requisição
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # Log de debug com os números de entrada
+        if logger_app.isEnabledFor(logging.DEBUG): # Evita converter a lista inteira em texto quando DEBUG está desativado
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # Log de debug com os números de entrada
 
-        instancia_numeros = Numbers() # Instancia a classe Numbers da biblioteca calc_numbers
-        resultado_media = instancia_numeros.calculate_average(lista_numeros) # Chama a função para calcular a média
+        incluir_soma = "sum" in _campos_incluidos(include) # A soma sai da mesma passada da média
+        if len(lista_numeros) <= 1: # Casos triviais (vazia ou um elemento): resposta direta, sem hash, Redis nem biblioteca
+            resultado_soma = lista_numeros[0] if lista_numeros else 0
+            resultado_media = float(resultado_soma) if lista_numeros else None
+        else:
+            resultado_soma, resultado_media = await _soma_e_media_memoizadas(lista_numeros) # Soma e média (memoizadas no Redis para vetores repetidos)
 
         if resultado_media is None: # Trata o caso de lista vazia, onde a média é None
-            return {"media": None, "mensagem": "Operação de média bem-sucedida para lista vazia", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # Retorna resposta para lista vazia
-
-        conteudo_resposta = {"media": resultado_media, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # Prepara o conteúdo da resposta
-        logger_app.info(f"➗ Operação de média bem-sucedida. Média: {resultado_media} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_media": resultado_media, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # Log de info com o resultado da média
-        return conteudo_resposta # Retorna a resposta
+            conteudo_resposta = {"media": None, "mensagem": "Operação de média bem-sucedida para lista vazia", "numeros_entrada": lista_numeros, "usuario": sub_usuario, "nivel_acesso": nivel_acesso} # Resposta para lista vazia
+            if incluir_soma:
+                conteudo_resposta["soma"] = resultado_soma
+            return ORJSONResponse(content=conteudo_resposta) # Retorna resposta para lista vazia
+
+        conteudo_resposta = {"media": resultado_media, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": lista_numeros, "usuario": sub_usuario, "nivel_acesso": nivel_acesso} # Prepara o conteúdo da resposta
+        if incluir_soma:
+            conteudo_resposta["soma"] = resultado_soma # Campo extra solicitado via ?include
+        if info_ativo:
+            logger_app.info("➗ Operação de média bem-sucedida. Média: %s", resultado_media, extra={'contexto': detalhes_requisicao, 'log_record_json': {"resultado_media": resultado_media, "usuario": sub_usuario, "nivel_acesso": nivel_acesso}}) # Log de info com o resultado da média
+        return ORJSONResponse(content=conteudo_resposta) # Serializa direto com orjson (sem revalidação pelo response_model)
 
     except ValueError as e_calc_value:
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/calcular_media': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # Log de warning se erro de valor na biblioteca
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/calcular_media': %s", e_calc_value, extra={'contexto': _detalhes_requisicao(request, usuario), 'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # Log de warning se erro de valor na biblioteca
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value)) # Retorna erro 422
     except TypeError as e_calc_type:
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # Log de erro se erro de tipo na biblioteca
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': %s", e_calc_type, extra={'contexto': _detalhes_requisicao(request, usuario), 'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # Log de erro se erro de tipo na biblioteca
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type)) # Retorna erro 400
-    except HTTPException as exc_http:
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # Log de erro se exceção HTTP
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
-    except ValidationError as ve:
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}}) # Log de warning se erro de validação Pydantic
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors()) # Retorna erro 422
     except Exception as e:
         msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}" # Mensagem de erro detalhada
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # Log crítico para erros inesperados
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna erro 500
+        logger_app.critical("💥 Erro Crítico no Servidor: %s", msg_detalhe_erro, exc_info=True, extra={'contexto': _detalhes_requisicao(request, usuario), 'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # Log crítico para erros inesperados
+        return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna erro 500
+
+# Corpo da resposta de saúde serializado uma única vez, apenas com os campos de SaudeResponse (o mesmo que a filtragem do response_model devolvia)
+_CORPO_SAUDE = SaudeResponse(status="OK", mensagem="API Matemática Segura está operacional e respondendo.").model_dump_json().encode()
 
-@app.get("/saude", tags=["sistema_seguro"], summary="Endpoint para verificar a saúde da API (PÚBLICO)", response_class=JSONResponse, response_model=SaudeResponse)
+@app.get("/saude", tags=["sistema_seguro"], summary="Endpoint para verificar a saúde da API (PÚBLICO)", response_model=SaudeResponse) # response_model mantido para a documentação OpenAPI
 async def verificar_saude_segura():
     """
     Endpoint público para verificar a saúde da API.
     Não requer autenticação e pode ser acessado por qualquer cliente.
-    Retorna um status OK se a API estiver operacional.
+    Retorna um status OK se a API estiver operacional, a partir do corpo pré-serializado em '_CORPO_SAUDE'.
 
     Returns:
-        SaudeResponse: Resposta contendo o status da API e uma mensagem indicando que está saudável.
-    """
-    timestamp = datetime.now().isoformat() # Obtém o timestamp atual em formato ISO
-    saude_template = { # Template para a resposta de saúde
-        "status": "OK",
-        "version": "0.9.3",
-        "ambiente": os.environ.get("API_ENVIRONMENT", "Desenvolvimento"), # Obtém o ambiente da API da variável de ambiente ou padrão
-        "timestamp": timestamp,
-        "mensagem": "API Matemática Segura está operacional e respondendo.",
-        "detalhes": {
-            "servidor": "FastAPI",
-            "seguranca": "JWT, HTTPS, Rate Limiting",
-            "logs": "Detalhado em JSON"
-        },
-        "status_code": 200,
-        "emoji_status": "🚀",
-        "indicador_saude": "💚 Ótimo"
-    }
-    return saude_template # Retorna a resposta de saúde
+        Response: Resposta JSON no formato SaudeResponse, com o status da API e uma mensagem indicando que está saudável.
+    """
+    return Response(content=_CORPO_SAUDE, media_type="application/json") # Bytes prontos: sem serialização JSON por requisição
 
 # --- Bloco Principal para Execução da Aplicação ---
 
@@ -600,19 +1305,15 @@ if __name__ == "__main__":
 
     # --- Preparação de Credenciais e Certificados (Apenas para Desenvolvimento Local) ---
 
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials") # Diretório para arquivos de credenciais e certificados
     os.makedirs(CREDENTIALS_DIR, exist_ok=True) # Cria o diretório de credenciais se não existir
-
-    CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem") # Caminho para o arquivo de certificado HTTPS
-    KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem") # Caminho para o arquivo de chave privada HTTPS
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # Caminho para o arquivo de credenciais de admin
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # Caminho para o arquivo de credenciais de tester
+    # Uma única passada de verificação sobre todos os arquivos necessários (caminhos definidos nas configurações globais)
+    arquivos_ausentes = {arquivo for arquivo in (CERT_FILE, KEY_FILE, ADMIN_CREDENTIALS_FILE, TESTER_CREDENTIALS_FILE) if not os.path.exists(arquivo)}
 
     # --- Geração de Certificados Autoassinados para HTTPS (Se Não Existirem) ---
 
-    if not os.path.exists(CERT_FILE) or not os.path.exists(KEY_FILE): # Verifica se os arquivos de certificado e chave não existem
+    if CERT_FILE in arquivos_ausentes or KEY_FILE in arquivos_ausentes: # Gera se o certificado ou a chave não existirem
         logger_app.info("🔑 Gerando certificados autoassinados para HTTPS...", extra={'log_record_json': {"acao": "geracao_certificados_https"}}) # Log de info ao gerar certificados
-        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend()) # Gera chave privada RSA
+        private_key = ec.generate_private_key(ec.SECP256R1(), default_backend()) # Gera chave privada ECDSA P-256 (muito mais rápida que RSA-2048 em cold start)
         subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")]) # Define o Subject do certificado (localhost)
         builder = x509.CertificateBuilder().subject_name(subject).issuer_name(subject).public_key(private_key.public_key()).serial_number(x509.random_serial_number()).not_valid_before(datetime.utcnow()).not_valid_after(datetime.utcnow() + timedelta(days=365)).add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False) # Builder do certificado
         certificate = builder.sign(private_key, hashes.SHA256(), default_backend()) # Assina o certificado com a chave privada
@@ -626,7 +1327,7 @@ if __name__ == "__main__":
 
     # --- Criação de Arquivos de Credenciais Padrão (Se Não Existirem) ---
 
-    if not os.path.exists(ADMIN_CREDENTIALS_FILE): # Verifica se o arquivo de credenciais de admin não existe
+    if ADMIN_CREDENTIALS_FILE in arquivos_ausentes: # Verifica se o arquivo de credenciais de admin não existe
         logger_app.info(f"⚙️  Criando arquivo de credenciais admin padrão: '{ADMIN_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_admin", "arquivo": ADMIN_CREDENTIALS_FILE}}) # Log de info ao criar credenciais de admin
         admin_creds = {"username": "admin", "password": "admin"} # Credenciais padrão de admin
         with open(ADMIN_CREDENTIALS_FILE, "w", encoding='utf-8') as f: # Salva as credenciais de admin no arquivo
@@ -635,7 +1336,7 @@ if __name__ == "__main__":
     else:
         logger_app.info(f"⚙️  Arquivo de credenciais admin já existente: '{ADMIN_CREDENTIALS_FILE}'. Usando existente.", extra={'log_record_json': {"acao": "creds_admin_existentes", "arquivo": ADMIN_CREDENTIALS_FILE}}) # Log de info se credenciais de admin já existem
 
-    if not os.path.exists(TESTER_CREDENTIALS_FILE): # Verifica se o arquivo de credenciais de tester não existe
+    if TESTER_CREDENTIALS_FILE in arquivos_ausentes: # Verifica se o arquivo de credenciais de tester não existe
         logger_app.info(f"⚙️  Criando arquivo de credenciais tester padrão: '{TESTER_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_tester", "arquivo": TESTER_CREDENTIALS_FILE}}) # Log de info ao criar credenciais de tester
         tester_creds = {"username": "tester", "password": "tester"} # Credenciais padrão de tester
         with open(TESTER_CREDENTIALS_FILE, "w", encoding='utf-8') as f: # Salva as credenciais de tester no arquivo
@@ -646,4 +1347,23 @@ if __name__ == "__main__":
 
     # --- Inicialização do Servidor Uvicorn com HTTPS ---
 
-    uvicorn.run(app, host="0.0.0.0", port=8882, ssl_certfile=CERT_FILE, ssl_keyfile=KEY_FILE) # Inicia o servidor Uvicorn com HTTPS e certificados
\ No newline at end of file
+    WORKERS_PADRAO = (os.cpu_count() or 1) if RATE_LIMIT_BACKEND == "redis" else 1 # Um worker por CPU apenas com o rate limiting compartilhado via Redis
+    NUM_WORKERS = int(os.environ.get("API_WORKERS", str(WORKERS_PADRAO))) # Número de processos do Uvicorn
+    if NUM_WORKERS > 1 and RATE_LIMIT_BACKEND != "redis": # Token bucket por processo: cada worker aplica o limite separadamente
+        logger_app.warning("⚠️ Rate limiting em memória com %s workers: o limite efetivo por cliente chega a %s requisições por minuto. Use API_RATE_LIMIT_BACKEND=redis para um limite compartilhado.", NUM_WORKERS, NUM_WORKERS * RATE_LIMIT_REQUESTS_PER_MINUTE, extra={'log_record_json': {"workers": NUM_WORKERS, "limite_efetivo_por_minuto": NUM_WORKERS * RATE_LIMIT_REQUESTS_PER_MINUTE}})
+    TLS_NO_PROXY = os.environ.get("API_TLS_TERMINATION", "local").lower() == "proxy" # TLS terminado no proxy reverso: sem criptografia no event loop da aplicação
+    configuracao_tls = {} if TLS_NO_PROXY else {"ssl_certfile": CERT_FILE, "ssl_keyfile": KEY_FILE} # HTTPS local apenas sem proxy
+    # Com mais de um worker o Uvicorn precisa importar a aplicação por nome em cada processo
+    alvo_app = app if NUM_WORKERS == 1 else f"{os.path.splitext(os.path.basename(__file__))[0]}:app"
+    logger_app.info(f"🚀 Iniciando Uvicorn com {NUM_WORKERS} worker(s), TLS {'no proxy reverso' if TLS_NO_PROXY else 'local'}.", extra={'log_record_json': {"workers": NUM_WORKERS, "tls_no_proxy": TLS_NO_PROXY}}) # Log de info com a configuração do servidor
+    uvicorn.run(
+        alvo_app,
+        host="127.0.0.1" if TLS_NO_PROXY else "0.0.0.0", # Atrás do proxy, aceita conexões apenas locais
+        port=8882,
+        workers=NUM_WORKERS,
+        loop="auto", # uvloop quando instalado (uvicorn[standard]; indisponível no Windows), senão asyncio
+        http="auto", # httptools quando instalado, senão h11
+        log_level="warning", # Sem log de acesso por requisição do Uvicorn (a aplicação já registra cada requisição)
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        **configuracao_tls,
+    ) # Inicia o servidor Uvicorn
\ No newline at end of file
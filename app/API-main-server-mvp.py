@@ -1,15 +1,26 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import atexit
+import base64
+import hashlib
+import hmac
 import logging
 import json
+import queue
+import time
+import orjson
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 from typing import List, Optional, Any
 from fastapi import FastAPI, Request, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 from jose import JWTError, jwt
 from cryptography import x509
 from cryptography.x509.oid import NameOID
@@ -21,11 +32,44 @@ from bibliotecas.calc_numbers import Numbers
 SECRET_KEY = os.environ.get("API_SECRET_KEY", "Jump@d2025!!")
 ALGORITHM = os.environ.get("API_JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("API_TOKEN_EXPIRY_MINUTES", "30"))
+TAMANHO_MAXIMO_VETOR = int(os.environ.get("API_MAX_VECTOR_LENGTH", "1000000"))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token_admin")
 oauth2_scheme_tester = OAuth2PasswordBearer(tokenUrl="token_tester")
 RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.environ.get("API_RATE_LIMIT", "200"))
-RATE_LIMIT_STORAGE = {}
+RATE_LIMIT_CAPACIDADE = int(os.environ.get("API_RATE_LIMIT_CAPACITY", "16384"))
+class LimitadorTaxa:
+    __slots__ = ("capacidade", "limite", "janela", "contadores")
+    def __init__(self, limite: int, capacidade: int = 16384, janela: float = 60.0):
+        self.capacidade = capacidade
+        self.limite = limite
+        self.janela = janela
+        self.contadores = OrderedDict()
+    def permitir(self, cliente: str) -> bool:
+        agora = time.monotonic()
+        contadores = self.contadores
+        limite_expiracao = agora - self.janela
+        while contadores:
+            inicio_janela, _ = next(iter(contadores.values()))
+            if inicio_janela > limite_expiracao:
+                break
+            contadores.popitem(last=False)
+        entrada = contadores.get(cliente)
+        if entrada is None:
+            if len(contadores) >= self.capacidade:
+                contadores.popitem(last=False)
+            contadores[cliente] = (agora, 1)
+            return True
+        if entrada[1] >= self.limite:
+            return False
+        contadores[cliente] = (entrada[0], entrada[1] + 1)
+        return True
+RATE_LIMIT_STORAGE = LimitadorTaxa(RATE_LIMIT_REQUESTS_PER_MINUTE, RATE_LIMIT_CAPACIDADE)
+INSTANCIA_NUMEROS = Numbers()
+CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials")
+ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json")
+TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json")
 DIRETORIO_LOGS = os.environ.get("API_LOG_DIR", "logs")
+NIVEL_LOG = os.environ.get("API_LOG_LEVEL", "DEBUG").upper()
 if not os.path.exists(DIRETORIO_LOGS):
     os.makedirs(DIRETORIO_LOGS)
 ARQUIVO_LOG_API = os.path.join(DIRETORIO_LOGS, "api-logs.json")
@@ -38,38 +82,77 @@ class FormatterColoridoSeguro(logging.Formatter):
     EMOJIS = {
         'DEBUG': '🐛', 'INFO': '✅', 'WARNING': '⚠️', 'ERROR': '🔥', 'CRITICAL': '🚨'
     }
-    def format(self, record):
-        cor_log = self.CORES.get(record.levelname, self.CORES['INFO'])
+    _cache_timestamp = (0, "")
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._por_nivel = {nivel: self._montar_nivel(nivel) for nivel in self.CORES if nivel != 'RESET'}
+    def _montar_nivel(self, nivel: str) -> tuple:
+        cor_log = self.CORES.get(nivel, self.CORES['INFO'])
         reset_cor = self.CORES['RESET']
-        emoji = self.EMOJIS.get(record.levelname, '')
-        nivel_log = f"{cor_log}{record.levelname}{reset_cor}"
-        mensagem = f"{cor_log}{record.getMessage()}{reset_cor}"
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return f"{timestamp} - {emoji} {nivel_log} - {record.name}:{record.lineno} - {mensagem}"
+        return (f" - {self.EMOJIS.get(nivel, '')} {cor_log}{nivel}{reset_cor} - ", cor_log, reset_cor)
+    def _timestamp(self, criado: float) -> str:
+        segundo = int(criado)
+        cache = self._cache_timestamp
+        if cache[0] != segundo:
+            cache = (segundo, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segundo)))
+            self._cache_timestamp = cache
+        return cache[1]
+    def format(self, record):
+        formato_nivel = self._por_nivel.get(record.levelname)
+        if formato_nivel is None:
+            formato_nivel = self._por_nivel[record.levelname] = self._montar_nivel(record.levelname)
+        prefixo, cor_log, reset_cor = formato_nivel
+        return f"{self._timestamp(record.created)}{prefixo}{record.name}:{record.lineno} - {cor_log}{record.getMessage()}{reset_cor}"
+class FormatterJSONOrjson(logging.Formatter):
+    def __init__(self, detalhado: bool = False):
+        super().__init__()
+        self.detalhado = detalhado
+    def format(self, record):
+        dados_extras = getattr(record, "log_record_json", {})
+        if self.detalhado:
+            payload = {"timestamp": self.formatTime(record), "level": record.levelname, "name": record.name, "line": str(record.lineno), "message": record.getMessage(), "record": dados_extras}
+        else:
+            payload = {"timestamp": self.formatTime(record), "level": record.levelname, "message": record.getMessage(), "detalhes": dados_extras}
+        try:
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        except TypeError:
+            return json.dumps(payload, default=str, ensure_ascii=False)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(FormatterColoridoSeguro())
 api_log_handler = logging.FileHandler(ARQUIVO_LOG_API, encoding='utf-8')
-api_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "detalhes": %(log_record_json)s}')
+api_log_formatter = FormatterJSONOrjson()
 api_log_handler.setFormatter(api_log_formatter)
 api_detailed_log_handler = logging.FileHandler(ARQUIVO_LOG_DETALHADO_API, encoding='utf-8')
-api_detailed_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "name": "%(name)s", "line": "%(lineno)d", "message": "%(message)s", "record": %(log_record_json)s}')
+api_detailed_log_formatter = FormatterJSONOrjson(detalhado=True)
 api_detailed_log_handler.setFormatter(api_detailed_log_formatter)
 logger_app = logging.getLogger("api_server")
-logger_app.setLevel(logging.DEBUG)
-logger_app.addHandler(console_handler)
-logger_app.addHandler(api_log_handler)
-logger_app.addHandler(api_detailed_log_handler)
-app = FastAPI(title="API Matemática Segura", description="API RESTful para operações de soma e média - SEGURA (Nível Máximo)", version="0.9.3", default_response_class=JSONResponse)
+logger_app.setLevel(NIVEL_LOG)
+fila_logs = queue.SimpleQueue()
+listener_logs = QueueListener(fila_logs, console_handler, api_log_handler, api_detailed_log_handler, respect_handler_level=True)
+listener_logs.start()
+atexit.register(listener_logs.stop)
+logger_app.addHandler(QueueHandler(fila_logs))
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+    def render(self, content) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            return JSONResponse.render(self, content)
+app = FastAPI(title="API Matemática Segura", description="API RESTful para operações de soma e média - SEGURA (Nível Máximo)", version="0.9.3", default_response_class=ORJSONResponse)
 origins_permitidas = os.environ.get("API_CORS_ORIGINS", "http://localhost").split(",")
 class NumerosEntrada(BaseModel):
-    numeros: List[int]
+    numeros: List[int] = Field(max_length=TAMANHO_MAXIMO_VETOR)
     model_config = {
+        "extra": "forbid",
         "json_schema_extra": {
             "examples": [
                 {"numeros": [1, 2, 3, 4]}
             ]
         }
     }
+class NumerosSomaEntrada(NumerosEntrada):
+    numeros: List[int] = Field(min_length=1, max_length=TAMANHO_MAXIMO_VETOR)
 class TokenRequest(BaseModel):
     username: str
     password: str
@@ -125,21 +208,57 @@ class ErrorResponse(BaseModel):
                 {"erro": "Erro de validação nos dados de entrada", "detalhes": "A lista de números não pode estar vazia."}
             ]
         }
+_CHAVE_JWT_BYTES = SECRET_KEY.encode("utf-8")
+_HMAC_TEMPLATE_JWT = hmac.new(_CHAVE_JWT_BYTES, digestmod=hashlib.sha256)
+_CABECALHO_JWT_B64 = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+def _assinar_hs256(data: dict) -> str:
+    entrada_assinatura = _CABECALHO_JWT_B64 + b"." + base64.urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=")
+    assinador = _HMAC_TEMPLATE_JWT.copy()
+    assinador.update(entrada_assinatura)
+    return (entrada_assinatura + b"." + base64.urlsafe_b64encode(assinador.digest()).rstrip(b"=")).decode("ascii")
 def gerar_token_jwt(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-        to_encode.update({"exp": expire})
+        to_encode["exp"] = int(time.time() + expires_delta.total_seconds())
+    if ALGORITHM == "HS256":
+        return _assinar_hs256(to_encode)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+_CACHE_JWT = {}
+_CACHE_JWT_MAX = 10000
+_CACHE_JWT_TTL_SEGUNDOS = 30
+_ALGORITMOS_JWT = [ALGORITHM]
+_OPCOES_DECODE_JWT = {"verify_signature": True}
 def verificar_token_jwt(token: str):
+    chave_cache = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    agora = time.time()
+    entrada_cache = _CACHE_JWT.get(chave_cache)
+    if entrada_cache is not None and entrada_cache[1] > agora:
+        return entrada_cache[0]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _CHAVE_JWT_BYTES, algorithms=_ALGORITMOS_JWT, options=_OPCOES_DECODE_JWT)
     except JWTError:
+        _CACHE_JWT.pop(chave_cache, None)
         return None
+    if len(_CACHE_JWT) >= _CACHE_JWT_MAX:
+        del _CACHE_JWT[next(iter(_CACHE_JWT))]
+    expiracao = payload.get("exp")
+    validade = agora + _CACHE_JWT_TTL_SEGUNDOS
+    if isinstance(expiracao, (int, float)) and expiracao < validade:
+        validade = expiracao
+    _CACHE_JWT[chave_cache] = (payload, validade)
+    return payload
+@lru_cache(maxsize=4)
+def _carregar_credenciais_versao(caminho_arquivo: str, mtime_ns: int) -> dict:
+    with open(caminho_arquivo, "rb") as f:
+        return json.load(f)
+def _credenciais_conferem(usuario: str, senha: str, credenciais: dict) -> bool:
+    return hmac.compare_digest(usuario.encode(), credenciais["username"].encode()) & hmac.compare_digest(senha.encode(), credenciais["password"].encode())
+def _carregar_credenciais(caminho_arquivo: str) -> dict:
+    return _carregar_credenciais_versao(caminho_arquivo, os.stat(caminho_arquivo).st_mtime_ns)
 async def obter_usuario_atual_jwt(token: str = Depends(oauth2_scheme)):
-    logger_app.debug(f"🔒 Validando Token JWT (ADMIN): {token[:10]}...", extra={'log_record_json': {"token_prefix": token[:10]}})
+    if logger_app.isEnabledFor(logging.DEBUG):
+        logger_app.debug("🔒 Validando Token JWT (ADMIN): %s...", token[:10], extra={'log_record_json': {"token_prefix": token[:10]}})
     payload = verificar_token_jwt(token)
     if payload is None:
         logger_app.warning("⚠️ Token JWT inválido ou expirado (ADMIN). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_admin"}})
@@ -150,7 +269,8 @@ async def obter_usuario_atual_jwt(token: str = Depends(oauth2_scheme)):
         )
     return payload
 async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)):
-    logger_app.debug(f"🔒 Validando Token JWT (TESTER): {token[:10]}...", extra={'log_record_json':  {"token_prefix": token[:10]}})
+    if logger_app.isEnabledFor(logging.DEBUG):
+        logger_app.debug("🔒 Validando Token JWT (TESTER): %s...", token[:10], extra={'log_record_json':  {"token_prefix": token[:10]}})
     payload = verificar_token_jwt(token)
     if payload is None:
         logger_app.warning("⚠️ Token JWT inválido ou expirado (TESTER). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_tester"}})
@@ -160,162 +280,155 @@ async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     return payload
-@app.post("/token_admin", tags=["autenticação_segura"], response_model=TokenResponse, summary="Gera token JWT seguro (credenciais 'admin/admin')")
+def _detalhes_requisicao(request: Request, usuario: Optional[dict]) -> dict:
+    return {"cliente": request.client.host if request.client else None, "url": request.url.path, "usuario": usuario.get('sub') if usuario else None, "nivel_acesso": usuario.get('nivel_acesso') if usuario else None, "https": request.url.scheme == 'https'}
+async def verificar_rate_limit(request: Request):
+    cliente = request.client.host if request.client else "desconhecido"
+    if not RATE_LIMIT_STORAGE.permitir(cliente):
+        logger_app.warning("⚠️ Limite de %s requisições por minuto excedido pelo cliente %s.", RATE_LIMIT_REQUESTS_PER_MINUTE, cliente, extra={'log_record_json': {"cliente": cliente, "limite_por_minuto": RATE_LIMIT_REQUESTS_PER_MINUTE}})
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Limite de requisições excedido. Tente novamente em instantes.", headers={"Retry-After": "60"})
+@app.post("/token_admin", tags=["autenticação_segura"], dependencies=[Depends(verificar_rate_limit)], response_model=TokenResponse, summary="Gera token JWT seguro (credenciais 'admin/admin')")
 async def gerar_token_admin_seguro(token_request: TokenRequest):
-    logger_app.info(f"🔑 Requisição para gerar token JWT (ADMIN) recebida para usuário: '{token_request.username}'", extra={'log_record_json': {"username": token_request.username}})
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials")
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json")
+    logger_app.info("🔑 Requisição para gerar token JWT (ADMIN) recebida para usuário: '%s'", token_request.username, extra={'log_record_json': {"username": token_request.username}})
     try:
-        with open(ADMIN_CREDENTIALS_FILE, "r", encoding='utf-8') as f:
-            usuario_admin = json.load(f)
+        usuario_admin = _carregar_credenciais(ADMIN_CREDENTIALS_FILE)
     except FileNotFoundError:
-        logger_app.critical(f"💥 Arquivo de credenciais admin não encontrado: '{ADMIN_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": ADMIN_CREDENTIALS_FILE}})
+        logger_app.critical("💥 Arquivo de credenciais admin não encontrado: '%s'.", ADMIN_CREDENTIALS_FILE, extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": ADMIN_CREDENTIALS_FILE}})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais não encontrado.")
     except json.JSONDecodeError as e:
-        logger_app.critical(f"💥 Erro ao decodificar JSON do arquivo de credenciais: '{ADMIN_CREDENTIALS_FILE}'. Detalhes: {e}", extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": ADMIN_CREDENTIALS_FILE, "detalhe_erro": str(e)}})
+        logger_app.critical("💥 Erro ao decodificar JSON do arquivo de credenciais: '%s'. Detalhes: %s", ADMIN_CREDENTIALS_FILE, e, extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": ADMIN_CREDENTIALS_FILE, "detalhe_erro": str(e)}})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais.")
-    if token_request.username == usuario_admin["username"] and token_request.password == usuario_admin["password"]:
+    if _credenciais_conferem(token_request.username, token_request.password, usuario_admin):
         tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         token_jwt = gerar_token_jwt(data={"sub": token_request.username, "nivel_acesso": "admin"}, expires_delta=tempo_expiracao_token)
-        logger_app.info(f"🔑 Token JWT (ADMIN) gerado com sucesso para usuário 'admin'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "admin", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}})
+        logger_app.info("🔑 Token JWT (ADMIN) gerado com sucesso para usuário 'admin'. Expira em %s minutos.", ACCESS_TOKEN_EXPIRE_MINUTES, extra={'log_record_json': {"usuario": "admin", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}})
         return {"access_token": token_jwt, "token_type": "bearer", "nivel_acesso": "admin"}
     else:
-        logger_app.warning(f"⚠️ Falha na autenticação (ADMIN) para usuário '{token_request.username}'. Credenciais inválidas.", extra={'log_record_json': {"username": token_request.username}})
+        logger_app.warning("⚠️ Falha na autenticação (ADMIN) para usuário '%s'. Credenciais inválidas.", token_request.username, extra={'log_record_json': {"username": token_request.username}})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais de administrador incorretas.")
-@app.post("/token_tester", tags=["autenticação_segura_tester"], response_model=TokenResponse, summary="Gera token JWT seguro para TESTER (credenciais 'tester/tester')")
+@app.post("/token_tester", tags=["autenticação_segura_tester"], dependencies=[Depends(verificar_rate_limit)], response_model=TokenResponse, summary="Gera token JWT seguro para TESTER (credenciais 'tester/tester')")
 async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depends()):
-    logger_app.info(f"🔑 Requisição para gerar token JWT (TESTER) recebida para usuário: '{form_data.username}'", extra={'log_record_json': {"username": form_data.username}})
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials")
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json")
+    logger_app.info("🔑 Requisição para gerar token JWT (TESTER) recebida para usuário: '%s'", form_data.username, extra={'log_record_json': {"username": form_data.username}})
     try:
-        with open(TESTER_CREDENTIALS_FILE, "r", encoding='utf-8') as f:
-            usuario_tester = json.load(f)
+        usuario_tester = _carregar_credenciais(TESTER_CREDENTIALS_FILE)
     except FileNotFoundError:
-        logger_app.critical(f"💥 Arquivo de credenciais tester não encontrado: '{TESTER_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": TESTER_CREDENTIALS_FILE}})
+        logger_app.critical("💥 Arquivo de credenciais tester não encontrado: '%s'.", TESTER_CREDENTIALS_FILE, extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": TESTER_CREDENTIALS_FILE}})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais de tester não encontrado.")
     except json.JSONDecodeError as e:
-        logger_app.critical(f"💥 Erro ao decodificar JSON do arquivo de credenciais tester: '{TESTER_CREDENTIALS_FILE}'. Detalhes: {e}", extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": TESTER_CREDENTIALS_FILE, "detalhe_erro": str(e)}})
+        logger_app.critical("💥 Erro ao decodificar JSON do arquivo de credenciais tester: '%s'. Detalhes: %s", TESTER_CREDENTIALS_FILE, e, extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": TESTER_CREDENTIALS_FILE, "detalhe_erro": str(e)}})
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais de tester.")
-    if form_data.username == usuario_tester["username"] and form_data.password == usuario_tester["password"]:
+    if _credenciais_conferem(form_data.username, form_data.password, usuario_tester):
         tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         token_jwt = gerar_token_jwt(data={"sub": form_data.username, "nivel_acesso": "tester"}, expires_delta=tempo_expiracao_token)
-        logger_app.info(f"🔑 Token JWT (TESTER) gerado com sucesso para usuário 'tester'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "tester", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}})
+        logger_app.info("🔑 Token JWT (TESTER) gerado com sucesso para usuário 'tester'. Expira em %s minutos.", ACCESS_TOKEN_EXPIRE_MINUTES, extra={'log_record_json': {"usuario": "tester", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}})
         return {"access_token": token_jwt, "token_type": "bearer", "nivel_acesso": "tester"}
     else:
-        logger_app.warning(f"⚠️ Requisição para /token_tester com credenciais de tester inválidas (IGNORADO para testes API).", extra={'log_record_json': {"username": form_data.username}})
+        logger_app.warning("⚠️ Requisição para /token_tester com credenciais de tester inválidas (IGNORADO para testes API).", extra={'log_record_json': {"username": form_data.username}})
         return {"access_token": "TOKEN_INVALIDO_PARA_TESTE", "token_type": "bearer", "nivel_acesso": "tester"}
-@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=SomaResponse, response_class=JSONResponse)
-async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)):
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM"
-    logger_app.info(f"➡️  Requisição POST em '/somar' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}})
+@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=None, responses={200: {"model": SomaResponse}}, response_class=ORJSONResponse)
+async def somar_vetor(request: Request, numeros_entrada: NumerosSomaEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)):
+    info_ativo = logger_app.isEnabledFor(logging.INFO)
+    if info_ativo:
+        detalhes_requisicao = _detalhes_requisicao(request, usuario)
+        logger_app.info("➡️  Requisição POST em '/somar' (PROTEGIDO)", extra={'log_record_json': {"requisicao": detalhes_requisicao}})
     try:
         lista_numeros = numeros_entrada.numeros
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}})
-        instancia_numeros = Numbers()
-        resultado_soma = instancia_numeros.sum_numbers(lista_numeros)
-        conteudo_resposta = {"resultado": resultado_soma, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}
-        logger_app.info(f"➕ Operação de soma bem-sucedida. Resultado: {resultado_soma} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}})
-        return conteudo_resposta
+        if logger_app.isEnabledFor(logging.DEBUG):
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}})
+        resultado_soma = INSTANCIA_NUMEROS.sum_numbers(lista_numeros)
     except ValueError as e_calc_value:
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/somar': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}})
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/somar': %s", e_calc_value, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_biblioteca": str(e_calc_value)}})
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value))
     except TypeError as e_calc_type:
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}})
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar': %s", e_calc_type, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_biblioteca": str(e_calc_type)}})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type))
-    except HTTPException as exc_http:
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}})
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail})
+    except HTTPException:
+        raise
     except ValidationError as ve:
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}})
+        logger_app.warning("⚠️ Erro de Validação de Entrada (Pydantic): %s", ve.errors(), extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_validacao": ve.errors()}})
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors())
     except Exception as e:
         msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}"
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}})
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro})
-@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=MediaResponse, response_class=JSONResponse)
+        logger_app.critical("💥 Erro Crítico no Servidor: %s", msg_detalhe_erro, exc_info=True, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_servidor": msg_detalhe_erro, "exception": str(e)}})
+        return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro})
+    conteudo_resposta = {"resultado": resultado_soma, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}
+    if info_ativo:
+        logger_app.info("➕ Operação de soma bem-sucedida. Resultado: %s", resultado_soma, extra={'log_record_json': {"requisicao": detalhes_requisicao, "resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}})
+    return ORJSONResponse(content=conteudo_resposta)
+@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros (PROTEGIDO)", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=None, responses={200: {"model": MediaResponse}}, response_class=ORJSONResponse)
 async def calcular_media_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)):
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM"
-    logger_app.info(f"➡️  Requisição POST em '/calcular_media' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}})
+    info_ativo = logger_app.isEnabledFor(logging.INFO)
+    if info_ativo:
+        detalhes_requisicao = _detalhes_requisicao(request, usuario)
+        logger_app.info("➡️  Requisição POST em '/calcular_media' (PROTEGIDO)", extra={'log_record_json': {"requisicao": detalhes_requisicao}})
     try:
         lista_numeros = numeros_entrada.numeros
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}})
-        instancia_numeros = Numbers()
-        resultado_media = instancia_numeros.calculate_average(lista_numeros)
-        if resultado_media is None:
-            return {"media": None, "mensagem": "Operação de média bem-sucedida para lista vazia", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}
-        conteudo_resposta = {"media": resultado_media, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}
-        logger_app.info(f"➗ Operação de média bem-sucedida. Média: {resultado_media} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_media": resultado_media, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}})
-        return conteudo_resposta
+        if logger_app.isEnabledFor(logging.DEBUG):
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}})
+        resultado_media = INSTANCIA_NUMEROS.calculate_average(lista_numeros)
     except ValueError as e_calc_value:
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/calcular_media': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}})
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/calcular_media': %s", e_calc_value, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_biblioteca": str(e_calc_value)}})
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value))
     except TypeError as e_calc_type:
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}})
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': %s", e_calc_type, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_biblioteca": str(e_calc_type)}})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type))
-    except HTTPException as exc_http:
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}})
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail})
+    except HTTPException:
+        raise
     except ValidationError as ve:
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}})
+        logger_app.warning("⚠️ Erro de Validação de Entrada (Pydantic): %s", ve.errors(), extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_validacao": ve.errors()}})
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors())
     except Exception as e:
         msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}"
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}})
-        return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro})
-@app.get("/saude", tags=["sistema_seguro"], summary="Endpoint para verificar a saúde da API (PÚBLICO)", response_class=JSONResponse, response_model=SaudeResponse)
+        logger_app.critical("💥 Erro Crítico no Servidor: %s", msg_detalhe_erro, exc_info=True, extra={'log_record_json': {"requisicao": _detalhes_requisicao(request, usuario), "erro_servidor": msg_detalhe_erro, "exception": str(e)}})
+        return ORJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro})
+    if resultado_media is None:
+        return ORJSONResponse(content={"media": None, "mensagem": "Operação de média bem-sucedida para lista vazia", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')})
+    conteudo_resposta = {"media": resultado_media, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}
+    if info_ativo:
+        logger_app.info("➗ Operação de média bem-sucedida. Média: %s", resultado_media, extra={'log_record_json': {"requisicao": detalhes_requisicao, "resultado_media": resultado_media, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}})
+    return ORJSONResponse(content=conteudo_resposta)
+_CORPO_SAUDE = SaudeResponse(status="OK", mensagem="API Matemática Segura está operacional e respondendo.").model_dump_json().encode()
+@app.get("/saude", tags=["sistema_seguro"], summary="Endpoint para verificar a saúde da API (PÚBLICO)", response_model=SaudeResponse)
 async def verificar_saude_segura():
-    timestamp = datetime.now().isoformat()
-    saude_template = {
-        "status": "OK",
-        "version": "0.9.3",
-        "ambiente": os.environ.get("API_ENVIRONMENT", "Desenvolvimento"),
-        "timestamp": timestamp,
-        "mensagem": "API Matemática Segura está operacional e respondendo.",
-        "detalhes": {
-            "servidor": "FastAPI",
-            "seguranca": "JWT, HTTPS, Rate Limiting",
-            "logs": "Detalhado em JSON"
-        },
-        "status_code": 200,
-        "emoji_status": "🚀",
-        "indicador_saude": "💚 Ótimo"
-    }
-    return saude_template
-if __name__ == "__main__":
-    import uvicorn
-    CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials")
+    return Response(content=_CORPO_SAUDE, media_type="application/json")
+CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem")
+KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem")
+CREDENCIAIS_PADRAO = {ADMIN_CREDENTIALS_FILE: ("admin", {"username": "admin", "password": "admin"}), TESTER_CREDENTIALS_FILE: ("tester", {"username": "tester", "password": "tester"})}
+def bootstrap_credentials(gerar_certificados: bool = True):
     os.makedirs(CREDENTIALS_DIR, exist_ok=True)
-    CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem")
-    KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem")
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json")
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json")
-    if not os.path.exists(CERT_FILE) or not os.path.exists(KEY_FILE):
+    existentes = {os.path.join(CREDENTIALS_DIR, nome) for nome in os.listdir(CREDENTIALS_DIR)}
+    if not gerar_certificados:
+        logger_app.info("🔑 TLS terminado por proxy externo (API_TLS_TERMINATION=proxy). Certificados locais não serão gerados nem usados.", extra={'log_record_json': {"acao": "tls_externo"}})
+    elif CERT_FILE not in existentes or KEY_FILE not in existentes:
         logger_app.info("🔑 Gerando certificados autoassinados para HTTPS...", extra={'log_record_json': {"acao": "geracao_certificados_https"}})
         private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
         subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
         builder = x509.CertificateBuilder().subject_name(subject).issuer_name(subject).public_key(private_key.public_key()).serial_number(x509.random_serial_number()).not_valid_before(datetime.utcnow()).not_valid_after(datetime.utcnow() + timedelta(days=365)).add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
         certificate = builder.sign(private_key, hashes.SHA256(), default_backend())
-        with open(KEY_FILE, "wb") as key_f:
-            key_f.write(private_key.private_bytes(encoding=serialization.Encoding.PEM, format=serialization.PrivateFormat.PKCS8, encryption_algorithm=serialization.NoEncryption()))
-        with open(CERT_FILE, "wb") as cert_f:
-            cert_f.write(certificate.public_bytes(serialization.Encoding.PEM))
-        logger_app.info(f"🔑 Certificados autoassinados gerados e salvos em: '{CREDENTIALS_DIR}/'", extra={'log_record_json': {"acao": "certificados_salvos", "diretorio": CREDENTIALS_DIR}})
-    else:
-        logger_app.info(f"🔑 Certificados HTTPS autoassinados já existentes em: '{CREDENTIALS_DIR}/'. Usando existentes.", extra={'log_record_json': {"acao": "certificados_existentes", "diretorio": CREDENTIALS_DIR}})
-    if not os.path.exists(ADMIN_CREDENTIALS_FILE):
-        logger_app.info(f"⚙️  Criando arquivo de credenciais admin padrão: '{ADMIN_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_admin", "arquivo": ADMIN_CREDENTIALS_FILE}})
-        admin_creds = {"username": "admin", "password": "admin"}
-        with open(ADMIN_CREDENTIALS_FILE, "w", encoding='utf-8') as f:
-            json.dump(admin_creds, f, indent=4, ensure_ascii=False)
-        logger_app.info(f"⚙️  Arquivo de credenciais admin padrão criado.", extra={'log_record_json': {"acao": "creds_admin_criadas_sucesso", "arquivo": ADMIN_CREDENTIALS_FILE}})
-    else:
-        logger_app.info(f"⚙️  Arquivo de credenciais admin já existente: '{ADMIN_CREDENTIALS_FILE}'. Usando existente.", extra={'log_record_json': {"acao": "creds_admin_existentes", "arquivo": ADMIN_CREDENTIALS_FILE}})
-    if not os.path.exists(TESTER_CREDENTIALS_FILE):
-        logger_app.info(f"⚙️  Criando arquivo de credenciais tester padrão: '{TESTER_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_tester", "arquivo": TESTER_CREDENTIALS_FILE}})
-        tester_creds = {"username": "tester", "password": "tester"}
-        with open(TESTER_CREDENTIALS_FILE, "w", encoding='utf-8') as f:
-            json.dump(tester_creds, f, indent=4, ensure_ascii=False)
-        logger_app.info(f"⚙️  Arquivo de credenciais tester padrão criado.", extra={'log_record_json': {"acao": "creds_tester_criadas_sucesso", "arquivo": TESTER_CREDENTIALS_FILE}})
+        Path(KEY_FILE).write_bytes(private_key.private_bytes(encoding=serialization.Encoding.PEM, format=serialization.PrivateFormat.PKCS8, encryption_algorithm=serialization.NoEncryption()))
+        Path(CERT_FILE).write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+        logger_app.info("🔑 Certificados autoassinados gerados e salvos em: '%s/'", CREDENTIALS_DIR, extra={'log_record_json': {"acao": "certificados_salvos", "diretorio": CREDENTIALS_DIR}})
     else:
-        logger_app.info(f"⚙️  Arquivo de credenciais tester já existente: '{TESTER_CREDENTIALS_FILE}'. Usando existente.", extra={'log_record_json': {"acao": "creds_tester_existentes", "arquivo": TESTER_CREDENTIALS_FILE}})
-    uvicorn.run(app, host="0.0.0.0", port=8882, ssl_certfile=CERT_FILE, ssl_keyfile=KEY_FILE)
\ No newline at end of file
+        logger_app.info("🔑 Certificados HTTPS autoassinados já existentes em: '%s/'. Usando existentes.", CREDENTIALS_DIR, extra={'log_record_json': {"acao": "certificados_existentes", "diretorio": CREDENTIALS_DIR}})
+    for caminho, (perfil, credenciais) in CREDENCIAIS_PADRAO.items():
+        if caminho in existentes:
+            logger_app.info("⚙️  Arquivo de credenciais %s já existente: '%s'. Usando existente.", perfil, caminho, extra={'log_record_json': {"acao": f"creds_{perfil}_existentes", "arquivo": caminho}})
+            continue
+        logger_app.info("⚙️  Criando arquivo de credenciais %s padrão: '%s'...", perfil, caminho, extra={'log_record_json': {"acao": f"criacao_creds_{perfil}", "arquivo": caminho}})
+        try:
+            with open(caminho, "xb") as f:
+                f.write(orjson.dumps(credenciais))
+        except FileExistsError:
+            logger_app.info("⚙️  Arquivo de credenciais %s criado por outro processo: '%s'. Usando existente.", perfil, caminho, extra={'log_record_json': {"acao": f"creds_{perfil}_existentes", "arquivo": caminho}})
+            continue
+        logger_app.info("⚙️  Arquivo de credenciais %s padrão criado.", perfil, extra={'log_record_json': {"acao": f"creds_{perfil}_criadas_sucesso", "arquivo": caminho}})
+if __name__ == "__main__":
+    import uvicorn
+    TLS_NO_PROXY = os.environ.get("API_TLS_TERMINATION", "local").lower() == "proxy"
+    bootstrap_credentials(gerar_certificados=not TLS_NO_PROXY)
+    configuracao_tls = {} if TLS_NO_PROXY else {"ssl_certfile": CERT_FILE, "ssl_keyfile": KEY_FILE}
+    NUM_WORKERS = int(os.environ.get("API_WORKERS", str(os.cpu_count() or 1)))
+    if NUM_WORKERS > 1:
+        logger_app.warning("⚠️ Rate limiting por processo com %s workers: o limite efetivo por cliente chega a %s requisições por minuto.", NUM_WORKERS, NUM_WORKERS * RATE_LIMIT_REQUESTS_PER_MINUTE, extra={'log_record_json': {"workers": NUM_WORKERS, "limite_efetivo_por_minuto": NUM_WORKERS * RATE_LIMIT_REQUESTS_PER_MINUTE}})
+    alvo_app = app if NUM_WORKERS == 1 else f"{os.path.splitext(os.path.basename(__file__))[0]}:app"
+    uvicorn.run(alvo_app, host="127.0.0.1" if TLS_NO_PROXY else "0.0.0.0", port=8882, workers=NUM_WORKERS, loop="auto", http="auto", app_dir=os.path.dirname(os.path.abspath(__file__)), **configuracao_tls)
\ No newline at end of file
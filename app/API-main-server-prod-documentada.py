@@ -17,15 +17,16 @@ Recursos Principais:
     - Validação de dados de entrada utilizando Pydantic.
     - Documentação interativa Swagger UI e ReDoc UI geradas automaticamente pelo FastAPI.
     - Configuração flexível através de variáveis de ambiente.
-    - Geração automática de certificados autoassinados para HTTPS em ambiente de desenvolvimento.
+    - Script de inicialização (scripts/bootstrap_creds.py) que gera certificados autoassinados para HTTPS e credenciais padrão.
     - Endpoint público de saúde para verificação do status da API.
     - CORS (Cross-Origin Resource Sharing) configurável para permitir acesso de diferentes origens.
 
 Para executar a API localmente (com HTTPS e geração de certificados autoassinados em desenvolvimento):
     1. Certifique-se de ter Python e pip instalados.
-    2. Instale as dependências: `pip install fastapi uvicorn pydantic python-jose cryptography`.
-    3. Execute o script: `python seu_script_api.py`.
-    4. Acesse a documentação interativa em http://localhost:8882/docs ou http://localhost:8882/redoc.
+    2. Instale as dependências: `pip install fastapi uvicorn pydantic PyJWT cryptography orjson numpy numba`.
+    3. Gere certificados e credenciais (uma única vez): `python scripts/bootstrap_creds.py`.
+    4. Execute o script: `python seu_script_api.py`.
+    5. Acesse a documentação interativa em http://localhost:8882/docs ou http://localhost:8882/redoc.
 
 Informações Adicionais:
     - Credenciais padrão para ADMIN: username 'admin', password 'admin'.
@@ -42,41 +43,55 @@ import os
 # Adiciona o diretório pai ao path do sistema para importar módulos de 'bibliotecas'
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import atexit
+import base64
+import hashlib
+import hmac
 import logging
 import json
-from datetime import datetime, timedelta
-from typing import List, Optional, Any
+import queue
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import orjson
 
 # Importações do FastAPI para criação da API
 from fastapi import FastAPI, Request, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 # Importações do Pydantic para validação de dados e modelos
-from pydantic import BaseModel, ValidationError
-
-# Importações do python-jose para JWT (JSON Web Tokens)
-from jose import JWTError, jwt
+from pydantic import BaseModel, ConfigDict, ValidationError
 
-# Importações da cryptography para geração de certificados HTTPS autoassinados
-from cryptography import x509
-from cryptography.x509.oid import NameOID
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
+# Importações do PyJWT para JWT (JSON Web Tokens) - HMAC/RSA delegados ao backend em C da 'cryptography'
+import jwt
+from jwt import PyJWTError as JWTError
 
 # Importação da biblioteca local para cálculos numéricos
-from bibliotecas.calc_numbers import Numbers
+from bibliotecas.calc_numbers import Numbers, VECTORIZATION_THRESHOLD
 
 # ⚙️ Configurações da API (variáveis de ambiente ou valores padrão)
 SECRET_KEY = os.environ.get("API_SECRET_KEY", "Jump@d2025!!)") # 🔑 Chave secreta para JWT
 ALGORITHM = os.environ.get("API_JWT_ALGORITHM", "HS256") # 🔑 Algoritmo JWT
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("API_TOKEN_EXPIRY_MINUTES", "30")) # 🔑 Tempo de expiração do token (minutos)
 RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.environ.get("API_RATE_LIMIT", "200")) # ⚠️ Limite de requisições por minuto (Rate Limiting)
+RATE_LIMIT_CAPACIDADE = int(os.environ.get("API_RATE_LIMIT_CAPACITY", "16384")) # ⚠️ Número máximo de clientes acompanhados pelo Rate Limiting (memória limitada)
+NIVEL_LOG = os.environ.get("API_LOG_LEVEL", "DEBUG").upper() # 🪵 Nível do logger da aplicação (use WARNING em produção para não formatar logs de cada requisição)
 DIRETORIO_LOGS = os.environ.get("API_LOG_DIR", "logs") # 🗂️ Diretório para arquivos de log
 CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials") # 🗂️ Diretório para arquivos de credenciais e certificados
+ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de admin
+TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de tester
+LIMIAR_CORPO_THREADPOOL = int(os.environ.get("API_THREADPOOL_BODY_BYTES", str(64 * 1024))) # 🧵 Corpos a partir deste tamanho (bytes) são decodificados e calculados fora do event loop
+INSTANCIA_NUMEROS = Numbers() # ➕ Instância única da biblioteca 'bibliotecas.calc_numbers' (sem estado), compartilhada por todas as requisições
+INSTANCIA_NUMEROS.sum_int64_array(np.zeros(1, dtype=np.int64)) # 🔥 Aquece o kernel Numba na carga do módulo (em cada worker), evitando ~10 ms de carga do cache JIT na primeira requisição
 origins_permitidas = os.environ.get("API_CORS_ORIGINS", "http://localhost").split(",") # 🌐 Origens permitidas para CORS
 
 # 🔑 Esquemas de segurança OAuth2 para tokens JWT
@@ -109,6 +124,26 @@ class FormatterColoridoSeguro(logging.Formatter): # ✨ Formatter para logs colo
         'ERROR': '🔥', # Fire/Erro
         'CRITICAL': '🚨' # Alarm/Crítico
     }
+    _cache_timestamp = (0, "") # 🕒 (segundo epoch, timestamp formatado) do último registro: strftime no máximo uma vez por segundo
+
+    def __init__(self, *args, **kwargs): # Pré-monta o prefixo de cada nível de log
+        super().__init__(*args, **kwargs)
+        self._por_nivel = {nivel: self._montar_nivel(nivel) for nivel in self.EMOJIS} # Tabela nível -> (prefixo, cor, reset)
+
+    def _montar_nivel(self, nivel: str) -> tuple: # Monta a tupla de formatação de um nível de log
+        """
+        Monta o prefixo colorido (emoji + nível) e as cores usadas na mensagem de um nível de log.
+
+        Args:
+            nivel (str): Nome do nível de log (e.g., 'INFO').
+
+        Returns:
+            tuple: (prefixo " - {emoji} {nível colorido} - ", cor do nível, código de reset).
+        """
+        cor_log = self.CORES.get(nivel, self.CORES['INFO']) # Níveis desconhecidos usam a cor de INFO
+        reset_cor = self.CORES['RESET'] # Código para resetar a cor para o padrão
+        return (f" - {self.EMOJIS.get(nivel, '')} {cor_log}{nivel}{reset_cor} - ", cor_log, reset_cor)
+
     def format(self, record): # Formata o registro de log para o console
         """
         Formata um registro de log adicionando cores, emojis, timestamp e informações contextuais.
@@ -119,28 +154,66 @@ class FormatterColoridoSeguro(logging.Formatter): # ✨ Formatter para logs colo
         Returns:
             str: A string formatada para ser exibida no console.
         """
-        cor_log = self.CORES.get(record.levelname, self.CORES['INFO']) # Obtém a cor baseada no nível de log (levelname)
-        reset_cor = self.CORES['RESET'] # Código para resetar a cor para o padrão
-        emoji = self.EMOJIS.get(record.levelname, '') # Obtém o emoji correspondente ao nível de log
-        nivel_log = f"{cor_log}{record.levelname}{reset_cor}" # Formata o nível de log com cor
-        mensagem = f"{cor_log}{record.getMessage()}{reset_cor}" # Formata a mensagem de log com cor
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S") # Obtém o timestamp atual formatado
-        return f"{timestamp} - {emoji} {nivel_log} - {record.name}:{record.lineno} - {mensagem}" # Retorna a string de log formatada
+        formato_nivel = self._por_nivel.get(record.levelname) # Prefixo pré-montado para o nível do registro
+        if formato_nivel is None: # Nível customizado ainda não visto: monta e guarda na tabela
+            formato_nivel = self._por_nivel[record.levelname] = self._montar_nivel(record.levelname)
+        prefixo, cor_log, reset_cor = formato_nivel
+        segundo = int(record.created) # Segundo em que o registro foi criado
+        cache = self._cache_timestamp
+        if cache[0] != segundo: # Novo segundo: formata o timestamp e substitui a tupla inteira
+            cache = (segundo, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segundo)))
+            self._cache_timestamp = cache
+        return f"{cache[1]}{prefixo}{record.name}:{record.lineno} - {cor_log}{record.getMessage()}{reset_cor}" # Retorna a string de log formatada
+
+class FormatterJSONLog(logging.Formatter): # 🧾 Formatter que gera uma linha JSON válida por registro (orjson)
+    """
+    Formatter de log que monta um dicionário com os campos do registro e o serializa com orjson (uma única serialização em C),
+    garantindo JSON válido mesmo quando a mensagem contém aspas ou quebras de linha.
+    O dicionário passado em extra={'log_record_json': {...}} é incluído como objeto JSON aninhado.
+    """
+    def __init__(self, detalhado: bool = False): # Define se o registro inclui logger, linha e a chave 'record'
+        super().__init__()
+        self.detalhado = detalhado # True: formato detalhado ('name', 'line', 'record'); False: resumido ('detalhes')
+
+    def format(self, record): # Formata o registro de log como uma linha JSON
+        """
+        Formata um registro de log como JSON.
+
+        Args:
+            record (logging.LogRecord): O registro de log a ser formatado.
+
+        Returns:
+            str: Linha JSON com timestamp, nível, mensagem e os detalhes do registro.
+        """
+        dados_extras = getattr(record, "log_record_json", {}) # Registros sem 'extra' usam um objeto JSON vazio
+        if self.detalhado: # Formato detalhado: inclui logger e linha de origem
+            registro_json = {"timestamp": self.formatTime(record), "level": record.levelname, "name": record.name, "line": str(record.lineno), "message": record.getMessage(), "record": dados_extras}
+        else: # Formato resumido
+            registro_json = {"timestamp": self.formatTime(record), "level": record.levelname, "message": record.getMessage(), "detalhes": dados_extras}
+        if record.exc_info: # Inclui o traceback da exceção, se houver
+            registro_json["exception"] = self.formatException(record.exc_info)
+        try:
+            return orjson.dumps(registro_json, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8") # Tipos não serializáveis viram texto
+        except TypeError: # orjson não serializa inteiros acima de 64 bits: o json padrão os mantém exatos
+            return json.dumps(registro_json, default=str, ensure_ascii=False)
 
 console_handler = logging.StreamHandler() # ✍️ Handler para logs no console (saída padrão)
 console_handler.setFormatter(FormatterColoridoSeguro()) # Define o formatter colorido para o handler de console
 api_log_handler = logging.FileHandler(ARQUIVO_LOG_API, encoding='utf-8') # ✍️ Handler para logs JSON resumidos em arquivo
-api_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "detalhes": %(log_record_json)s}') # Formatter JSON para logs resumidos
+api_log_formatter = FormatterJSONLog() # Formatter JSON (orjson) para logs resumidos
 api_log_handler.setFormatter(api_log_formatter) # Define o formatter JSON para o handler de log resumido
 api_detailed_log_handler = logging.FileHandler(ARQUIVO_LOG_DETALHADO_API, encoding='utf-8') # ✍️ Handler para logs JSON detalhados em arquivo
-api_detailed_log_formatter = logging.Formatter('{"timestamp": "%(asctime)s", "level": "%(levelname)s", "name": "%(name)s", "line": "%(lineno)d", "message": "%(message)s", "record": %(log_record_json)s}') # Formatter JSON para logs detalhados
+api_detailed_log_formatter = FormatterJSONLog(detalhado=True) # Formatter JSON (orjson) para logs detalhados
 api_detailed_log_handler.setFormatter(api_detailed_log_formatter) # Define o formatter JSON para o handler de log detalhado
 
 logger_app = logging.getLogger("api_server") # 🪵 Logger principal da aplicação, nomeado 'api_server'
-logger_app.setLevel(logging.DEBUG) # Define o nível de log para DEBUG (captura todos os níveis)
-logger_app.addHandler(console_handler) # Adiciona o handler de console para logs coloridos
-logger_app.addHandler(api_log_handler) # Adiciona o handler para logs JSON resumidos em arquivo
-logger_app.addHandler(api_detailed_log_handler) # Adiciona o handler para logs JSON detalhados em arquivo
+logger_app.setLevel(NIVEL_LOG) # Define o nível de log (padrão DEBUG: captura todos os níveis)
+# 🧵 Todos os handlers (console e arquivos) rodam em uma thread separada (QueueListener): as requisições apenas enfileiram o registro
+fila_logs = queue.SimpleQueue() # Fila sem limite compartilhada entre o logger e a thread de escrita dos logs
+listener_logs = QueueListener(fila_logs, console_handler, api_log_handler, api_detailed_log_handler, respect_handler_level=True) # Thread que entrega os registros aos handlers de console e de arquivo
+listener_logs.start() # Inicia a thread de escrita dos logs
+atexit.register(listener_logs.stop) # Esvazia a fila e encerra a thread ao finalizar o processo
+logger_app.addHandler(QueueHandler(fila_logs)) # Único handler do logger: enfileira os registros (console colorido e logs JSON resumido e detalhado)
 
 # 🚀 Inicialização da Aplicação FastAPI
 app = FastAPI(
@@ -166,13 +239,14 @@ class NumerosEntrada(BaseModel): # 🔢 Modelo para validar e documentar a entra
     Garante que a requisição contenha um campo 'numeros' com uma lista de inteiros.
     """
     numeros: List[int] # Campo 'numeros' esperado no corpo da requisição, deve ser uma lista de inteiros
-    model_config = { # Configuração extra para o modelo Pydantic
-        "json_schema_extra": { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        extra="forbid", # 🚫 Rejeita campos desconhecidos no corpo da requisição (erro 422)
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de payload para a documentação
                 {"numeros": [1, 2, 3, 4]} # Exemplo de lista de números válida
             ]
         }
-    }
+    )
 
 class TokenRequest(BaseModel): # 🔑 Modelo para requisição de token JWT (username/password)
     """
@@ -181,6 +255,7 @@ class TokenRequest(BaseModel): # 🔑 Modelo para requisição de token JWT (use
     """
     username: str # 👤 Campo 'username' para autenticação
     password: str # 🔑 Campo 'password' para autenticação
+    model_config = ConfigDict(extra="forbid") # 🚫 Rejeita campos desconhecidos no corpo da requisição (erro 422)
 
 class TokenResponse(BaseModel): # 🔑 Modelo para resposta de token JWT (access_token, token_type, nivel_acesso)
     """
@@ -190,13 +265,14 @@ class TokenResponse(BaseModel): # 🔑 Modelo para resposta de token JWT (access
     access_token: str # 🔑 Token JWT de acesso
     token_type: str # 🏷️ Tipo do token (sempre 'bearer' para JWT)
     nivel_acesso: str # 🛡️ Nível de acesso do usuário associado ao token (e.g., 'admin', 'tester')
-    model_config = { # Configuração extra para o modelo Pydantic
-        "json_schema_extra": { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        frozen=True, # 🧊 Modelo de resposta imutável
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de resposta para a documentação
                 {"access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...", "token_type": "bearer", "nivel_acesso": "admin"} # Exemplo de token JWT
             ]
         }
-    }
+    )
 
 class SomaResponse(BaseModel): # ➕ Modelo para resposta da rota /somar (resultado, mensagem, etc.)
     """
@@ -208,12 +284,14 @@ class SomaResponse(BaseModel): # ➕ Modelo para resposta da rota /somar (result
     numeros_entrada: List[int] # 🔢 Lista de números de entrada que foram somados
     usuario: Optional[str] = None # 👤 Nome de usuário associado à requisição (opcional)
     nivel_acesso: Optional[str] = None # 🛡️ Nível de acesso do usuário (opcional)
-    class Config: # Configuração extra para o modelo Pydantic
-        json_schema_extra = { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        frozen=True, # 🧊 Modelo de resposta imutável
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de resposta para a documentação
                 {"resultado": 10, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": [1, 2, 3, 4], "usuario": "admin", "nivel_acesso": "admin"} # Exemplo de resposta da soma
             ]
         }
+    )
 
 class MediaResponse(BaseModel): # ➗ Modelo para resposta da rota /calcular_media (media, mensagem, etc.)
     """
@@ -225,12 +303,14 @@ class MediaResponse(BaseModel): # ➗ Modelo para resposta da rota /calcular_med
     numeros_entrada: List[int] # 🔢 Lista de números de entrada para o cálculo da média
     usuario: Optional[str] = None # 👤 Nome de usuário associado à requisição (opcional)
     nivel_acesso: Optional[str] = None # 🛡️ Nível de acesso do usuário (opcional)
-    class Config: # Configuração extra para o modelo Pydantic
-        json_schema_extra = { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        frozen=True, # 🧊 Modelo de resposta imutável
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de resposta para a documentação
                 {"media": 2.5, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": [1, 2, 3, 4], "usuario": "admin", "nivel_acesso": "admin"} # Exemplo de resposta da média
             ]
         }
+    )
 
 class SaudeResponse(BaseModel): # 🩺 Modelo para resposta da rota /saude (status, mensagem)
     """
@@ -239,12 +319,14 @@ class SaudeResponse(BaseModel): # 🩺 Modelo para resposta da rota /saude (stat
     """
     status: str # 🩺 Status geral da API ('OK' para saudável)
     mensagem: str # 💬 Mensagem informativa sobre o status da API
-    class Config: # Configuração extra para o modelo Pydantic
-        json_schema_extra = { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        frozen=True, # 🧊 Modelo de resposta imutável
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de resposta para a documentação
                 {"status": "OK", "mensagem": "API está saudável e SEGURA"} # Exemplo de resposta de saúde
             ]
         }
+    )
 
 class ErrorResponse(BaseModel): # ❌ Modelo para respostas de erro padronizadas (erro, detalhes)
     """
@@ -252,37 +334,98 @@ class ErrorResponse(BaseModel): # ❌ Modelo para respostas de erro padronizadas
     Inclui uma mensagem de erro geral e detalhes adicionais sobre o erro.
     """
     erro: str # ❌ Mensagem de erro geral
-    detalhes: Any # ℹ️ Detalhes adicionais sobre o erro (pode ser qualquer tipo de dado)
-    class Config: # Configuração extra para o modelo Pydantic
-        json_schema_extra = { # Informações extras para o schema JSON (documentação Swagger/ReDoc)
+    detalhes: Union[str, Dict[str, Any]] = "" # ℹ️ Detalhes adicionais sobre o erro (texto ou objeto JSON; tipado para evitar o caminho genérico de 'Any' no Pydantic)
+    model_config = ConfigDict( # Configuração do modelo Pydantic (v2)
+        frozen=True, # 🧊 Modelo de resposta imutável
+        json_schema_extra={ # Informações extras para o schema JSON (documentação Swagger/ReDoc)
             "examples": [ # Exemplos de resposta para a documentação
                 {"erro": "Erro de validação nos dados de entrada", "detalhes": "A lista de números não pode estar vazia."} # Exemplo de resposta de erro
             ]
         }
+    )
 
 # 🔑 Funções de Segurança (JWT - JSON Web Tokens)
 
+_CHAVE_JWT_BYTES = SECRET_KEY.encode("utf-8") # 🔑 Chave secreta já codificada em bytes (HMAC do caminho rápido HS256 e chamadas ao PyJWT)
+_ALGORITMOS_JWT = [ALGORITHM] # 🔑 Lista de algoritmos permitidos na verificação, montada uma única vez
+_CABECALHO_JWT_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=") # 🔑 Cabeçalho JWT fixo do HS256, já codificado em base64url
+
+def _b64url_decodificar(segmento: bytes) -> bytes: # 🔑 Decodifica um segmento base64url sem padding
+    """Decodifica um segmento base64url sem padding (formato usado nas três partes do JWT)."""
+    return base64.urlsafe_b64decode(segmento + b"=" * (-len(segmento) % 4)) # Recoloca o padding removido na codificação
+
+def _assinar_hs256(payload: dict) -> str: # 🔑 Monta e assina um JWT HS256 diretamente com hmac
+    """
+    Monta e assina um JWT HS256 com uma única chamada HMAC-SHA256, sem o overhead por chamada da biblioteca JWT
+    (resolução do algoritmo, cópias do payload e serialização do cabeçalho).
+
+    Args:
+        payload (dict): Payload do token, com 'exp' já convertido para timestamp Unix inteiro.
+
+    Returns:
+        str: O token JWT no formato cabeçalho.payload.assinatura.
+    """
+    payload_b64 = base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=") # Serializa o payload (JSON compacto, orjson direto em bytes) em base64url
+    entrada_assinatura = _CABECALHO_JWT_B64 + b"." + payload_b64 # Conteúdo assinado: cabeçalho.payload
+    assinatura_b64 = base64.urlsafe_b64encode(hmac.new(_CHAVE_JWT_BYTES, entrada_assinatura, hashlib.sha256).digest()).rstrip(b"=") # Assinatura HMAC-SHA256 em base64url
+    return (entrada_assinatura + b"." + assinatura_b64).decode("ascii") # Token JWT completo
+
+def _verificar_hs256(token: str) -> Optional[dict]: # ✅ Verifica um JWT HS256 diretamente com hmac
+    """
+    Verifica um JWT HS256 com uma única chamada HMAC-SHA256 e comparação em tempo constante,
+    validando também o algoritmo do cabeçalho e a expiração ('exp').
+
+    Args:
+        token (str): O token JWT a ser verificado.
+
+    Returns:
+        Optional[dict]: O payload decodificado se o token for válido, None se for malformado, tiver assinatura inválida ou estiver expirado.
+    """
+    try:
+        cabecalho_b64, payload_b64, assinatura_b64 = token.encode("ascii").split(b".") # Separa cabeçalho, payload e assinatura
+        if json.loads(_b64url_decodificar(cabecalho_b64)).get("alg") != "HS256": # Rejeita tokens com algoritmo diferente (ex.: 'none')
+            return None
+        assinatura_esperada = hmac.new(_CHAVE_JWT_BYTES, cabecalho_b64 + b"." + payload_b64, hashlib.sha256).digest() # Recalcula a assinatura
+        if not hmac.compare_digest(assinatura_esperada, _b64url_decodificar(assinatura_b64)): # Comparação em tempo constante
+            return None # Assinatura inválida
+        payload = json.loads(_b64url_decodificar(payload_b64)) # Decodifica o payload
+    except (ValueError, TypeError, AttributeError): # Token malformado (base64/JSON inválido, segmentos ausentes, caracteres não ASCII)
+        return None
+    if not isinstance(payload, dict): # O payload de um JWT deve ser um objeto JSON
+        return None
+    expiracao = payload.get("exp") # 🕒 Expiração do token (timestamp Unix)
+    if expiracao is not None and (not isinstance(expiracao, (int, float)) or expiracao < time.time()): # Token expirado ou com 'exp' inválido
+        return None
+    return payload
+
 def gerar_token_jwt(data: dict, expires_delta: Optional[timedelta] = None) -> str: # 🔑 Gera token JWT
     """
     Gera um token JWT (JSON Web Token) seguro.
+    O dicionário 'data' é usado diretamente como payload (sem cópia) e recebe a chave 'exp':
+    o chamador deve passar um dicionário novo e não reutilizá-lo depois.
 
     Args:
-        data (dict): Dados a serem incluídos no payload do token (e.g., informações do usuário).
+        data (dict): Dados a serem incluídos no payload do token (e.g., informações do usuário). Modificado no lugar.
         expires_delta (Optional[timedelta]): Tempo de expiração do token (opcional, se não fornecido, o token não expira).
 
     Returns:
         str: O token JWT codificado como uma string.
     """
-    to_encode = data.copy() # Cria uma cópia dos dados para evitar modificações no original
     if expires_delta: # Se um tempo de expiração for fornecido
-        expire = datetime.utcnow() + expires_delta # Calcula o tempo de expiração a partir de agora
-        to_encode.update({"exp": expire}) # Adiciona a chave 'exp' (expiration time) ao payload do token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM) # Codifica o payload em um JWT usando a chave secreta e o algoritmo especificado
+        data["exp"] = int(time.time() + expires_delta.total_seconds()) # Adiciona a chave 'exp' (expiration time) ao payload: timestamp Unix calculado com time.time() (sem datetime.utcnow, descontinuado)
+    if ALGORITHM == "HS256": # 🔑 Caminho rápido: cabeçalho pré-codificado + um único HMAC
+        return _assinar_hs256(data)
+    encoded_jwt = jwt.encode(data, _CHAVE_JWT_BYTES, algorithm=ALGORITHM) # Codifica o payload em um JWT usando a chave secreta e o algoritmo especificado
     return encoded_jwt # Retorna o token JWT codificado
 
+_CACHE_TOKENS_JWT: dict[bytes, tuple[float, dict]] = {} # 🗃️ Cache de tokens já verificados: SHA-256(token) -> (exp do token, payload)
+_CACHE_TOKENS_JWT_MAX = 10000 # 🗃️ Número máximo de tokens mantidos no cache (descarta o mais antigo ao atingir o limite)
+
 def verificar_token_jwt(token: str) -> Optional[dict]: # ✅ Verifica e decodifica token JWT
     """
     Verifica e decodifica um token JWT.
+    Tokens já verificados são servidos do cache (chave SHA-256 do token) até o seu próprio 'exp',
+    sem repetir a verificação HMAC e a decodificação JSON/base64 a cada requisição.
 
     Args:
         token (str): O token JWT a ser verificado e decodificado.
@@ -291,11 +434,27 @@ def verificar_token_jwt(token: str) -> Optional[dict]: # ✅ Verifica e decodifi
         Optional[dict]: O payload do token JWT decodificado como um dicionário, se a verificação for bem-sucedida.
                        Retorna None se o token for inválido ou expirado (JWTError).
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]) # Decodifica o token JWT usando a chave secreta e os algoritmos permitidos
-        return payload # Retorna o payload decodificado (dicionário com informações do token)
-    except JWTError: # Captura exceções se o token for inválido, expirado ou a assinatura for inválida
-        return None # Retorna None indicando que a verificação do token falhou
+    chave_cache = hashlib.sha256(token.encode()).digest() # 🗃️ Chave do cache: hash do token completo (o token em si não é armazenado)
+    entrada_cache = _CACHE_TOKENS_JWT.get(chave_cache) # Procura o token no cache de tokens verificados
+    if entrada_cache is not None: # Token já verificado anteriormente
+        if entrada_cache[0] > time.time(): # Ainda dentro da validade ('exp') do próprio token
+            return entrada_cache[1] # Retorna o payload em cache (sem HMAC nem decodificação)
+        del _CACHE_TOKENS_JWT[chave_cache] # Token expirado: remove do cache e segue para a verificação completa (que falhará)
+    if ALGORITHM == "HS256": # ✅ Caminho rápido: HMAC direto + compare_digest
+        payload = _verificar_hs256(token)
+    else: # Outros algoritmos continuam via PyJWT
+        try:
+            payload = jwt.decode(token, _CHAVE_JWT_BYTES, algorithms=_ALGORITMOS_JWT) # Decodifica o token JWT usando a chave secreta e os algoritmos permitidos
+        except JWTError: # Captura exceções se o token for inválido, expirado ou a assinatura for inválida
+            payload = None
+    if payload is None: # Verificação do token falhou
+        return None # Retorna None indicando que a verificação do token falhou (falhas nunca são armazenadas em cache)
+    expiracao = payload.get("exp") # 🕒 Expiração do token (timestamp Unix)
+    if isinstance(expiracao, (int, float)): # Só armazena em cache tokens com expiração definida
+        if len(_CACHE_TOKENS_JWT) >= _CACHE_TOKENS_JWT_MAX: # Cache cheio
+            del _CACHE_TOKENS_JWT[next(iter(_CACHE_TOKENS_JWT))] # Descarta a entrada mais antiga (ordem de inserção do dict)
+        _CACHE_TOKENS_JWT[chave_cache] = (expiracao, payload) # Armazena o payload até a expiração do token
+    return payload # Retorna o payload decodificado (dicionário com informações do token)
 
 async def obter_usuario_atual_jwt(token: str = Depends(oauth2_scheme)) -> dict: # 🛡️ Dependência para obter usuário ADMIN atual via JWT
     """
@@ -313,7 +472,9 @@ async def obter_usuario_atual_jwt(token: str = Depends(oauth2_scheme)) -> dict:
     Raises:
         HTTPException: 401 UNAUTHORIZED - Se o token JWT for inválido, expirado ou ausente.
     """
-    logger_app.debug(f"🔒 Validando Token JWT (ADMIN): {token[:10]}...", extra={'log_record_json': {"token_prefix": token[:10]}}) # 🪵 Log de debug: validação de token ADMIN iniciada
+    if logger_app.isEnabledFor(logging.DEBUG): # Evita fatiar o token e montar o 'extra' quando DEBUG está desativado
+        prefixo_token = token[:10] # Fatia o token uma única vez para a mensagem e o 'extra'
+        logger_app.debug("🔒 Validando Token JWT (ADMIN): %s...", prefixo_token, extra={'log_record_json': {"token_prefix": prefixo_token}}) # 🪵 Log de debug: validação de token ADMIN iniciada (formatação %s adiada)
     payload = verificar_token_jwt(token) # ✅ Verifica o token JWT usando a função 'verificar_token_jwt'
     if payload is None: # Se a verificação do token falhar (token inválido ou expirado)
         logger_app.warning("⚠️ Token JWT inválido ou expirado (ADMIN). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_admin"}}) # 🪵 Log de warning: token ADMIN inválido
@@ -341,7 +502,9 @@ async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)) -
     Raises:
         HTTPException: 401 UNAUTHORIZED - Se o token JWT de tester for inválido, expirado ou ausente.
     """
-    logger_app.debug(f"🔒 Validando Token JWT (TESTER): {token[:10]}...", extra={'log_record_json':  {"token_prefix": token[:10]}}) # 🪵 Log de debug: validação de token TESTER iniciada
+    if logger_app.isEnabledFor(logging.DEBUG): # Evita fatiar o token e montar o 'extra' quando DEBUG está desativado
+        prefixo_token = token[:10] # Fatia o token uma única vez para a mensagem e o 'extra'
+        logger_app.debug("🔒 Validando Token JWT (TESTER): %s...", prefixo_token, extra={'log_record_json': {"token_prefix": prefixo_token}}) # 🪵 Log de debug: validação de token TESTER iniciada (formatação %s adiada)
     payload = verificar_token_jwt(token) # ✅ Verifica o token JWT usando a função 'verificar_token_jwt'
     if payload is None: # Se a verificação do token falhar (token inválido ou expirado)
         logger_app.warning("⚠️ Token JWT inválido ou expirado (TESTER). Acesso negado.", extra={'log_record_json': {"status_auth": "falha_token_invalido_tester"}}) # 🪵 Log de warning: token TESTER inválido
@@ -352,12 +515,147 @@ async def obter_usuario_tester_jwt(token: str = Depends(oauth2_scheme_tester)) -
         )
     return payload # Retorna o payload do token decodificado (informações do usuário TESTER)
 
+# 🗂️ Carregamento de Credenciais (em cache, recarregado quando o arquivo é alterado)
+
+@lru_cache(maxsize=4) # 🗃️ Uma entrada por (arquivo, versão): admin e tester, com folga para uma troca de versão
+def _carregar_credenciais_versao(caminho_arquivo: str, versao_mtime_ns: int) -> dict: # 🗂️ Lê e decodifica uma versão do arquivo de credenciais
+    """
+    Lê e decodifica o arquivo JSON de credenciais. O resultado fica em cache por (caminho, mtime),
+    então o arquivo só é lido novamente quando seu conteúdo é modificado.
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo JSON de credenciais.
+        versao_mtime_ns (int): Data de modificação do arquivo (st_mtime_ns), usada apenas como chave do cache.
+
+    Returns:
+        dict: Credenciais carregadas do arquivo ('username' e 'password').
+
+    Raises:
+        FileNotFoundError: Se o arquivo de credenciais não existir.
+        json.JSONDecodeError: Se o conteúdo do arquivo não for um JSON válido (erros não são armazenados em cache).
+    """
+    with open(caminho_arquivo, "r", encoding='utf-8') as f: # Abre o arquivo em modo leitura com encoding UTF-8
+        return json.load(f) # Carrega o conteúdo JSON do arquivo
+
+def carregar_credenciais(caminho_arquivo: str) -> dict: # 🗂️ Retorna as credenciais do arquivo, usando o cache enquanto o arquivo não mudar
+    """
+    Retorna as credenciais de um arquivo JSON sem reler o disco a cada requisição.
+    Um único 'os.stat' verifica se o arquivo foi alterado (recarga automática, sem reiniciar a API).
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo JSON de credenciais.
+
+    Returns:
+        dict: Credenciais carregadas do arquivo ('username' e 'password').
+
+    Raises:
+        FileNotFoundError: Se o arquivo de credenciais não existir.
+        json.JSONDecodeError: Se o conteúdo do arquivo não for um JSON válido.
+    """
+    return _carregar_credenciais_versao(caminho_arquivo, os.stat(caminho_arquivo).st_mtime_ns) # Versão atual do arquivo como chave do cache
+
+def credenciais_conferem(username: str, password: str, credenciais: dict) -> bool: # ✅ Compara usuário e senha em tempo constante
+    """
+    Compara usuário e senha informados com as credenciais carregadas usando 'hmac.compare_digest'
+    (tempo constante, sem vazar por timing quantos caracteres coincidem).
+
+    Args:
+        username (str): Usuário informado na requisição.
+        password (str): Senha informada na requisição.
+        credenciais (dict): Credenciais carregadas do arquivo ('username' e 'password').
+
+    Returns:
+        bool: True se usuário e senha conferem, False caso contrário.
+    """
+    usuario_ok = hmac.compare_digest(username.encode("utf-8"), credenciais["username"].encode("utf-8")) # Bytes: compare_digest com str aceita apenas ASCII
+    senha_ok = hmac.compare_digest(password.encode("utf-8"), credenciais["password"].encode("utf-8")) # A senha é sempre comparada, mesmo com usuário incorreto
+    return usuario_ok & senha_ok # '&' bit a bit: sem curto-circuito entre as duas comparações
+
+# ⚠️ Rate Limiting (janela deslizante aproximada por cliente)
+
+class LimitadorJanelaDeslizante: # ⚠️ Contador de janela deslizante com dois buckets por cliente (O(1) por requisição)
+    """
+    Rate limiting por cliente com o contador de janela deslizante de dois buckets: guarda apenas a contagem do minuto atual
+    e a do minuto anterior, e estima as requisições dos últimos 60 segundos ponderando o minuto anterior pela fração
+    ainda coberta pela janela. Custo O(1) por requisição e uma tupla pequena por cliente (sem lista de timestamps).
+
+    Os clientes ficam em ordem de atividade (o mais recente no fim): com a capacidade atingida, o cliente inativo há
+    mais tempo é descartado em O(1), sem varrer a tabela.
+
+    O estado fica na memória de cada processo: com API_WORKERS workers do Uvicorn, cada um aplica o limite
+    separadamente, e o limite efetivo por cliente chega a API_WORKERS × API_RATE_LIMIT requisições por minuto.
+    """
+    __slots__ = ("limite", "capacidade", "clientes") # Sem __dict__ por instância
+
+    def __init__(self, limite: int, capacidade: int = 16384): # Define o limite por minuto e o número máximo de clientes acompanhados
+        """
+        Args:
+            limite (int): Número máximo de requisições por cliente em qualquer intervalo de 60 segundos (aproximado).
+            capacidade (int): Número máximo de clientes mantidos em memória.
+        """
+        self.limite = limite
+        self.capacidade = capacidade
+        self.clientes: OrderedDict[str, tuple[int, int, int]] = OrderedDict() # cliente -> (minuto atual (epoch // 60), contagem do minuto anterior, contagem do minuto atual), do menos para o mais recente
+
+    def permitir(self, cliente: str) -> bool: # ✅ Registra a requisição e indica se está dentro do limite
+        """
+        Verifica se o cliente ainda está dentro do limite e, em caso afirmativo, contabiliza a requisição.
+
+        Args:
+            cliente (str): Identificador do cliente (endereço IP).
+
+        Returns:
+            bool: True se a requisição é permitida, False se o limite foi excedido (requisições rejeitadas não são contabilizadas).
+        """
+        agora = time.time()
+        minuto = int(agora // 60) # Bucket do minuto atual
+        entrada = self.clientes.get(cliente)
+        if entrada is None: # Primeira requisição do cliente (ou cliente removido por inatividade)
+            if len(self.clientes) >= self.capacidade: # Capacidade atingida: descarta o cliente sem requisições há mais tempo (O(1))
+                self.clientes.popitem(last=False)
+            anterior = atual = 0
+        else:
+            self.clientes.move_to_end(cliente) # Cliente ativo passa para o fim da ordem de descarte
+            minuto_registrado, anterior, atual = entrada
+            if minuto != minuto_registrado: # Virada de minuto: o bucket atual passa a ser o anterior (ou zera após mais de um minuto sem requisições)
+                anterior = atual if minuto == minuto_registrado + 1 else 0
+                atual = 0
+        estimativa = anterior * (60 - agora % 60) / 60 + atual # Requisições estimadas nos últimos 60 segundos
+        if estimativa >= self.limite: # Limite atingido: rejeita sem contabilizar
+            self.clientes[cliente] = (minuto, anterior, atual)
+            return False
+        self.clientes[cliente] = (minuto, anterior, atual + 1) # Contabiliza a requisição no bucket atual
+        return True
+
+LIMITADOR_TAXA = LimitadorJanelaDeslizante(RATE_LIMIT_REQUESTS_PER_MINUTE, RATE_LIMIT_CAPACIDADE) # ⚠️ Limitador compartilhado por todas as rotas protegidas
+
+async def verificar_rate_limit(request: Request) -> None: # ⚠️ Dependência de Rate Limiting por endereço IP do cliente
+    """
+    Dependência do FastAPI que aplica o limite de RATE_LIMIT_REQUESTS_PER_MINUTE requisições por minuto por cliente (IP).
+
+    Args:
+        request (Request): Objeto Request do FastAPI, usado para identificar o cliente.
+
+    Raises:
+        HTTPException: 429 TOO_MANY_REQUESTS - Se o cliente excedeu o limite de requisições por minuto.
+    """
+    cliente = request.client.host if request.client else "desconhecido" # Identificador do cliente (endereço IP)
+    if not LIMITADOR_TAXA.permitir(cliente): # Limite excedido
+        logger_app.warning(f"⚠️ Rate limit excedido para o cliente '{cliente}' em '{request.url.path}'.", extra={'log_record_json': {"cliente": cliente, "url": request.url.path, "limite_por_minuto": RATE_LIMIT_REQUESTS_PER_MINUTE}}) # 🪵 Log de warning: rate limit excedido
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, # Código de status HTTP 429
+            detail="Limite de requisições excedido. Tente novamente em instantes.", # Mensagem de detalhe do erro
+            headers={"Retry-After": "60"}, # Tempo (segundos) sugerido para nova tentativa
+        )
+
 # 🔑 Endpoints de Autenticação Segura (JWT)
 
-@app.post("/token_admin", tags=["autenticação_segura"], response_model=TokenResponse, summary="Gera token JWT seguro para Administradores", description="Endpoint para gerar um token JWT de acesso com nível 'admin'. Requer credenciais de administrador.")
-async def gerar_token_admin_seguro(token_request: TokenRequest): # 🔑 Rota para gerar token JWT de ADMIN (/token_admin)
+@app.post("/token_admin", tags=["autenticação_segura"], response_model=TokenResponse, dependencies=[Depends(verificar_rate_limit)], summary="Gera token JWT seguro para Administradores", description="Endpoint para gerar um token JWT de acesso com nível 'admin'. Requer credenciais de administrador.")
+def gerar_token_admin_seguro(token_request: TokenRequest): # 🔑 Rota para gerar token JWT de ADMIN (/token_admin) - síncrona: executada no threadpool do FastAPI
     """
     Endpoint para gerar um token JWT (JSON Web Token) para usuários com nível de acesso 'admin'.
+    Declarado com 'def' (não 'async def') porque consulta o arquivo de credenciais com I/O bloqueante:
+    o FastAPI o executa no threadpool e o event loop continua atendendo as demais requisições.
     Utiliza credenciais fixas (username/password) armazenadas em um arquivo JSON para fins de demonstração.
     Em um sistema de produção, as credenciais seriam verificadas contra um banco de dados ou sistema de autenticação mais robusto.
 
@@ -373,11 +671,9 @@ async def gerar_token_admin_seguro(token_request: TokenRequest): # 🔑 Rota par
             - 500 INTERNAL_SERVER_ERROR: Se ocorrer um erro ao ler o arquivo de credenciais (e.g., arquivo não encontrado, erro de JSON).
     """
     logger_app.info(f"🔑 Requisição para gerar token JWT (ADMIN) recebida para usuário: '{token_request.username}'", extra={'log_record_json': {"username": token_request.username}}) # 🪵 Log de info: requisição para token ADMIN recebida
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de admin
 
-    try: # Tenta ler as credenciais do arquivo JSON
-        with open(ADMIN_CREDENTIALS_FILE, "r", encoding='utf-8') as f: # Abre o arquivo em modo leitura com encoding UTF-8
-            usuario_admin = json.load(f) # Carrega o conteúdo JSON do arquivo para a variável 'usuario_admin'
+    try: # Tenta obter as credenciais do arquivo JSON (em cache enquanto o arquivo não for alterado)
+        usuario_admin = carregar_credenciais(ADMIN_CREDENTIALS_FILE) # Credenciais de admin carregadas do cache ou do arquivo
     except FileNotFoundError: # Captura exceção se o arquivo de credenciais não for encontrado
         logger_app.critical(f"💥 Arquivo de credenciais admin não encontrado: '{ADMIN_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": ADMIN_CREDENTIALS_FILE}}) # 🪵 Log crítico: arquivo de credenciais ADMIN não encontrado
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais não encontrado.") # Levanta exceção HTTP 500
@@ -385,7 +681,7 @@ async def gerar_token_admin_seguro(token_request: TokenRequest): # 🔑 Rota par
         logger_app.critical(f"💥 Erro ao decodificar JSON do arquivo de credenciais: '{ADMIN_CREDENTIALS_FILE}'. Detalhes: {e}", extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": ADMIN_CREDENTIALS_FILE, "detalhe_erro": str(e)}}) # 🪵 Log crítico: erro ao decodificar JSON de credenciais ADMIN
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais.") # Levanta exceção HTTP 500
 
-    if token_request.username == usuario_admin["username"] and token_request.password == usuario_admin["password"]: # ✅ Verifica username e password com as credenciais lidas
+    if credenciais_conferem(token_request.username, token_request.password, usuario_admin): # ✅ Verifica username e password com as credenciais lidas (tempo constante)
         tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES) # Define o tempo de expiração do token
         token_jwt = gerar_token_jwt(data={"sub": token_request.username, "nivel_acesso": "admin"}, expires_delta=tempo_expiracao_token) # 🔑 Gera o token JWT para admin
         logger_app.info(f"🔑 Token JWT (ADMIN) gerado com sucesso para usuário 'admin'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "admin", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # 🪵 Log de info: token ADMIN gerado com sucesso
@@ -394,10 +690,11 @@ async def gerar_token_admin_seguro(token_request: TokenRequest): # 🔑 Rota par
         logger_app.warning(f"⚠️ Falha na autenticação (ADMIN) para usuário '{token_request.username}'. Credenciais inválidas.", extra={'log_record_json': {"username": token_request.username}}) # 🪵 Log de warning: falha na autenticação ADMIN
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais de administrador incorretas.") # Levanta exceção HTTP 401
 
-@app.post("/token_tester", tags=["autenticação_segura_tester"], response_model=TokenResponse, summary="Gera token JWT seguro para Testers", description="Endpoint para gerar um token JWT de acesso com nível 'tester'. Requer credenciais de tester.")
-async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depends()): # 🔑 Rota para gerar token JWT de TESTER (/token_tester)
+@app.post("/token_tester", tags=["autenticação_segura_tester"], response_model=TokenResponse, dependencies=[Depends(verificar_rate_limit)], summary="Gera token JWT seguro para Testers", description="Endpoint para gerar um token JWT de acesso com nível 'tester'. Requer credenciais de tester.")
+def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depends()): # 🔑 Rota para gerar token JWT de TESTER (/token_tester) - síncrona: executada no threadpool do FastAPI
     """
     Endpoint para gerar um token JWT (JSON Web Token) para usuários com nível de acesso 'tester'.
+    Declarado com 'def' (não 'async def') porque consulta o arquivo de credenciais com I/O bloqueante (executado no threadpool).
     Similar ao endpoint '/token_admin', mas utiliza credenciais de 'tester' e define o nível de acesso como 'tester'.
     Utiliza credenciais fixas (username/password) armazenadas em um arquivo JSON para fins de demonstração.
 
@@ -414,11 +711,9 @@ async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depen
             - 500 INTERNAL_SERVER_ERROR: Se ocorrer um erro ao ler o arquivo de credenciais de tester.
     """
     logger_app.info(f"🔑 Requisição para gerar token JWT (TESTER) recebida para usuário: '{form_data.username}'", extra={'log_record_json': {"username": form_data.username}}) # 🪵 Log de info: requisição para token TESTER recebida
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de tester
 
-    try: # Tenta ler as credenciais do arquivo JSON
-        with open(TESTER_CREDENTIALS_FILE, "r", encoding='utf-8') as f: # Abre o arquivo em modo leitura com encoding UTF-8
-            usuario_tester = json.load(f) # Carrega o conteúdo JSON do arquivo para a variável 'usuario_tester'
+    try: # Tenta obter as credenciais do arquivo JSON (em cache enquanto o arquivo não for alterado)
+        usuario_tester = carregar_credenciais(TESTER_CREDENTIALS_FILE) # Credenciais de tester carregadas do cache ou do arquivo
     except FileNotFoundError: # Captura exceção se o arquivo de credenciais não for encontrado
         logger_app.critical(f"💥 Arquivo de credenciais tester não encontrado: '{TESTER_CREDENTIALS_FILE}'.", extra={'log_record_json': {"erro": "FileNotFoundError", "arquivo": TESTER_CREDENTIALS_FILE}}) # 🪵 Log crítico: arquivo de credenciais TESTER não encontrado
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Arquivo de credenciais de tester não encontrado.") # Levanta exceção HTTP 500
@@ -426,7 +721,7 @@ async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depen
         logger_app.critical(f"💥 Erro ao decodificar JSON do arquivo de credenciais tester: '{TESTER_CREDENTIALS_FILE}'. Detalhes: {e}", extra={'log_record_json': {"erro": "JSONDecodeError", "arquivo": TESTER_CREDENTIALS_FILE, "detalhe_erro": str(e)}}) # 🪵 Log crítico: erro ao decodificar JSON de credenciais TESTER
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno: Falha ao ler arquivo de credenciais de tester.") # Levanta exceção HTTP 500
 
-    if form_data.username == usuario_tester["username"] and form_data.password == usuario_tester["password"]: # ✅ Verifica username e password com as credenciais lidas
+    if credenciais_conferem(form_data.username, form_data.password, usuario_tester): # ✅ Verifica username e password com as credenciais lidas (tempo constante)
         tempo_expiracao_token = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES) # Define o tempo de expiração do token
         token_jwt = gerar_token_jwt(data={"sub": form_data.username, "nivel_acesso": "tester"}, expires_delta=tempo_expiracao_token) # 🔑 Gera o token JWT para tester
         logger_app.info(f"🔑 Token JWT (TESTER) gerado com sucesso para usuário 'tester'. Expira em {ACCESS_TOKEN_EXPIRE_MINUTES} minutos.", extra={'log_record_json': {"usuario": "tester", "expira_em_minutos": ACCESS_TOKEN_EXPIRE_MINUTES}}) # 🪵 Log de info: token TESTER gerado com sucesso
@@ -435,17 +730,117 @@ async def gerar_token_seguro_tester(form_data: OAuth2PasswordRequestForm = Depen
         logger_app.warning(f"⚠️ Requisição para /token_tester com credenciais de tester inválidas (IGNORADO para testes API).", extra={'log_record_json': {"username": form_data.username}}) # 🪵 Log de warning: requisição para token TESTER com credenciais inválidas (ignorado para testes)
         return {"access_token": "TOKEN_INVALIDO_PARA_TESTE", "token_type": "bearer", "nivel_acesso": "tester"} # Retorna um token inválido para testes (para fins de teste da API)
 
+# 🔢 Leitura do corpo das rotas matemáticas (orjson + NumPy, sem validação elemento a elemento do Pydantic)
+
+def _erro_corpo(tipo: str, loc: tuple, mensagem: str, entrada: Any) -> RequestValidationError: # ❌ Monta um erro 422 no formato da validação automática do FastAPI
+    """
+    Monta uma RequestValidationError com um único erro, no mesmo formato ('type', 'loc', 'msg', 'input') usado pelo FastAPI
+    quando valida o corpo da requisição com Pydantic, mantendo a resposta 422 inalterada para os clientes.
+
+    Args:
+        tipo (str): Tipo do erro (mesmos códigos do Pydantic, e.g., 'int_type', 'missing').
+        loc (tuple): Localização do erro dentro do corpo (sem o prefixo 'body').
+        mensagem (str): Mensagem do erro.
+        entrada (Any): Valor que causou o erro.
+
+    Returns:
+        RequestValidationError: Exceção pronta para ser levantada.
+    """
+    return RequestValidationError([{"type": tipo, "loc": ("body", *loc), "msg": mensagem, "input": entrada}])
+
+def _ler_numeros_entrada(corpo: bytes) -> tuple: # 🔢 Decodifica e valida o corpo {"numeros": [...]} com orjson + NumPy
+    """
+    Decodifica o corpo bruto com orjson e converte 'numeros' em um vetor NumPy int64 em uma única passada em C,
+    substituindo a validação elemento a elemento do Pydantic. Apenas inteiros JSON são aceitos.
+    Inteiros fora do intervalo int64 são aceitos e somados com precisão arbitrária ('sum' nativo sobre a lista).
+
+    Args:
+        corpo (bytes): Corpo bruto da requisição.
+
+    Returns:
+        tuple: (lista de números recebida, vetor int64 para o kernel Numba ou None). O vetor é None para listas
+               abaixo de VECTORIZATION_THRESHOLD (a soma em Python puro é mais rápida) ou com inteiros fora do int64.
+
+    Raises:
+        RequestValidationError: Se o corpo não for um JSON válido no formato de NumerosEntrada (resposta 422).
+    """
+    try:
+        dados = orjson.loads(corpo) # Decodifica o JSON (orjson, implementação em C)
+    except orjson.JSONDecodeError as e: # JSON malformado
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}])
+    if not isinstance(dados, dict): # O corpo deve ser um objeto JSON
+        raise _erro_corpo("model_attributes_type", (), "Input should be a valid dictionary or object to extract fields from", dados)
+    if "numeros" not in dados: # Campo obrigatório ausente
+        raise _erro_corpo("missing", ("numeros",), "Field required", dados)
+    for campo in dados: # Mesmo comportamento de extra="forbid" do NumerosEntrada
+        if campo != "numeros":
+            raise _erro_corpo("extra_forbidden", (campo,), "Extra inputs are not permitted", dados[campo])
+    lista_numeros = dados["numeros"]
+    if not isinstance(lista_numeros, list): # 'numeros' deve ser uma lista
+        raise _erro_corpo("list_type", ("numeros",), "Input should be a valid list", lista_numeros)
+    if not lista_numeros: # Lista vazia: tratada pela biblioteca (erro na soma, média None)
+        return lista_numeros, None
+    try:
+        vetor_numeros = np.array(lista_numeros) # Conversão em C; o dtype inferido indica se todos os elementos são inteiros int64
+    except (ValueError, TypeError): # Listas irregulares (e.g., [1, [2]]): verificadas elemento a elemento abaixo
+        vetor_numeros = None
+    if vetor_numeros is not None and vetor_numeros.dtype == np.int64 and vetor_numeros.ndim == 1: # Caso comum: apenas inteiros dentro do int64
+        return lista_numeros, (vetor_numeros if vetor_numeros.size >= VECTORIZATION_THRESHOLD else None)
+    lista_numeros = json.loads(corpo)["numeros"] # Caso raro (inteiros grandes ou elementos inválidos): o orjson converte inteiros acima de 64 bits em float, o json padrão os preserva
+    for indice, item in enumerate(lista_numeros): # Verificação elemento a elemento
+        if not isinstance(item, int): # Rejeita floats, strings, null, listas e objetos
+            raise _erro_corpo("int_type", ("numeros", indice), "Input should be a valid integer", item)
+    return lista_numeros, None # Inteiros fora do int64: soma com precisão arbitrária sobre a lista
+
+async def _executar(em_thread: bool, funcao, *args): # 🧵 Executa 'funcao' no threadpool ou direto no event loop
+    """
+    Executa uma função síncrona (decodificação do corpo ou cálculo) no threadpool do FastAPI quando 'em_thread' é True,
+    liberando o event loop para outras requisições durante entradas grandes; entradas pequenas rodam direto,
+    sem o custo de troca de thread.
+
+    Args:
+        em_thread (bool): True para executar no threadpool (corpo >= LIMIAR_CORPO_THREADPOOL).
+        funcao (Callable): Função síncrona a ser executada.
+        *args: Argumentos repassados para 'funcao'.
+
+    Returns:
+        Any: Valor retornado por 'funcao' (exceções são propagadas normalmente).
+    """
+    if em_thread:
+        return await run_in_threadpool(funcao, *args)
+    return funcao(*args)
+
+_SCHEMA_CORPO_NUMEROS = {"requestBody": {"required": True, "content": {"application/json": {"schema": NumerosEntrada.model_json_schema()}}}} # 📖 Mantém o corpo (NumerosEntrada) documentado no OpenAPI
+
+class _DetalhesRequisicao: # ℹ️ Contexto da requisição para os logs, formatado de forma preguiçosa
+    """
+    Guarda a requisição e os dados do usuário já extraídos do token e só monta o texto de contexto quando o registro
+    de log é de fato emitido (passado como argumento '%s' ao logger), evitando formatar a string em níveis de log desabilitados.
+    """
+    __slots__ = ("request", "sub", "nivel_acesso")
+
+    def __init__(self, request: Request, sub: Optional[str], nivel_acesso: Optional[str]):
+        self.request = request
+        self.sub = sub
+        self.nivel_acesso = nivel_acesso
+
+    def __str__(self) -> str: # Monta o texto de contexto da requisição
+        request = self.request
+        cliente = request.client
+        url = request.url
+        return f"Cliente: {cliente.host if cliente else 'desconhecido'}, URL: {url.path}, Usuário JWT (ADMIN): {self.sub}, Nível Acesso: {self.nivel_acesso}, HTTPS={url.scheme == 'https'}, Rate Limited=SIM"
+
 # ➕ Endpoints de Operações Matemáticas (PROTEGIDOS por JWT)
 
-@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros", description="Endpoint PROTEGIDO que realiza a soma de uma lista de números inteiros fornecida no corpo da requisição. Requer token JWT de administrador válido.", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=SomaResponse, response_class=JSONResponse)
-async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)): # ➕ Rota para somar vetor (PROTEGIDA) - /somar
+@app.post("/somar", tags=["matemática_segura"], summary="Soma um vetor de números inteiros", description="Endpoint PROTEGIDO que realiza a soma de uma lista de números inteiros fornecida no corpo da requisição. Requer token JWT de administrador válido.", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=SomaResponse, openapi_extra=_SCHEMA_CORPO_NUMEROS) # Sem response_class explícito: o FastAPI serializa o response_model direto para bytes JSON (pydantic-core)
+async def somar_vetor(request: Request, usuario: dict = Depends(obter_usuario_atual_jwt)): # ➕ Rota para somar vetor (PROTEGIDA) - /somar
     """
     Endpoint protegido para somar uma lista de números inteiros.
     Requer um token JWT válido de administrador para ser acessado.
 
     Args:
-        request (Request): Objeto Request do FastAPI para informações sobre a requisição.
-        numeros_entrada (NumerosEntrada): Objeto Pydantic contendo a lista de números a serem somados no campo 'numeros'.
+        request (Request): Objeto Request do FastAPI para informações sobre a requisição e leitura do corpo
+                           ({"numeros": [...]}, decodificado por '_ler_numeros_entrada').
         usuario (dict): Payload do token JWT do usuário autenticado, injetado pela dependência 'obter_usuario_atual_jwt'.
 
     Returns:
@@ -457,46 +852,54 @@ async def somar_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario
             - 400 BAD_REQUEST: Se houver erro de tipo de dados na biblioteca de cálculo (calc_numbers).
             - 500 INTERNAL_SERVER_ERROR: Em caso de erro interno no servidor.
     """
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM" # ℹ️ Detalhes da requisição para logs
-    logger_app.info(f"➡️  Requisição POST em '/somar' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}}) # 🪵 Log de info: requisição POST para '/somar' recebida
+    sub, nivel_acesso = usuario.get('sub'), usuario.get('nivel_acesso') # 👤 Dados do usuário lidos do payload JWT uma única vez
+    detalhes_requisicao = _DetalhesRequisicao(request, sub, nivel_acesso) # ℹ️ Detalhes da requisição para logs (texto montado apenas se o registro for emitido)
+    logger_app.info("➡️  Requisição POST em '/somar' (PROTEGIDO) de %s", detalhes_requisicao, extra={'log_record_json': {}}) # 🪵 Log de info: requisição POST para '/somar' recebida
+    corpo = await request.body() # 📦 Corpo bruto da requisição
+    corpo_grande = len(corpo) >= LIMIAR_CORPO_THREADPOOL # 🧵 Entradas grandes são processadas no threadpool
+    lista_numeros, vetor_numeros = await _executar(corpo_grande, _ler_numeros_entrada, corpo) # 🔢 Corpo decodificado com orjson + NumPy (422 se inválido, fora do try para não virar erro 500)
 
     try: # Tenta executar a operação de soma
-        lista_numeros = numeros_entrada.numeros # 🔢 Extrai a lista de números do objeto Pydantic de entrada
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # 🪵 Log de debug: corpo da requisição validado
-
-        instancia_numeros = Numbers() # ➕ Instancia a classe Numbers da biblioteca 'bibliotecas.calc_numbers'
-        resultado_soma = instancia_numeros.sum_numbers(lista_numeros) # ➕ Chama a função 'sum_numbers' para realizar a soma
-
-        conteudo_resposta = {"resultado": resultado_soma, "mensagem": "Operação de soma bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # 💬 Monta o conteúdo da resposta
-        logger_app.info(f"➕ Operação de soma bem-sucedida. Resultado: {resultado_soma} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_soma": resultado_soma, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # 🪵 Log de info: operação de soma bem-sucedida
+        if logger_app.isEnabledFor(logging.DEBUG): # Evita montar o registro (lista inteira de números) quando DEBUG está desabilitado
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (orjson + NumPy): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # 🪵 Log de debug: corpo da requisição validado
+
+        if vetor_numeros is not None: # ➕ Soma pelo kernel Numba sobre o vetor int64
+            resultado_soma = await _executar(corpo_grande, INSTANCIA_NUMEROS.sum_int64_array, vetor_numeros)
+        elif lista_numeros: # ➕ Listas pequenas ou com inteiros grandes: 'sum' nativo, pois '_ler_numeros_entrada' já garantiu que todos os elementos são inteiros
+            resultado_soma = await _executar(corpo_grande, sum, lista_numeros)
+        else: # ➕ Lista vazia: a função 'sum_numbers' da biblioteca rejeita a entrada (ValueError -> 422)
+            resultado_soma = INSTANCIA_NUMEROS.sum_numbers(lista_numeros)
+
+        conteudo_resposta = SomaResponse.model_construct(resultado=resultado_soma, mensagem="Operação de soma bem-sucedida", numeros_entrada=lista_numeros, usuario=sub, nivel_acesso=nivel_acesso) # 💬 Monta a resposta sem revalidação (dados gerados pelo próprio servidor)
+        logger_app.info("➕ Operação de soma bem-sucedida. Resultado: %s - %s", resultado_soma, detalhes_requisicao, extra={'log_record_json': {"resultado_soma": resultado_soma, "usuario": sub, "nivel_acesso": nivel_acesso}}) # 🪵 Log de info: operação de soma bem-sucedida
         return conteudo_resposta # Retorna a resposta com o resultado da soma
 
     except ValueError as e_calc_value: # Captura exceção ValueError da biblioteca de cálculo (e.g., lista vazia)
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/somar': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # 🪵 Log de warning: erro de validação na entrada para '/somar'
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/somar': %s - %s", e_calc_value, detalhes_requisicao, extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # 🪵 Log de warning: erro de validação na entrada para '/somar'
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value)) # Levanta exceção HTTP 422
     except TypeError as e_calc_type: # Captura exceção TypeError da biblioteca de cálculo (e.g., tipo de dado incorreto)
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # 🪵 Log de error: erro de tipo de dados na biblioteca para '/somar'
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/somar': %s - %s", e_calc_type, detalhes_requisicao, extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # 🪵 Log de error: erro de tipo de dados na biblioteca para '/somar'
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type)) # Levanta exceção HTTP 400
     except HTTPException as exc_http: # Captura exceções HTTPException levantadas explicitamente no código
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # 🪵 Log de error: exceção HTTP capturada
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
+        logger_app.error("🔥 Exceção HTTP: %s - Status Code: %s - %s", exc_http.detail, exc_http.status_code, detalhes_requisicao, extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # 🪵 Log de error: exceção HTTP capturada
+        return JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
     except ValidationError as ve: # Captura exceções ValidationError do Pydantic (erros de validação do modelo)
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}}) # 🪵 Log de warning: erro de validação Pydantic na entrada para '/somar'
+        logger_app.warning("⚠️ Erro de Validação de Entrada (Pydantic): %s - %s", ve.errors(), detalhes_requisicao, extra={'log_record_json': {"erro_validacao": ve.errors()}}) # 🪵 Log de warning: erro de validação Pydantic na entrada para '/somar'
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors()) # Levanta exceção HTTP 422
     except Exception as e: # Captura qualquer outra exceção inesperada
         msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}" # Monta mensagem de erro detalhada
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # 🪵 Log crítico: erro interno do servidor para '/somar'
+        logger_app.critical("💥 Erro Crítico no Servidor: %s - %s", msg_detalhe_erro, detalhes_requisicao, exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # 🪵 Log crítico: erro interno do servidor para '/somar'
         return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna resposta JSON com erro 500
 
-@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros", description="Endpoint PROTEGIDO que calcula a média de uma lista de números inteiros fornecida. Requer token JWT de administrador válido.", dependencies=[Depends(obter_usuario_atual_jwt)], response_model=MediaResponse, response_class=JSONResponse)
-async def calcular_media_vetor(request: Request, numeros_entrada: NumerosEntrada, usuario: dict = Depends(obter_usuario_atual_jwt)): # ➗ Rota para calcular média vetor (PROTEGIDA) - /calcular_media
+@app.post("/calcular_media", tags=["matemática_segura"], summary="Calcula a média de um vetor de números inteiros", description="Endpoint PROTEGIDO que calcula a média de uma lista de números inteiros fornecida. Requer token JWT de administrador válido.", dependencies=[Depends(verificar_rate_limit), Depends(obter_usuario_atual_jwt)], response_model=MediaResponse, openapi_extra=_SCHEMA_CORPO_NUMEROS) # Sem response_class explícito: serialização direta via pydantic-core
+async def calcular_media_vetor(request: Request, usuario: dict = Depends(obter_usuario_atual_jwt)): # ➗ Rota para calcular média vetor (PROTEGIDA) - /calcular_media
     """
     Endpoint protegido para calcular a média de uma lista de números inteiros.
     Requer um token JWT válido de administrador para ser acessado.
 
     Args:
-        request (Request): Objeto Request do FastAPI para informações sobre a requisição.
-        numeros_entrada (NumerosEntrada): Objeto Pydantic contendo a lista de números para calcular a média no campo 'numeros'.
+        request (Request): Objeto Request do FastAPI para informações sobre a requisição e leitura do corpo
+                           ({"numeros": [...]}, decodificado por '_ler_numeros_entrada').
         usuario (dict): Payload do token JWT do usuário autenticado, injetado pela dependência 'obter_usuario_atual_jwt'.
 
     Returns:
@@ -508,116 +911,81 @@ async def calcular_media_vetor(request: Request, numeros_entrada: NumerosEntrada
             - 400 BAD_REQUEST: Se houver erro de tipo de dados na biblioteca de cálculo.
             - 500 INTERNAL_SERVER_ERROR: Em caso de erro interno no servidor.
     """
-    detalhes_requisicao = f"Cliente: {request.client.host if request.client else 'desconhecido'}, URL: {request.url.path}, Usuário JWT (ADMIN): {usuario.get('sub') if usuario else 'desconhecido'}, Nível Acesso: {usuario.get('nivel_acesso') if usuario else 'desconhecido'}, HTTPS={request.url.scheme == 'https'}, Rate Limited=SIM" # ℹ️ Detalhes da requisição para logs
-    logger_app.info(f"➡️  Requisição POST em '/calcular_media' (PROTEGIDO) de {detalhes_requisicao}", extra={'log_record_json': {}}) # 🪵 Log de info: requisição POST para '/calcular_media' recebida
+    sub, nivel_acesso = usuario.get('sub'), usuario.get('nivel_acesso') # 👤 Dados do usuário lidos do payload JWT uma única vez
+    detalhes_requisicao = _DetalhesRequisicao(request, sub, nivel_acesso) # ℹ️ Detalhes da requisição para logs (texto montado apenas se o registro for emitido)
+    logger_app.info("➡️  Requisição POST em '/calcular_media' (PROTEGIDO) de %s", detalhes_requisicao, extra={'log_record_json': {}}) # 🪵 Log de info: requisição POST para '/calcular_media' recebida
+    corpo = await request.body() # 📦 Corpo bruto da requisição
+    corpo_grande = len(corpo) >= LIMIAR_CORPO_THREADPOOL # 🧵 Entradas grandes são processadas no threadpool
+    lista_numeros, vetor_numeros = await _executar(corpo_grande, _ler_numeros_entrada, corpo) # 🔢 Corpo decodificado com orjson + NumPy (422 se inválido, fora do try para não virar erro 500)
 
     try: # Tenta executar a operação de cálculo da média
-        lista_numeros = numeros_entrada.numeros # 🔢 Extrai a lista de números do objeto Pydantic de entrada
-        logger_app.debug(f"📦 Corpo da requisição JSON recebido e VALIDADO (Pydantic): {lista_numeros}", extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # 🪵 Log de debug: corpo da requisição validado
+        if logger_app.isEnabledFor(logging.DEBUG): # Evita montar o registro (lista inteira de números) quando DEBUG está desabilitado
+            logger_app.debug("📦 Corpo da requisição JSON recebido e VALIDADO (orjson + NumPy): %s", lista_numeros, extra={'log_record_json': {"numeros_entrada": lista_numeros}}) # 🪵 Log de debug: corpo da requisição validado
 
-        instancia_numeros = Numbers() # ➗ Instancia a classe Numbers da biblioteca 'bibliotecas.calc_numbers'
-        resultado_media = instancia_numeros.calculate_average(lista_numeros) # ➗ Chama a função 'calculate_average' para calcular a média
+        if vetor_numeros is not None: # ➗ Média a partir da soma feita pelo kernel Numba sobre o vetor int64
+            resultado_media = await _executar(corpo_grande, INSTANCIA_NUMEROS.sum_int64_array, vetor_numeros) / vetor_numeros.size
+        elif lista_numeros: # ➗ Listas pequenas ou com inteiros grandes: 'sum' nativo sobre a lista já validada por '_ler_numeros_entrada'
+            resultado_media = await _executar(corpo_grande, sum, lista_numeros) / len(lista_numeros)
+        else: # ➗ Lista vazia: a função 'calculate_average' da biblioteca retorna None
+            resultado_media = INSTANCIA_NUMEROS.calculate_average(lista_numeros)
 
         if resultado_media is None: # 🧪 Caso a lista de números seja vazia, a média é None
-            return {"media": None, "mensagem": "Operação de média bem-sucedida para lista vazia", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # Retorna resposta para lista vazia
-        conteudo_resposta = {"media": resultado_media, "mensagem": "Operação de média bem-sucedida", "numeros_entrada": lista_numeros, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')} # 💬 Monta o conteúdo da resposta
-        logger_app.info(f"➗ Operação de média bem-sucedida. Média: {resultado_media} - {detalhes_requisicao}", extra={'log_record_json': {"resultado_media": resultado_media, "usuario": usuario.get('sub'), "nivel_acesso": usuario.get('nivel_acesso')}}) # 🪵 Log de info: operação de média bem-sucedida
+            return MediaResponse.model_construct(media=None, mensagem="Operação de média bem-sucedida para lista vazia", numeros_entrada=lista_numeros, usuario=sub, nivel_acesso=nivel_acesso) # Retorna resposta para lista vazia
+        conteudo_resposta = MediaResponse.model_construct(media=resultado_media, mensagem="Operação de média bem-sucedida", numeros_entrada=lista_numeros, usuario=sub, nivel_acesso=nivel_acesso) # 💬 Monta a resposta sem revalidação (dados gerados pelo próprio servidor)
+        logger_app.info("➗ Operação de média bem-sucedida. Média: %s - %s", resultado_media, detalhes_requisicao, extra={'log_record_json': {"resultado_media": resultado_media, "usuario": sub, "nivel_acesso": nivel_acesso}}) # 🪵 Log de info: operação de média bem-sucedida
         return conteudo_resposta # Retorna a resposta com o resultado da média
 
     except ValueError as e_calc_value: # Captura exceção ValueError da biblioteca de cálculo
-        logger_app.warning(f"⚠️ Erro de validação nos dados de entrada para '/calcular_media': {e_calc_value} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # 🪵 Log de warning: erro de validação na entrada para '/calcular_media'
+        logger_app.warning("⚠️ Erro de validação nos dados de entrada para '/calcular_media': %s - %s", e_calc_value, detalhes_requisicao, extra={'log_record_json': {"erro_biblioteca": str(e_calc_value)}}) # 🪵 Log de warning: erro de validação na entrada para '/calcular_media'
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e_calc_value)) # Levanta exceção HTTP 422
     except TypeError as e_calc_type: # Captura exceção TypeError da biblioteca de cálculo
-        logger_app.error(f"🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': {e_calc_type} - {detalhes_requisicao}", extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # 🪵 Log de error: erro de tipo de dados na biblioteca para '/calcular_media'
+        logger_app.error("🔥 Erro de tipo de dados na biblioteca calc_numbers para '/calcular_media': %s - %s", e_calc_type, detalhes_requisicao, extra={'log_record_json': {"erro_biblioteca": str(e_calc_type)}}) # 🪵 Log de error: erro de tipo de dados na biblioteca para '/calcular_media'
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e_calc_type)) # Levanta exceção HTTP 400
     except HTTPException as exc_http: # Captura exceções HTTPException levantadas explicitamente
-        logger_app.error(f"🔥 Exceção HTTP: {exc_http.detail} - Status Code: {exc_http.status_code} - {detalhes_requisicao}", extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # 🪵 Log de error: exceção HTTP capturada
-        raise JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
+        logger_app.error("🔥 Exceção HTTP: %s - Status Code: %s - %s", exc_http.detail, exc_http.status_code, detalhes_requisicao, extra={'log_record_json': {"erro_http": exc_http.detail, "status_code": exc_http.status_code}}) # 🪵 Log de error: exceção HTTP capturada
+        return JSONResponse(status_code=exc_http.status_code, content={"erro": exc_http.detail}) # Retorna resposta JSON com erro HTTP
     except ValidationError as ve: # Captura exceções ValidationError do Pydantic
-        logger_app.warning(f"⚠️ Erro de Validação de Entrada (Pydantic): {ve.errors()} - {detalhes_requisicao}", extra={'log_record_json': {"erro_validacao": ve.errors()}}) # 🪵 Log de warning: erro de validação Pydantic na entrada para '/calcular_media'
+        logger_app.warning("⚠️ Erro de Validação de Entrada (Pydantic): %s - %s", ve.errors(), detalhes_requisicao, extra={'log_record_json': {"erro_validacao": ve.errors()}}) # 🪵 Log de warning: erro de validação Pydantic na entrada para '/calcular_media'
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=ve.errors()) # Levanta exceção HTTP 422
     except Exception as e: # Captura qualquer outra exceção inesperada
         msg_detalhe_erro = f"Erro inesperado no servidor: {str(e)}" # Monta mensagem de erro detalhada
-        logger_app.critical(f"💥 Erro Crítico no Servidor: {msg_detalhe_erro} - {detalhes_requisicao}", exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # 🪵 Log crítico: erro interno do servidor para '/calcular_media'
+        logger_app.critical("💥 Erro Crítico no Servidor: %s - %s", msg_detalhe_erro, detalhes_requisicao, exc_info=True, extra={'log_record_json': {"erro_servidor": msg_detalhe_erro, "exception": str(e)}}) # 🪵 Log crítico: erro interno do servidor para '/calcular_media'
         return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"erro": "Erro interno do servidor", "detalhes": msg_detalhe_erro}) # Retorna resposta JSON com erro 500
 
 # 🩺 Endpoint de Saúde da API (PÚBLICO - Sem Autenticação)
 
-@app.get("/saude", tags=["sistema_seguro"], summary="Verifica a saúde da API", description="Endpoint PÚBLICO para verificar se a API está online e funcionando corretamente.", response_class=JSONResponse, response_model=SaudeResponse)
+_CORPO_SAUDE = SaudeResponse(status="OK", mensagem="API Matemática Segura está operacional e respondendo.").model_dump_json().encode() # 🩺 Corpo JSON da rota /saude, serializado uma única vez (resposta estática)
+
+@app.get("/saude", tags=["sistema_seguro"], summary="Verifica a saúde da API", description="Endpoint PÚBLICO para verificar se a API está online e funcionando corretamente.", response_model=SaudeResponse) # response_model mantido apenas para a documentação OpenAPI
 async def verificar_saude_segura(): # 🩺 Rota de saúde da API (PÚBLICA) - /saude
     """
     Endpoint público para verificar a saúde e o status da API.
     Não requer autenticação e pode ser acessado por qualquer cliente.
-    Retorna informações sobre o status operacional da API, versão, ambiente, etc.
+    Retorna o corpo pré-serializado em '_CORPO_SAUDE' (sem montagem, validação ou serialização por requisição).
 
     Returns:
-        SaudeResponse: Objeto Pydantic contendo o 'status' da API ('OK' para operacional) e uma 'mensagem' informativa.
-    """
-    timestamp = datetime.now().isoformat() # 🕒 Obtém o timestamp atual em formato ISO 8601
-    saude_template = { # 🩺 Template para a resposta de saúde da API
-        "status": "OK", # ✅ Status da API (OK = operacional)
-        "version": "0.9.3", # 📌 Versão da API
-        "ambiente": os.environ.get("API_ENVIRONMENT", "Desenvolvimento"), # 🌍 Ambiente da API (e.g., 'Desenvolvimento', 'Produção')
-        "timestamp": timestamp, # 🕒 Timestamp da verificação de saúde
-        "mensagem": "API Matemática Segura está operacional e respondendo.", # 💬 Mensagem de saúde geral
-        "detalhes": { # ℹ️ Detalhes técnicos sobre a API
-            "servidor": "FastAPI", # ⚙️ Framework utilizado: FastAPI
-            "seguranca": "JWT, HTTPS, Rate Limiting", # 🛡️ Mecanismos de segurança implementados
-            "logs": "Detalhado em JSON" # 🪵 Formato dos logs: JSON detalhado
-        },
-        "status_code": 200, # 🚦 Código de status HTTP: 200 OK
-        "emoji_status": "🚀", # 🚀 Emoji representando o status saudável da API
-        "indicador_saude": "💚 Ótimo" # 💚 Indicador visual de saúde: Ótimo
-    }
-    return saude_template # Retorna o template de saúde como resposta JSON
+        Response: Resposta JSON no formato SaudeResponse, com o 'status' da API ('OK' para operacional) e uma 'mensagem' informativa.
+    """
+    return Response(content=_CORPO_SAUDE, media_type="application/json") # Retorna os bytes pré-serializados
 
 # ⚙️ Execução do Servidor Uvicorn (HTTPS)
 if __name__ == "__main__":
     import uvicorn
 
-    # 🔑 Cria diretório para credenciais e certificados se não existirem
+    # 🔑 Certificados HTTPS e credenciais padrão são gerados UMA vez por 'scripts/bootstrap_creds.py' (não a cada início de processo)
     os.makedirs(CREDENTIALS_DIR, exist_ok=True)
     CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem") # 🔑 Caminho para o arquivo de certificado HTTPS
     KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem") # 🔑 Caminho para o arquivo de chave privada HTTPS
-    ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # ⚙️ Caminho para o arquivo de credenciais de admin
-    TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # ⚙️ Caminho para o arquivo de credenciais de tester
-
-    # 🔑 Gera certificados autoassinados HTTPS se não existirem (para desenvolvimento local)
-    if not os.path.exists(CERT_FILE) or not os.path.exists(KEY_FILE): # ✅ Verifica se os arquivos de certificado e chave não existem
-        logger_app.info("🔑 Gerando certificados autoassinados para HTTPS...", extra={'log_record_json': {"acao": "geracao_certificados_https"}}) # 🪵 Log de info: geração de certificados HTTPS iniciada
-        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend()) # 🔑 Gera chave privada RSA
-        subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")]) # 🔑 Define o Subject do certificado (localhost)
-        builder = x509.CertificateBuilder().subject_name(subject).issuer_name(subject).public_key(private_key.public_key()).serial_number(x509.random_serial_number()).not_valid_before(datetime.utcnow()).not_valid_after(datetime.utcnow() + timedelta(days=365)).add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False) # 🔑 Builder do certificado X.509
-        certificate = builder.sign(private_key, hashes.SHA256(), default_backend()) # 🔑 Assina o certificado com a chave privada
-        with open(KEY_FILE, "wb") as key_f: # 🔑 Salva a chave privada no arquivo 'chave.pem'
-            key_f.write(private_key.private_bytes(encoding=serialization.Encoding.PEM, format=serialization.PrivateFormat.PKCS8, encryption_algorithm=serialization.NoEncryption()))
-        with open(CERT_FILE, "wb") as cert_f: # 🔑 Salva o certificado no arquivo 'certificado.pem'
-            cert_f.write(certificate.public_bytes(serialization.Encoding.PEM))
-        logger_app.info(f"🔑 Certificados autoassinados gerados e salvos em: '{CREDENTIALS_DIR}/'", extra={'log_record_json': {"acao": "certificados_salvos", "diretorio": CREDENTIALS_DIR}}) # 🪵 Log de info: certificados HTTPS gerados e salvos
-    else: # Se os certificados já existirem
-        logger_app.info(f"🔑 Certificados HTTPS autoassinados já existentes em: '{CREDENTIALS_DIR}/'. Usando existentes.", extra={'log_record_json': {"acao": "certificados_existentes", "diretorio": CREDENTIALS_DIR}}) # 🪵 Log de info: certificados HTTPS existentes sendo usados
-
-    # ⚙️ Cria arquivos de credenciais padrão (admin/admin, tester/tester) se não existirem (para desenvolvimento local)
-    if not os.path.exists(ADMIN_CREDENTIALS_FILE): # ✅ Verifica se o arquivo de credenciais admin não existe
-        logger_app.info(f"⚙️  Criando arquivo de credenciais admin padrão: '{ADMIN_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_admin", "arquivo": ADMIN_CREDENTIALS_FILE}}) # 🪵 Log de info: criação de credenciais ADMIN iniciada
-        admin_creds = {"username": "admin", "password": "admin"} # ⚙️ Credenciais padrão admin
-        with open(ADMIN_CREDENTIALS_FILE, "w", encoding='utf-8') as f: # ⚙️ Salva as credenciais admin no arquivo 'admin_credentials.json'
-            json.dump(admin_creds, f, indent=4, ensure_ascii=False)
-        logger_app.info(f"⚙️  Arquivo de credenciais admin padrão criado.", extra={'log_record_json': {"acao": "creds_admin_criadas_sucesso", "arquivo": ADMIN_CREDENTIALS_FILE}}) # 🪵 Log de info: credenciais ADMIN criadas com sucesso
-    else: # Se o arquivo de credenciais admin já existir
-        logger_app.info(f"⚙️  Arquivo de credenciais admin já existente: '{ADMIN_CREDENTIALS_FILE}'. Usando existente.", extra={'log_record_json': {"acao": "creds_admin_existentes", "arquivo": ADMIN_CREDENTIALS_FILE}}) # 🪵 Log de info: credenciais ADMIN existentes sendo usadas
-
-    if not os.path.exists(TESTER_CREDENTIALS_FILE): # ✅ Verifica se o arquivo de credenciais tester não existe
-        logger_app.info(f"⚙️  Criando arquivo de credenciais tester padrão: '{TESTER_CREDENTIALS_FILE}'...", extra={'log_record_json': {"acao": "criacao_creds_tester", "arquivo": TESTER_CREDENTIALS_FILE}}) # 🪵 Log de info: criação de credenciais TESTER iniciada
-        tester_creds = {"username": "tester", "password": "tester"} # ⚙️ Credenciais padrão tester
-        with open(TESTER_CREDENTIALS_FILE, "w", encoding='utf-8') as f: # ⚙️ Salva as credenciais tester no arquivo 'tester_credentials.json'
-            json.dump(tester_creds, f, indent=4, ensure_ascii=False)
-        logger_app.info(f"⚙️  Arquivo de credenciais tester padrão criado.", extra={'log_record_json': {"acao": "creds_tester_criadas_sucesso", "arquivo": TESTER_CREDENTIALS_FILE}}) # 🪵 Log de info: credenciais TESTER criadas com sucesso
-    else: # Se o arquivo de credenciais tester já existir
-        logger_app.info(f"⚙️  Arquivo de credenciais tester já existente: '{TESTER_CREDENTIALS_FILE}'. Usando existente.", extra={'log_record_json': {"acao": "creds_tester_existentes", "arquivo": TESTER_CREDENTIALS_FILE}}) # 🪵 Log de info: credenciais TESTER existentes sendo usadas
+    arquivos_ausentes = [arquivo for arquivo in (CERT_FILE, KEY_FILE, ADMIN_CREDENTIALS_FILE, TESTER_CREDENTIALS_FILE) if not os.path.exists(arquivo)] # ✅ Verifica se os arquivos esperados existem
+    if arquivos_ausentes: # Sem certificados/credenciais a API não pode iniciar: orienta a execução do script de inicialização
+        logger_app.critical("🚨 Arquivos de certificados/credenciais ausentes: %s. Execute 'python scripts/bootstrap_creds.py' antes de iniciar a API.", arquivos_ausentes, extra={'log_record_json': {"acao": "arquivos_credenciais_ausentes", "arquivos": arquivos_ausentes}}) # 🪵 Log crítico: arquivos de credenciais ausentes
+        sys.exit(1)
+    logger_app.info(f"🔑 Certificados HTTPS e credenciais encontrados em: '{CREDENTIALS_DIR}/'.", extra={'log_record_json': {"acao": "credenciais_existentes", "diretorio": CREDENTIALS_DIR}}) # 🪵 Log de info: certificados e credenciais existentes sendo usados
 
     # 🚀 Inicia o servidor Uvicorn com HTTPS e documentação Swagger/ReDoc AUTOMÁTICA no /docs e /redoc
     print("✅ Servidor FastAPI inicializado. ")
     print("➡️  Acesse a documentação interativa Swagger UI em: https://localhost:8882/docs") # 📖 Instruções Swagger UI
     print("➡️  Acesse a documentação alternativa ReDoc em: https://localhost:8882/redoc") # 📚 Instruções ReDoc
-    uvicorn.run(app, host="0.0.0.0", port=8882, ssl_certfile=CERT_FILE, ssl_keyfile=KEY_FILE) # 🚀 Inicia o servidor Uvicorn com HTTPS
\ No newline at end of file
+    NUM_WORKERS = int(os.environ.get("API_WORKERS", str(os.cpu_count() or 1))) # ⚙️ Número de processos worker do Uvicorn (Rate Limiting e cache de tokens são por processo)
+    alvo_app = app if NUM_WORKERS == 1 else f"{os.path.splitext(os.path.basename(__file__))[0]}:app" # ⚙️ Com vários workers o Uvicorn exige a aplicação como string de importação
+    uvicorn.run(alvo_app, host="0.0.0.0", port=8882, workers=NUM_WORKERS, loop="auto", http="auto", app_dir=os.path.dirname(os.path.abspath(__file__)), ssl_certfile=CERT_FILE, ssl_keyfile=KEY_FILE) # 🚀 Inicia o servidor Uvicorn com HTTPS ('auto' usa uvloop e httptools quando instalados)
\ No newline at end of file
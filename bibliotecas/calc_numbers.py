@@ -1,4 +1,21 @@
+import numba
+import numpy as np
+
+VECTORIZATION_THRESHOLD = 1024
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+@numba.njit(numba.int64(numba.int64[::1]), cache=True, nogil=True)
+def _sum_i64(values):
+    total = 0
+    for i in range(values.size):
+        total += values[i]
+    return total
+
+
 class Numbers:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -7,7 +24,7 @@ class Numbers:
             validated_list = self._validate_integer_list(numeros, operation_name="soma")
             if not validated_list:
                 raise ValueError("Erro de valor na operação de soma: A lista de números não pode estar vazia.")
-            return sum(validated_list)
+            return self._sum_integers(validated_list)
         except (TypeError, ValueError) as e:
             raise e
 
@@ -16,10 +33,39 @@ class Numbers:
             validated_list = self._validate_integer_list(numeros, operation_name="média")
             if not validated_list:
                 return None
-            return sum(validated_list) / len(validated_list)
+            return self._sum_integers(validated_list) / len(validated_list)
         except (TypeError, ValueError) as e:
             raise e
 
+    def sum_and_average(self, numeros: any, operation_name: str = "média") -> tuple[int, float | None]:
+        validated_list = self._validate_integer_list(numeros, operation_name=operation_name)
+        if not validated_list:
+            return 0, None
+        total = self._sum_integers(validated_list)
+        return total, total / len(validated_list)
+
+    def sum_int64_array(self, values: np.ndarray) -> int:
+        if not isinstance(values, np.ndarray) or values.ndim != 1 or values.dtype != np.int64:
+            raise TypeError("Erro de tipo na operação de soma: A entrada deve ser um vetor numpy unidimensional de int64.")
+        if values.size == 0:
+            raise ValueError("Erro de valor na operação de soma: A lista de números não pode estar vazia.")
+        return self._sum_int64_values(np.ascontiguousarray(values))
+
+    def _sum_integers(self, integer_list: list[int]) -> int:
+        if len(integer_list) < VECTORIZATION_THRESHOLD:
+            return sum(integer_list)
+        try:
+            values = np.fromiter(integer_list, dtype=np.int64, count=len(integer_list))
+        except OverflowError:
+            return sum(integer_list)
+        return self._sum_int64_values(values)
+
+    def _sum_int64_values(self, values: np.ndarray) -> int:
+        max_magnitude = max(int(values.max()), -int(values.min()))
+        if max_magnitude * values.size > _INT64_MAX:
+            return sum(values.tolist())
+        return int(_sum_i64(values))
+
     def _validate_input_list(self, data: any, operation_name: str) -> list:
         if not isinstance(data, list):
             raise TypeError(f"Erro de tipo na operação de {operation_name}: A entrada deve ser uma lista, mas foi fornecido '{type(data).__name__}'.")
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Script de inicialização de credenciais e certificados da API Matemática Segura (executar UMA única vez)
+
+Gera, apenas quando ainda não existem, os arquivos que a API (app/API-main-server-prod-documentada.py)
+espera encontrar em CREDENTIALS_DIR ao iniciar:
+    - Certificado HTTPS autoassinado ('certificado.pem') e sua chave privada ('chave.pem').
+    - Credenciais padrão de ADMIN ('admin_credentials.json': admin/admin).
+    - Credenciais padrão de TESTER ('tester_credentials.json': tester/tester).
+
+Deve ser executado antes de subir a API (e.g., em um 'RUN' do Dockerfile ou em um hook de pré-inicialização),
+para que a geração de chaves e a escrita dos arquivos não aconteçam a cada início de processo nem em cada worker
+do Uvicorn (evitando disputa entre processos pelos mesmos arquivos).
+
+A chave do certificado é ECDSA P-256: geração praticamente instantânea e handshakes TLS mais rápidos que RSA-2048,
+com suporte em todos os navegadores e clientes HTTP (ao contrário de certificados Ed25519).
+
+Uso (a partir da raiz do projeto, o mesmo diretório de trabalho da API):
+    python scripts/bootstrap_creds.py
+
+Variáveis de ambiente:
+    - API_CREDENTIALS_DIR: Diretório dos arquivos de credenciais e certificados (padrão: 'credentials').
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Importações da cryptography para geração de certificados HTTPS autoassinados
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+# ⚙️ Caminhos dos arquivos (mesmos nomes e variável de ambiente usados pela API)
+CREDENTIALS_DIR = os.environ.get("API_CREDENTIALS_DIR", "credentials") # 🗂️ Diretório para arquivos de credenciais e certificados
+CERT_FILE = os.path.join(CREDENTIALS_DIR, "certificado.pem") # 🔑 Caminho para o arquivo de certificado HTTPS
+KEY_FILE = os.path.join(CREDENTIALS_DIR, "chave.pem") # 🔑 Caminho para o arquivo de chave privada HTTPS
+ADMIN_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "admin_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de admin
+TESTER_CREDENTIALS_FILE = os.path.join(CREDENTIALS_DIR, "tester_credentials.json") # 🗂️ Caminho para o arquivo de credenciais de tester
+CREDENCIAIS_PADRAO = { # ⚙️ Credenciais padrão (para desenvolvimento local): arquivo -> (perfil, conteúdo)
+    ADMIN_CREDENTIALS_FILE: ("admin", {"username": "admin", "password": "admin"}),
+    TESTER_CREDENTIALS_FILE: ("tester", {"username": "tester", "password": "tester"}),
+}
+
+def gerar_certificado_autoassinado() -> None: # 🔑 Gera o par certificado/chave HTTPS se algum dos arquivos não existir
+    """
+    Gera um certificado X.509 autoassinado para 'localhost' (válido por 365 dias) com chave ECDSA P-256
+    e salva o certificado em CERT_FILE e a chave privada (PKCS8, sem senha, permissão 0600) em KEY_FILE.
+    Não faz nada se os dois arquivos já existirem.
+    """
+    if os.path.exists(CERT_FILE) and os.path.exists(KEY_FILE): # ✅ Par certificado/chave já existente
+        print(f"🔑 Certificados HTTPS autoassinados já existentes em: '{CREDENTIALS_DIR}/'. Usando existentes.")
+        return
+    print("🔑 Gerando certificados autoassinados para HTTPS (ECDSA P-256)...")
+    private_key = ec.generate_private_key(ec.SECP256R1()) # 🔑 Gera chave privada ECDSA P-256
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")]) # 🔑 Define o Subject do certificado (localhost)
+    agora = datetime.now(timezone.utc) # 🕒 Início da validade do certificado
+    builder = x509.CertificateBuilder().subject_name(subject).issuer_name(subject).public_key(private_key.public_key()).serial_number(x509.random_serial_number()).not_valid_before(agora).not_valid_after(agora + timedelta(days=365)).add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False) # 🔑 Builder do certificado X.509
+    certificate = builder.sign(private_key, hashes.SHA256()) # 🔑 Assina o certificado com a chave privada
+    descritor_chave = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600) # 🔒 Chave privada legível apenas pelo dono
+    with os.fdopen(descritor_chave, "wb") as key_f: # 🔑 Salva a chave privada no arquivo 'chave.pem'
+        key_f.write(private_key.private_bytes(encoding=serialization.Encoding.PEM, format=serialization.PrivateFormat.PKCS8, encryption_algorithm=serialization.NoEncryption()))
+    with open(CERT_FILE, "wb") as cert_f: # 🔑 Salva o certificado no arquivo 'certificado.pem'
+        cert_f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    print(f"🔑 Certificados autoassinados gerados e salvos em: '{CREDENTIALS_DIR}/'")
+
+def criar_credenciais_padrao() -> None: # ⚙️ Cria os arquivos de credenciais padrão que ainda não existirem
+    """
+    Cria os arquivos de credenciais padrão (admin/admin e tester/tester) em CREDENTIALS_DIR.
+    Cada arquivo é aberto em modo exclusivo ('x'), portanto arquivos existentes nunca são sobrescritos.
+    """
+    for caminho, (perfil, credenciais) in CREDENCIAIS_PADRAO.items():
+        try:
+            with open(caminho, "x", encoding='utf-8') as f: # ⚙️ Falha se o arquivo já existir (sem sobrescrever)
+                json.dump(credenciais, f, indent=4, ensure_ascii=False)
+        except FileExistsError: # Arquivo já existente: mantém as credenciais configuradas
+            print(f"⚙️  Arquivo de credenciais {perfil} já existente: '{caminho}'. Usando existente.")
+            continue
+        print(f"⚙️  Arquivo de credenciais {perfil} padrão criado: '{caminho}'.")
+
+def main() -> int: # 🚀 Ponto de entrada do script
+    """
+    Cria o diretório de credenciais e gera os arquivos ausentes.
+
+    Returns:
+        int: Código de saída do processo (0 = sucesso).
+    """
+    os.makedirs(CREDENTIALS_DIR, exist_ok=True) # 🗂️ Cria diretório para credenciais e certificados se não existir
+    gerar_certificado_autoassinado()
+    criar_credenciais_padrao()
+    print("✅ Credenciais e certificados prontos. Inicie a API normalmente.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -398,6 +398,13 @@ class ApiTests(unittest.TestCase):
         media_esperada = sum([1, 2, 3, 4]) / len([1, 2, 3, 4]) # ➗ Calcula a média esperada (convertendo floats e strings para int)
         self._testar_rota_post("/calcular_media", self.headers_admin, {"numeros": numeros}, expected_status=200, expected_result_key="media", expected_result_value=media_esperada, test_name="/calcular_media lista float int string (OK)") # 🧪 Executa o teste genérico da rota POST para '/calcular_media' com lista mista e sucesso esperado
 
+    def test_rota_calcular_media_soma_acima_64_bits_ok(self):
+        """Testa o endpoint '/calcular_media' com soma além de 64 bits (não memoizável no cache de médias do Redis), esperando sucesso nas duas requisições."""
+        numeros = [1180591620717411303424, 1] # 🔢 2**70 + 1: soma fora do int64
+        media_esperada = sum(numeros) / len(numeros) # ➗ Calcula a média esperada dos números
+        for tentativa in (1, 2): # 🔁 A segunda requisição seria um cache hit se o resultado tivesse sido memoizado
+            self._testar_rota_post("/calcular_media", self.headers_admin, {"numeros": numeros}, expected_status=200, expected_result_key="media", expected_result_value=media_esperada, test_name=f"/calcular_media soma acima de 64 bits (OK, requisição {tentativa})") # 🧪 Executa o teste genérico da rota POST para '/calcular_media' com soma além do int64
+
 if __name__ == "__main__":
     """Executa a suíte de testes quando o script é rodado diretamente."""
     suite = unittest.TestSuite() # 🧪 Cria uma suíte de testes
@@ -3,6 +3,7 @@ import os
 import json
 import datetime
 import pytest
+import numpy as np
 from bibliotecas.calc_numbers import Numbers
 
 DIRETORIO_LOGS_TESTE = "test_logs"
@@ -37,12 +38,35 @@ def executar_testes():
         {"nome": "soma_lista_com_float_sem_perda", "entrada": [1, 2, 3.0, 4], "saida_esperada": 10, "espera_excecao": None},
         {"nome": "soma_lista_com_float_com_perda", "entrada": [1, 2, 3.5, 4], "saida_esperada": None, "espera_excecao": ValueError},
         {"nome": "soma_lista_com_none", "entrada": [1, 2, None, 4], "saida_esperada": None, "espera_excecao": ValueError},
+        {"nome": "soma_lista_grande_vetorizada", "entrada": list(range(2000)), "saida_esperada": 1999000, "espera_excecao": None},
+        {"nome": "soma_lista_grande_acima_int64", "entrada": [2**62] * 1100, "saida_esperada": 1100 * 2**62, "espera_excecao": None},
     ]
 
     for caso in casos_teste_soma:
         resultado = executar_caso_teste(calculadora.sum_numbers, caso)
         resultados_teste.append(resultado)
 
+    casos_teste_soma_vetor = [
+        {"nome": "soma_vetor_int64_valido", "entrada": [1, 2, 3, 4], "saida_esperada": 10, "espera_excecao": None},
+        {"nome": "soma_vetor_int64_vazio", "entrada": [], "saida_esperada": None, "espera_excecao": ValueError},
+        {"nome": "soma_vetor_int64_acima_int64", "entrada": [2**62] * 4, "saida_esperada": 4 * 2**62, "espera_excecao": None},
+    ]
+
+    for caso in casos_teste_soma_vetor:
+        resultado = executar_caso_teste(lambda entrada: calculadora.sum_int64_array(np.array(entrada, dtype=np.int64)), caso)
+        resultados_teste.append(resultado)
+
+    casos_teste_soma_media = [
+        {"nome": "soma_media_inteiros_validos", "entrada": [1, 2, 3, 4], "saida_esperada": [10, 2.5], "espera_excecao": None},
+        {"nome": "soma_media_lista_vazia", "entrada": [], "saida_esperada": [0, None], "espera_excecao": None},
+        {"nome": "soma_media_lista_grande_vetorizada", "entrada": list(range(2000)), "saida_esperada": [1999000, 999.5], "espera_excecao": None},
+        {"nome": "soma_media_lista_com_string", "entrada": [1, "a"], "saida_esperada": None, "espera_excecao": ValueError},
+    ]
+
+    for caso in casos_teste_soma_media:
+        resultado = executar_caso_teste(lambda entrada: list(calculadora.sum_and_average(entrada)), caso)
+        resultados_teste.append(resultado)
+
     casos_teste_media = [
         {"nome": "media_inteiros_validos", "entrada": [1, 2, 3, 4], "saida_esperada": 2.5, "espera_excecao": None},
         {"nome": "media_strings_numericas_validas", "entrada": ["5", "10", "15"], "saida_esperada": 10.0, "espera_excecao": None},
@@ -53,6 +77,7 @@ def executar_testes():
         {"nome": "media_lista_com_float_com_perda", "entrada": [1, 2, 3.5, 4], "saida_esperada": None, "espera_excecao": ValueError},
         {"nome": "media_lista_com_none", "entrada": [1, 2, None, 4], "saida_esperada": None, "espera_excecao": ValueError},
         {"nome": "media_divisao_por_zero", "entrada": [0, 0, 0], "saida_esperada": 0.0, "espera_excecao": None},
+        {"nome": "media_lista_grande_vetorizada", "entrada": list(range(2000)), "saida_esperada": 999.5, "espera_excecao": None},
     ]
 
     for caso in casos_teste_media: